@@ -3,5 +3,20 @@ AI-powered summarization and translation
 """
 from .summarizer import ArticleSummarizer
 from .translator import ArticleTranslator
+from .processor import ArticleProcessor
+from .backends import LLMBackend, OpenAIBackend, OpenAICompatibleBackend, FakeBackend, get_backend
+from .routing import TaskRoute, get_routes, get_routing_stats
 
-__all__ = ["ArticleSummarizer", "ArticleTranslator"]
+__all__ = [
+    "ArticleSummarizer",
+    "ArticleTranslator",
+    "ArticleProcessor",
+    "LLMBackend",
+    "OpenAIBackend",
+    "OpenAICompatibleBackend",
+    "FakeBackend",
+    "get_backend",
+    "TaskRoute",
+    "get_routes",
+    "get_routing_stats",
+]
@@ -0,0 +1,304 @@
+"""
+Chat model backends for the AI components
+"""
+from typing import Dict, List, Optional, Protocol, Tuple
+from langchain_openai import ChatOpenAI
+from langchain.schema import AIMessage
+import asyncio
+import hashlib
+import json
+import os
+import random
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class LLMBackend(Protocol):
+    """
+    Provider of chat completions
+
+    The model, temperature and completion cap are chosen per call by the
+    component, so a single backend instance is shared by all of them.
+    When functions are given, the first one is forced and its arguments
+    are returned in ``additional_kwargs["function_call"]``.
+    """
+
+    name: str
+
+    def invoke(
+        self,
+        messages: List,
+        model: str,
+        temperature: float,
+        functions: Optional[List[Dict]] = None,
+        max_tokens: Optional[int] = None
+    ) -> AIMessage:
+        ...
+
+    async def ainvoke(
+        self,
+        messages: List,
+        model: str,
+        temperature: float,
+        functions: Optional[List[Dict]] = None,
+        max_tokens: Optional[int] = None
+    ) -> AIMessage:
+        ...
+
+
+class OpenAIBackend:
+    """Chat completions from the OpenAI API"""
+
+    name = "openai"
+
+    def __init__(self, api_key: Optional[str] = None, base_url: Optional[str] = None):
+        """
+        Initialize the backend
+
+        Args:
+            api_key: API key (default: OPENAI_API_KEY)
+            base_url: API base URL (default: the OpenAI API)
+        """
+        self.api_key = api_key or os.getenv("OPENAI_API_KEY")
+        if not self.api_key:
+            raise ValueError("OPENAI_API_KEY not found in environment variables")
+
+        self.base_url = base_url
+        self._models: Dict[Tuple[str, float, Optional[int]], ChatOpenAI] = {}
+
+    def chat_model(self, model: str, temperature: float, max_tokens: Optional[int] = None) -> ChatOpenAI:
+        """LangChain chat model for a model, temperature and completion cap, created once"""
+        key = (model, temperature, max_tokens)
+        if key not in self._models:
+            self._models[key] = ChatOpenAI(
+                model=model,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                openai_api_key=self.api_key,
+                openai_api_base=self.base_url,
+                # LLMComponent retries, so every attempt is counted
+                max_retries=0
+            )
+        return self._models[key]
+
+    def _bind(self, model: str, temperature: float, functions: Optional[List[Dict]], max_tokens: Optional[int]):
+        llm = self.chat_model(model, temperature, max_tokens)
+        if functions:
+            llm = llm.bind(functions=functions, function_call={"name": functions[0]["name"]})
+        return llm
+
+    def invoke(
+        self,
+        messages: List,
+        model: str,
+        temperature: float,
+        functions: Optional[List[Dict]] = None,
+        max_tokens: Optional[int] = None
+    ) -> AIMessage:
+        return self._bind(model, temperature, functions, max_tokens).invoke(messages)
+
+    async def ainvoke(
+        self,
+        messages: List,
+        model: str,
+        temperature: float,
+        functions: Optional[List[Dict]] = None,
+        max_tokens: Optional[int] = None
+    ) -> AIMessage:
+        return await self._bind(model, temperature, functions, max_tokens).ainvoke(messages)
+
+
+class OpenAICompatibleBackend(OpenAIBackend):
+    """
+    Chat completions from a local server with an OpenAI-compatible API
+
+    Works with vLLM, llama.cpp server, Ollama and similar. Servers without
+    function calling return no arguments; the processor then falls back
+    to its separate calls.
+    """
+
+    name = "openai-compatible"
+
+    def __init__(self, base_url: Optional[str] = None, api_key: Optional[str] = None):
+        """
+        Initialize the backend
+
+        Args:
+            base_url: Server base URL (default: LLM_BASE_URL or http://localhost:8080/v1)
+            api_key: API key, if the server needs one (default: LLM_API_KEY)
+        """
+        super().__init__(
+            api_key=api_key or os.getenv("LLM_API_KEY", "not-needed"),
+            base_url=base_url or os.getenv("LLM_BASE_URL", "http://localhost:8080/v1")
+        )
+
+
+# Words the fake backend writes its responses with
+FAKE_WORDS = (
+    "model", "training", "data", "inference", "benchmark", "research", "agent",
+    "language", "vision", "safety", "compute", "open", "release", "performance",
+    "parameters", "dataset", "results", "evaluation", "token", "latency"
+)
+
+
+class FakeBackend:
+    """
+    Deterministic stand-in for a chat model, for benchmarks
+
+    Responds after ``latency`` seconds (plus up to ``jitter`` seconds and
+    the generation time at ``tokens_per_second``) with about
+    ``completion_tokens`` words, capped at the call's max_tokens, derived
+    from the prompt, so the same request always gets the same response
+    and delay. Text responses are numbered lists, which every component
+    can parse; function calls get arguments generated from the
+    function's JSON schema.
+    """
+
+    name = "fake"
+
+    def __init__(
+        self,
+        latency: Optional[float] = None,
+        jitter: Optional[float] = None,
+        completion_tokens: Optional[int] = None,
+        tokens_per_second: Optional[float] = None
+    ):
+        """
+        Initialize the backend
+
+        Args:
+            latency: Seconds before every response (default: FAKE_LLM_LATENCY or 0.5)
+            jitter: Most extra seconds per response (default: FAKE_LLM_JITTER or 0)
+            completion_tokens: Words per response (default: FAKE_LLM_COMPLETION_TOKENS or 200)
+            tokens_per_second: Generation speed; 0 adds no generation time
+                (default: FAKE_LLM_TOKENS_PER_SECOND or 0)
+        """
+        self.latency = latency if latency is not None else float(os.getenv("FAKE_LLM_LATENCY", "0.5"))
+        self.jitter = jitter if jitter is not None else float(os.getenv("FAKE_LLM_JITTER", "0"))
+        self.completion_tokens = completion_tokens or int(os.getenv("FAKE_LLM_COMPLETION_TOKENS", "200"))
+        self.tokens_per_second = (tokens_per_second if tokens_per_second is not None
+                                  else float(os.getenv("FAKE_LLM_TOKENS_PER_SECOND", "0")))
+
+        self.calls = 0
+
+    def _rng(self, messages: List, model: str, functions: Optional[List[Dict]]) -> random.Random:
+        request = json.dumps([model, [message.content for message in messages], functions], sort_keys=True)
+        return random.Random(hashlib.sha256(request.encode('utf-8')).hexdigest())
+
+    def _words(self, rng: random.Random, count: int) -> str:
+        return " ".join(rng.choice(FAKE_WORDS) for _ in range(max(count, 1)))
+
+    def _string_fields(self, schema: Dict) -> int:
+        if schema.get("type") == "object":
+            return sum(self._string_fields(value) for value in schema.get("properties", {}).values())
+        if schema.get("type") == "array":
+            return self._items(schema) * self._string_fields(schema.get("items", {}))
+        return 1 if schema.get("type") == "string" else 0
+
+    def _items(self, schema: Dict) -> int:
+        return min(max(schema.get("minItems", 3), 3), schema.get("maxItems", 3))
+
+    def _value(self, schema: Dict, rng: random.Random, words: int):
+        """Value matching a JSON schema (objects, arrays and scalars)"""
+        kind = schema.get("type")
+        if kind == "object":
+            return {
+                key: self._value(value, rng, words)
+                for key, value in schema.get("properties", {}).items()
+            }
+        if kind == "array":
+            return [self._value(schema.get("items", {}), rng, words) for _ in range(self._items(schema))]
+        if kind == "integer":
+            return rng.randint(0, 100)
+        if kind == "number":
+            return round(rng.random(), 3)
+        if kind == "boolean":
+            return rng.random() < 0.5
+        return self._words(rng, words)
+
+    def _respond(
+        self,
+        messages: List,
+        model: str,
+        functions: Optional[List[Dict]],
+        max_tokens: Optional[int]
+    ) -> Tuple[AIMessage, float]:
+        """Response to a request and the seconds it takes"""
+        self.calls += 1
+        rng = self._rng(messages, model, functions)
+        tokens = min(self.completion_tokens, max_tokens or self.completion_tokens)
+        delay = self.latency + self.jitter * rng.random()
+        if self.tokens_per_second:
+            delay += tokens / self.tokens_per_second
+
+        if functions:
+            schema = functions[0].get("parameters", {})
+            words = tokens // max(self._string_fields(schema), 1)
+            arguments = json.dumps(self._value(schema, rng, words))
+            message = AIMessage(
+                content="",
+                additional_kwargs={"function_call": {"name": functions[0]["name"], "arguments": arguments}}
+            )
+        else:
+            lines = 5
+            message = AIMessage(content="\n".join(
+                f"{line + 1}. {self._words(rng, tokens // lines)}" for line in range(lines)
+            ))
+
+        return message, delay
+
+    def invoke(
+        self,
+        messages: List,
+        model: str,
+        temperature: float,
+        functions: Optional[List[Dict]] = None,
+        max_tokens: Optional[int] = None
+    ) -> AIMessage:
+        message, delay = self._respond(messages, model, functions, max_tokens)
+        time.sleep(delay)
+        return message
+
+    async def ainvoke(
+        self,
+        messages: List,
+        model: str,
+        temperature: float,
+        functions: Optional[List[Dict]] = None,
+        max_tokens: Optional[int] = None
+    ) -> AIMessage:
+        message, delay = self._respond(messages, model, functions, max_tokens)
+        await asyncio.sleep(delay)
+        return message
+
+
+BACKENDS = {
+    "openai": OpenAIBackend,
+    "openai-compatible": OpenAICompatibleBackend,
+    "fake": FakeBackend,
+}
+
+
+def get_backend(name: Optional[str] = None) -> LLMBackend:
+    """
+    Create the configured chat model backend
+
+    Args:
+        name: "openai", "openai-compatible" or "fake" (default: LLM_BACKEND or openai)
+
+    Returns:
+        The backend
+
+    Raises:
+        ValueError: If the backend is unknown or not configured
+    """
+    name = name or os.getenv("LLM_BACKEND", "openai")
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown LLM backend: {name} (expected one of {', '.join(BACKENDS)})")
+
+    backend = BACKENDS[name]()
+    if name != "openai":
+        logger.info(f"Using {name} LLM backend")
+    return backend
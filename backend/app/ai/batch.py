@@ -0,0 +1,351 @@
+"""
+Offline bulk processing of pending articles through batch jobs
+"""
+from typing import Dict, List, Optional, Tuple
+from datetime import datetime
+from pathlib import Path
+import argparse
+import json
+import os
+import time
+import logging
+
+import httpx
+from pydantic import ValidationError
+from sqlalchemy.orm import Session
+
+from ..database import SessionLocal
+from ..models import Article, BatchJob
+from .processor import ArticleDigest, ArticleProcessor, DIGEST_FUNCTION
+
+logger = logging.getLogger(__name__)
+
+# Endpoint every request of a job is sent to
+BATCH_ENDPOINT = "/v1/chat/completions"
+
+# Batch statuses after which the job no longer changes on the server
+FINAL_STATUSES = {"completed", "failed", "expired", "cancelled"}
+
+MESSAGE_ROLES = {"system": "system", "human": "user", "ai": "assistant"}
+
+
+class BatchClient:
+    """Minimal client for the Files and Batches endpoints of the OpenAI API"""
+
+    def __init__(self, base_url: Optional[str] = None, api_key: Optional[str] = None, timeout: float = 60):
+        """
+        Initialize the client
+
+        Args:
+            base_url: API base URL (default: OPENAI_BATCH_BASE_URL or
+                https://api.openai.com/v1; point it at batch_server for offline use)
+            api_key: API key (default: OPENAI_API_KEY)
+            timeout: Request timeout in seconds
+        """
+        self.base_url = (base_url or os.getenv("OPENAI_BATCH_BASE_URL", "https://api.openai.com/v1")).rstrip('/')
+        api_key = api_key or os.getenv("OPENAI_API_KEY", "")
+        self.client = httpx.Client(
+            base_url=self.base_url,
+            headers={"Authorization": f"Bearer {api_key}"},
+            timeout=timeout
+        )
+
+    def upload(self, path: Path) -> str:
+        """Upload a JSONL job file and return its file ID"""
+        with open(path, 'rb') as f:
+            response = self.client.post(
+                "/files",
+                data={"purpose": "batch"},
+                files={"file": (path.name, f, "application/jsonl")}
+            )
+        response.raise_for_status()
+        return response.json()["id"]
+
+    def create_batch(self, input_file_id: str) -> Dict:
+        """Start a batch over an uploaded job file"""
+        response = self.client.post("/batches", json={
+            "input_file_id": input_file_id,
+            "endpoint": BATCH_ENDPOINT,
+            "completion_window": "24h"
+        })
+        response.raise_for_status()
+        return response.json()
+
+    def get_batch(self, batch_id: str) -> Dict:
+        """Get the current state of a batch"""
+        response = self.client.get(f"/batches/{batch_id}")
+        response.raise_for_status()
+        return response.json()
+
+    def download(self, file_id: str) -> bytes:
+        """Download the content of a file"""
+        response = self.client.get(f"/files/{file_id}/content")
+        response.raise_for_status()
+        return response.content
+
+    def close(self):
+        self.client.close()
+
+
+class BatchProcessor:
+    """
+    Process pending articles (is_processed=False) with batch jobs
+
+    ``submit`` writes one combined-digest request per pending article to a
+    JSONL job file, uploads it and starts a batch. ``poll`` checks the
+    running batches and ingests finished ones into the Article rows.
+    Ingestion only touches articles that are still unprocessed, so
+    repeating it is harmless; failed articles stay pending for a later job.
+    """
+
+    def __init__(
+        self,
+        processor: Optional[ArticleProcessor] = None,
+        client: Optional[BatchClient] = None,
+        job_dir: Optional[str] = None,
+        max_requests: Optional[int] = None
+    ):
+        """
+        Initialize the batch processor
+
+        Args:
+            processor: Processor providing the model, prompt and budget
+            client: Batch API client
+            job_dir: Directory for job files (default: BATCH_JOB_DIR or ./cache/batches)
+            max_requests: Most articles per job (default: BATCH_MAX_REQUESTS or 5000)
+        """
+        self.processor = processor or ArticleProcessor()
+        self.client = client or BatchClient()
+        self.job_dir = Path(job_dir or os.getenv("BATCH_JOB_DIR", "./cache/batches"))
+        self.max_requests = max_requests or int(os.getenv("BATCH_MAX_REQUESTS", "5000"))
+
+    def request_line(self, article: Article) -> Dict:
+        """Batch request producing the digest of one article"""
+        # Batch jobs run unattended, so long articles are truncated rather than condensed
+        content = self.processor.summarizer.budget.truncate(article.content_en)
+        messages = self.processor._digest_messages(article.title_en, content)
+        route = self.processor.route("digest")
+
+        return {
+            "custom_id": f"article-{article.id}",
+            "method": "POST",
+            "url": BATCH_ENDPOINT,
+            "body": {
+                "model": route.model,
+                "temperature": route.temperature,
+                "max_tokens": route.max_tokens,
+                "messages": [
+                    {"role": MESSAGE_ROLES[message.type], "content": message.content}
+                    for message in messages
+                ],
+                "functions": [DIGEST_FUNCTION],
+                "function_call": {"name": DIGEST_FUNCTION["name"]}
+            }
+        }
+
+    def pending_articles(self, db: Session, limit: int) -> List[Article]:
+        """Unprocessed articles that are not part of a running batch (nor deferred by a run budget)"""
+        queued = set()
+        for job in db.query(BatchJob).filter(BatchJob.status.notin_(FINAL_STATUSES | {"ingested"})):
+            queued.update(job.article_ids or [])
+
+        query = db.query(Article).filter(
+            Article.is_processed == False,  # noqa: E712
+            Article.deferred_at.is_(None)
+        )
+        if queued:
+            query = query.filter(Article.id.notin_(queued))
+        return query.order_by(Article.published_at.desc()).limit(limit).all()
+
+    def submit(self, limit: Optional[int] = None) -> Optional[str]:
+        """
+        Submit a batch job for the pending articles
+
+        Args:
+            limit: Most articles in the job (default: max_requests)
+
+        Returns:
+            Batch ID, or None if nothing was pending or submission failed
+        """
+        db = SessionLocal()
+        try:
+            articles = self.pending_articles(db, limit or self.max_requests)
+            if not articles:
+                logger.info("No pending articles for a batch job")
+                return None
+
+            self.job_dir.mkdir(parents=True, exist_ok=True)
+            job_path = self.job_dir / f"job-{datetime.now().strftime('%Y%m%d-%H%M%S')}.jsonl"
+            with open(job_path, 'w', encoding='utf-8') as f:
+                for article in articles:
+                    f.write(json.dumps(self.request_line(article), ensure_ascii=False) + '\n')
+
+            input_file_id = self.client.upload(job_path)
+            batch = self.client.create_batch(input_file_id)
+
+            db.add(BatchJob(
+                batch_id=batch["id"],
+                input_file_id=input_file_id,
+                status=batch.get("status", "validating"),
+                article_ids=[article.id for article in articles],
+                job_path=str(job_path)
+            ))
+            db.commit()
+
+            logger.info(f"Submitted batch {batch['id']} with {len(articles)} articles")
+            return batch["id"]
+
+        except Exception as e:
+            logger.error(f"Error submitting batch job: {str(e)}")
+            db.rollback()
+            return None
+        finally:
+            db.close()
+
+    def poll(self) -> int:
+        """
+        Refresh running batches and ingest the finished ones
+
+        Returns:
+            Number of batches still running
+        """
+        db = SessionLocal()
+        running = 0
+        try:
+            jobs = db.query(BatchJob).filter(BatchJob.status.notin_(FINAL_STATUSES | {"ingested"})).all()
+            # Completed but not yet ingested (e.g. interrupted ingestion)
+            jobs += db.query(BatchJob).filter(BatchJob.status == "completed").all()
+
+            for job in jobs:
+                try:
+                    if job.status != "completed":
+                        batch = self.client.get_batch(job.batch_id)
+                        job.status = batch["status"]
+                        job.output_file_id = batch.get("output_file_id")
+                        job.error_file_id = batch.get("error_file_id")
+                        db.commit()
+
+                    if job.status == "completed":
+                        self.ingest_job(db, job)
+                    elif job.status in FINAL_STATUSES:
+                        job.completed_at = datetime.now()
+                        db.commit()
+                        logger.warning(f"Batch {job.batch_id} ended with status {job.status}")
+                    else:
+                        running += 1
+
+                except Exception as e:
+                    logger.error(f"Error polling batch {job.batch_id}: {str(e)}")
+                    db.rollback()
+                    running += 1
+
+            return running
+
+        finally:
+            db.close()
+
+    def ingest_job(self, db: Session, job: BatchJob):
+        """Download a completed batch's results and store them"""
+        output = self.client.download(job.output_file_id) if job.output_file_id else b""
+        ingested, failed = self.ingest(db, output)
+
+        job.status = "ingested"
+        job.ingested_count = ingested
+        job.failed_count = len(job.article_ids or []) - ingested
+        job.completed_at = datetime.now()
+        db.commit()
+
+        logger.info(
+            f"Ingested batch {job.batch_id}: {ingested} articles stored, "
+            f"{job.failed_count} left pending ({failed} invalid responses)"
+        )
+
+    def ingest(self, db: Session, output: bytes) -> Tuple[int, int]:
+        """
+        Store the digests of a batch output file
+
+        Args:
+            db: Database session
+            output: JSONL batch output
+
+        Returns:
+            Number of articles stored and number of invalid responses
+        """
+        ingested = 0
+        failed = 0
+
+        for line in output.decode('utf-8').splitlines():
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+                article_id = int(record["custom_id"].split("-", 1)[1])
+
+                response = record.get("response") or {}
+                if record.get("error") or response.get("status_code") != 200:
+                    raise ValueError(record.get("error") or f"status {response.get('status_code')}")
+
+                message = response["body"]["choices"][0]["message"]
+                arguments = (message.get("function_call") or {}).get("arguments") or ""
+                digest = ArticleDigest.model_validate_json(arguments)
+
+            except (KeyError, IndexError, ValueError, ValidationError) as e:
+                failed += 1
+                logger.error(f"Invalid batch result: {str(e)[:200]}")
+                continue
+
+            # Only unprocessed rows are updated, so re-ingesting is a no-op
+            updated = (
+                db.query(Article)
+                .filter(Article.id == article_id, Article.is_processed == False)  # noqa: E712
+                .update({
+                    Article.summary_en: digest.summary_en,
+                    Article.title_ja: digest.title_ja,
+                    Article.summary_ja: digest.summary_ja,
+                    Article.key_points_ja: digest.key_points_ja,
+                    Article.is_processed: True,
+                    Article.is_published: True,
+                    Article.translated_at: datetime.now()
+                }, synchronize_session=False)
+            )
+            ingested += updated
+
+        db.commit()
+        return ingested, failed
+
+    def run(self, limit: Optional[int] = None, interval: float = 60) -> Optional[str]:
+        """Submit a job and poll until every running batch has finished"""
+        batch_id = self.submit(limit)
+        while self.poll():
+            time.sleep(interval)
+        return batch_id
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Process pending articles with batch jobs")
+    parser.add_argument("command", choices=["submit", "poll", "run"])
+    parser.add_argument("--limit", type=int, help="most articles per job")
+    parser.add_argument("--interval", type=float, default=60, help="seconds between polls (run)")
+    args = parser.parse_args()
+
+    from ..database import Base, engine
+    from ..models import upgrade_schema
+    Base.metadata.create_all(bind=engine)
+    upgrade_schema(engine)
+
+    batch = BatchProcessor()
+    try:
+        if args.command == "submit":
+            batch.submit(args.limit)
+        elif args.command == "poll":
+            running = batch.poll()
+            print(f"{running} batches running")
+        else:
+            batch.run(args.limit, args.interval)
+    finally:
+        batch.client.close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    main()
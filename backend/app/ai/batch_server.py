@@ -0,0 +1,147 @@
+"""
+Local stand-in for the OpenAI Files and Batches API
+
+Serves just enough of the API for BatchProcessor to run offline. Batches
+complete after BATCH_SERVER_DELAY seconds with deterministic digests
+derived from each request's prompt; no model is called.
+
+Usage (from the backend directory):
+    uvicorn app.ai.batch_server:app --port 8100
+    OPENAI_BATCH_BASE_URL=http://localhost:8100/v1 python -m app.ai.batch run --interval 1
+"""
+from typing import Dict
+import asyncio
+import json
+import os
+import time
+import uuid
+
+from fastapi import FastAPI, File, Form, HTTPException, UploadFile
+from fastapi.responses import Response
+
+app = FastAPI(title="Batch API stand-in")
+
+files: Dict[str, Dict] = {}
+batches: Dict[str, Dict] = {}
+
+
+def fake_digest(body: Dict) -> Dict:
+    """Deterministic digest built from the title and content in the prompt"""
+    prompt = body["messages"][-1]["content"]
+    title = prompt.split("\n", 1)[0].replace("Title:", "").strip()
+    content = prompt.split("Content:", 1)[-1].strip()
+    sentences = [s.strip() for s in content.replace("\n", " ").split(". ") if s.strip()]
+
+    return {
+        "summary_en": " ".join(content.split()[:60]),
+        "key_points_en": sentences[:3] or [title],
+        "title_ja": f"【要約】{title}"[:60],
+        "summary_ja": f"{title}についての記事です。",
+        "key_points_ja": [f"ポイント{i + 1}: {s[:60]}" for i, s in enumerate(sentences[:3])] or [title],
+    }
+
+
+def complete(request: Dict) -> Dict:
+    """Output line for one request of a job file"""
+    body = request["body"]
+    function_name = (body.get("function_call") or {}).get("name", "digest")
+    return {
+        "id": f"batch_req_{uuid.uuid4().hex[:12]}",
+        "custom_id": request["custom_id"],
+        "response": {
+            "status_code": 200,
+            "request_id": uuid.uuid4().hex,
+            "body": {
+                "object": "chat.completion",
+                "model": body.get("model"),
+                "choices": [{
+                    "index": 0,
+                    "finish_reason": "stop",
+                    "message": {
+                        "role": "assistant",
+                        "content": None,
+                        "function_call": {
+                            "name": function_name,
+                            "arguments": json.dumps(fake_digest(body), ensure_ascii=False)
+                        }
+                    }
+                }]
+            }
+        },
+        "error": None
+    }
+
+
+def add_file(content: bytes, filename: str, purpose: str) -> Dict:
+    file_id = f"file-{uuid.uuid4().hex[:24]}"
+    files[file_id] = {
+        "id": file_id,
+        "object": "file",
+        "bytes": len(content),
+        "created_at": int(time.time()),
+        "filename": filename,
+        "purpose": purpose,
+        "content": content
+    }
+    return {key: value for key, value in files[file_id].items() if key != "content"}
+
+
+async def run_batch(batch_id: str):
+    batch = batches[batch_id]
+    await asyncio.sleep(float(os.getenv("BATCH_SERVER_DELAY", "2")))
+
+    lines = files[batch["input_file_id"]]["content"].decode("utf-8").splitlines()
+    output = [complete(json.loads(line)) for line in lines if line.strip()]
+    output_file = add_file(
+        "\n".join(json.dumps(line, ensure_ascii=False) for line in output).encode("utf-8"),
+        f"{batch_id}_output.jsonl",
+        "batch_output"
+    )
+
+    batch.update({
+        "status": "completed",
+        "output_file_id": output_file["id"],
+        "completed_at": int(time.time()),
+        "request_counts": {"total": len(output), "completed": len(output), "failed": 0}
+    })
+
+
+@app.post("/v1/files")
+async def upload_file(file: UploadFile = File(...), purpose: str = Form(...)):
+    return add_file(await file.read(), file.filename, purpose)
+
+
+@app.get("/v1/files/{file_id}/content")
+async def file_content(file_id: str):
+    if file_id not in files:
+        raise HTTPException(status_code=404, detail="File not found")
+    return Response(content=files[file_id]["content"], media_type="application/jsonl")
+
+
+@app.post("/v1/batches")
+async def create_batch(request: Dict):
+    if request.get("input_file_id") not in files:
+        raise HTTPException(status_code=400, detail="Unknown input_file_id")
+
+    batch_id = f"batch_{uuid.uuid4().hex[:24]}"
+    batches[batch_id] = {
+        "id": batch_id,
+        "object": "batch",
+        "endpoint": request.get("endpoint"),
+        "input_file_id": request["input_file_id"],
+        "completion_window": request.get("completion_window", "24h"),
+        "status": "in_progress",
+        "output_file_id": None,
+        "error_file_id": None,
+        "created_at": int(time.time()),
+        "request_counts": {"total": 0, "completed": 0, "failed": 0}
+    }
+    asyncio.create_task(run_batch(batch_id))
+    return batches[batch_id]
+
+
+@app.get("/v1/batches/{batch_id}")
+async def get_batch(batch_id: str):
+    if batch_id not in batches:
+        raise HTTPException(status_code=404, detail="Batch not found")
+    return batches[batch_id]
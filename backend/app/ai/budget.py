@@ -0,0 +1,124 @@
+"""
+Token counting and input budgets for LLM prompts
+"""
+from functools import lru_cache
+from typing import List, Optional
+import os
+import logging
+
+import tiktoken
+
+logger = logging.getLogger(__name__)
+
+# Characters per token assumed when the tokenizer is unavailable
+CHARS_PER_TOKEN = 4
+
+
+@lru_cache(maxsize=None)
+def _encoding(model: str):
+    try:
+        try:
+            return tiktoken.encoding_for_model(model)
+        except KeyError:
+            return tiktoken.get_encoding("cl100k_base")
+    except Exception as e:
+        # tiktoken downloads its tables on first use
+        logger.warning(f"Tokenizer unavailable, estimating tokens from length: {str(e)}")
+        return None
+
+
+def count_tokens(text: str, model: str = "gpt-4") -> int:
+    """Number of tokens of a text for the given model"""
+    encoding = _encoding(model)
+    if encoding is None:
+        return len(text or "") // CHARS_PER_TOKEN + 1
+    return len(encoding.encode(text or ""))
+
+
+class TokenBudget:
+    """
+    Input budget of an article in a prompt
+
+    Articles within ``max_input_tokens`` are sent whole. Longer ones are
+    split into chunks of about ``chunk_tokens``, on paragraph boundaries
+    where possible, for map-reduce processing; text beyond ``max_chunks``
+    chunks is dropped.
+    """
+
+    def __init__(
+        self,
+        model: str = "gpt-4",
+        max_input_tokens: Optional[int] = None,
+        chunk_tokens: Optional[int] = None,
+        max_chunks: Optional[int] = None
+    ):
+        """
+        Initialize the budget
+
+        Args:
+            model: Model name (selects the tokenizer)
+            max_input_tokens: Article tokens sent in a single pass
+                (default: AI_MAX_INPUT_TOKENS or 3000)
+            chunk_tokens: Tokens per chunk of a long article
+                (default: AI_CHUNK_TOKENS or 2000)
+            max_chunks: Most chunks processed per article
+                (default: AI_MAX_CHUNKS or 8)
+        """
+        self.model = model
+        self.max_input_tokens = max_input_tokens or int(os.getenv("AI_MAX_INPUT_TOKENS", "3000"))
+        self.chunk_tokens = chunk_tokens or int(os.getenv("AI_CHUNK_TOKENS", "2000"))
+        self.max_chunks = max_chunks or int(os.getenv("AI_MAX_CHUNKS", "8"))
+
+    def count(self, text: str) -> int:
+        """Number of tokens of a text"""
+        return count_tokens(text, self.model)
+
+    def fits(self, text: str) -> bool:
+        """True if the text can be sent in a single pass"""
+        return self.count(text) <= self.max_input_tokens
+
+    def truncate(self, text: str, max_tokens: Optional[int] = None) -> str:
+        """Cut a text to at most ``max_tokens`` tokens (default: the input budget)"""
+        max_tokens = max_tokens or self.max_input_tokens
+        encoding = _encoding(self.model)
+        if encoding is None:
+            return text[:max_tokens * CHARS_PER_TOKEN]
+
+        tokens = encoding.encode(text)
+        if len(tokens) <= max_tokens:
+            return text
+        return encoding.decode(tokens[:max_tokens])
+
+    def split(self, text: str) -> List[str]:
+        """Split a text into chunks of about ``chunk_tokens`` tokens"""
+        chunks = []
+        current: List[str] = []
+        current_tokens = 0
+
+        for paragraph in text.split('\n'):
+            paragraph = paragraph.strip()
+            if not paragraph:
+                continue
+
+            tokens = self.count(paragraph)
+            if current and current_tokens + tokens > self.chunk_tokens:
+                chunks.append('\n'.join(current))
+                current, current_tokens = [], 0
+
+            # A paragraph larger than a chunk is cut into pieces
+            while tokens > self.chunk_tokens:
+                piece = self.truncate(paragraph, self.chunk_tokens)
+                chunks.append(piece)
+                paragraph = paragraph[len(piece):].strip()
+                tokens = self.count(paragraph)
+
+            if paragraph:
+                current.append(paragraph)
+                current_tokens += tokens
+
+        if current:
+            chunks.append('\n'.join(current))
+
+        if len(chunks) > self.max_chunks:
+            logger.warning(f"Article has {len(chunks)} chunks; using the first {self.max_chunks}")
+        return chunks[:self.max_chunks]
@@ -0,0 +1,154 @@
+"""
+Persistent cache of LLM responses
+"""
+from typing import Dict, Optional
+from pathlib import Path
+import json
+import os
+import sqlite3
+import threading
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class LLMCache:
+    """
+    SQLite store of chat completions keyed by request hash
+
+    Keys are computed by the caller from the model, temperature, prompt
+    version and input (see LLMComponent). Once the stored responses exceed
+    ``max_mb`` the least recently used ones are evicted.
+    """
+
+    def __init__(self, path: Optional[str] = None, max_mb: Optional[float] = None):
+        """
+        Initialize the cache
+
+        Args:
+            path: SQLite file (default: LLM_CACHE_PATH or ./cache/llm.sqlite)
+            max_mb: Maximum stored size (default: LLM_CACHE_MAX_MB or 200)
+        """
+        self.path = Path(path or os.getenv("LLM_CACHE_PATH", "./cache/llm.sqlite"))
+        self.max_bytes = int(1024 * 1024 * (max_mb if max_mb is not None
+                                            else float(os.getenv("LLM_CACHE_MAX_MB", "200"))))
+
+        self.hits = 0
+        self.misses = 0
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._db.executescript("""
+            PRAGMA journal_mode = WAL;
+            PRAGMA synchronous = NORMAL;
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                model TEXT NOT NULL,
+                response TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS ix_responses_accessed_at ON responses (accessed_at);
+        """)
+        self._total_bytes = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    def get(self, key: str) -> Optional[Dict]:
+        """
+        Get a cached response
+
+        Returns:
+            Dictionary with content and additional_kwargs, or None if missing
+        """
+        with self._lock:
+            try:
+                row = self._db.execute("SELECT response FROM responses WHERE key = ?", (key,)).fetchone()
+                if not row:
+                    self.misses += 1
+                    return None
+
+                self._db.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (time.time(), key))
+                self._db.commit()
+                self.hits += 1
+                return json.loads(row[0])
+
+            except (sqlite3.Error, ValueError) as e:
+                logger.error(f"Error reading LLM cache: {str(e)}")
+                self.misses += 1
+                return None
+
+    def put(self, key: str, model: str, response: Dict):
+        """Store a response"""
+        data = json.dumps(response, ensure_ascii=False)
+        size = len(data.encode('utf-8'))
+        now = time.time()
+
+        with self._lock:
+            try:
+                old = self._db.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+                self._db.execute(
+                    "INSERT OR REPLACE INTO responses (key, model, response, size, created_at, accessed_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, model, data, size, now, now)
+                )
+                self._db.commit()
+                self._total_bytes += size - (old[0] if old else 0)
+
+                if self._total_bytes > self.max_bytes:
+                    self._evict()
+
+            except sqlite3.Error as e:
+                logger.error(f"Error writing LLM cache: {str(e)}")
+
+    def delete(self, key: str):
+        """Drop a response, e.g. one that failed validation"""
+        with self._lock:
+            try:
+                self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._db.commit()
+                self._total_bytes = self._db.execute(
+                    "SELECT COALESCE(SUM(size), 0) FROM responses"
+                ).fetchone()[0]
+            except sqlite3.Error as e:
+                logger.error(f"Error deleting from LLM cache: {str(e)}")
+
+    def _evict(self):
+        """Drop least recently used responses until under the size limit"""
+        rows = self._db.execute("SELECT key, size FROM responses ORDER BY accessed_at").fetchall()
+        total = self._total_bytes
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+            total -= size
+
+        self._db.commit()
+        self._total_bytes = total
+        logger.info(f"Evicted LLM cache entries; {total / 1024 / 1024:.1f} MB remain")
+
+
+_default_cache: Optional[LLMCache] = None
+_default_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> Optional[LLMCache]:
+    """
+    Shared LLM cache configured from the environment
+
+    Returns None when disabled with LLM_CACHE_ENABLED=False.
+    """
+    global _default_cache
+
+    if os.getenv("LLM_CACHE_ENABLED", "True") != "True":
+        return None
+
+    with _default_cache_lock:
+        if _default_cache is None:
+            try:
+                _default_cache = LLMCache()
+            except (OSError, sqlite3.Error) as e:
+                logger.error(f"LLM cache disabled: {str(e)}")
+                return None
+        return _default_cache
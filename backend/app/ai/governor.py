@@ -0,0 +1,127 @@
+"""
+Request and token rate governor for OpenAI calls
+"""
+from typing import Dict, List, Optional
+import asyncio
+import json
+import os
+import threading
+import time
+import logging
+
+from .budget import count_tokens
+
+logger = logging.getLogger(__name__)
+
+# Completion tokens assumed for a call when estimating its cost
+DEFAULT_COMPLETION_TOKENS = 400
+
+
+def estimate_tokens(
+    messages: List,
+    model: str = "gpt-4",
+    functions: Optional[List[Dict]] = None,
+    completion_tokens: int = DEFAULT_COMPLETION_TOKENS
+) -> int:
+    """
+    Estimate the tokens a chat call counts against the rate limit
+
+    Args:
+        messages: LangChain messages of the prompt
+        model: Model name (selects the tokenizer)
+        functions: Function definitions sent with the call
+        completion_tokens: Expected completion length
+
+    Returns:
+        Prompt plus expected completion tokens
+    """
+    # Each message carries a few tokens of framing
+    tokens = 3 + sum(4 + count_tokens(message.content, model) for message in messages)
+    if functions:
+        tokens += count_tokens(json.dumps(functions), model)
+    return tokens + completion_tokens
+
+
+class RateGovernor:
+    """
+    Shared requests/min and tokens/min budget for one model
+
+    Two continuously refilled buckets each hold one minute of quota. A call
+    waits until both can cover it, so concurrent workers together stay
+    within the account limits instead of running into 429 responses.
+    Thread-safe; usable from sync code and from any event loop.
+    """
+
+    def __init__(self, rpm: Optional[int] = None, tpm: Optional[int] = None):
+        """
+        Initialize the governor
+
+        Args:
+            rpm: Requests per minute (default: OPENAI_RPM_LIMIT or 500)
+            tpm: Tokens per minute (default: OPENAI_TPM_LIMIT or 40000)
+        """
+        self.rpm = rpm or int(os.getenv("OPENAI_RPM_LIMIT", "500"))
+        self.tpm = tpm or int(os.getenv("OPENAI_TPM_LIMIT", "40000"))
+
+        self.requests = float(self.rpm)
+        self.tokens = float(self.tpm)
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _reserve(self, tokens: int) -> float:
+        """Take quota for a call, or return the seconds to wait before retrying"""
+        tokens = min(tokens, self.tpm)
+
+        with self._lock:
+            now = time.monotonic()
+            if now < self.paused_until:
+                return self.paused_until - now
+
+            elapsed = now - self.updated
+            self.updated = now
+            self.requests = min(self.rpm, self.requests + elapsed * self.rpm / 60)
+            self.tokens = min(self.tpm, self.tokens + elapsed * self.tpm / 60)
+
+            if self.requests >= 1 and self.tokens >= tokens:
+                self.requests -= 1
+                self.tokens -= tokens
+                return 0.0
+
+            return max(
+                (1 - self.requests) * 60 / self.rpm,
+                (tokens - self.tokens) * 60 / self.tpm,
+                0.01
+            )
+
+    def acquire(self, tokens: int):
+        """Block until a call of the given size fits the budget"""
+        delay = self._reserve(tokens)
+        while delay:
+            time.sleep(delay)
+            delay = self._reserve(tokens)
+
+    async def aacquire(self, tokens: int):
+        """Wait until a call of the given size fits the budget"""
+        delay = self._reserve(tokens)
+        while delay:
+            await asyncio.sleep(delay)
+            delay = self._reserve(tokens)
+
+    def pause(self, seconds: float):
+        """Hold all calls for a while, e.g. after a 429 response"""
+        with self._lock:
+            self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+        logger.warning(f"OpenAI rate limit hit; pausing calls for {seconds:.0f}s")
+
+
+_governors: Dict[str, RateGovernor] = {}
+_governors_lock = threading.Lock()
+
+
+def get_governor(model: str) -> RateGovernor:
+    """Shared governor of a model (OpenAI limits apply per model)"""
+    with _governors_lock:
+        if model not in _governors:
+            _governors[model] = RateGovernor()
+        return _governors[model]
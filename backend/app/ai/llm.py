@@ -0,0 +1,306 @@
+"""
+Shared chat model access for the AI components
+"""
+from dataclasses import replace
+from typing import Dict, List, Optional
+from langchain.schema import AIMessage
+import asyncio
+import hashlib
+import json
+import openai
+import os
+import time
+import logging
+
+from .backends import LLMBackend, get_backend
+from .budget import count_tokens
+from .cache import get_llm_cache
+from .governor import estimate_tokens, get_governor
+from .metrics import REUSED_OUTCOMES, get_llm_metrics
+from .routing import TaskRoute, call_cost, get_routes, get_routing_stats
+
+logger = logging.getLogger(__name__)
+
+# Pause of the model's governor after a rate limit error without retry-after
+RATE_LIMIT_PAUSE = 20
+
+# Base of the exponential backoff after other transient errors, in seconds
+RETRY_BACKOFF = 1
+
+# Errors worth retrying; the backends leave retries to LLMComponent so they can be counted
+RETRY_ERRORS = (openai.RateLimitError, openai.APIConnectionError, openai.InternalServerError)
+
+
+def parse_numbered_list(text: str) -> List[str]:
+    """Parse a numbered or bulleted list from a model response"""
+    points = []
+    for line in text.split('\n'):
+        line = line.strip()
+        if line and (line[0].isdigit() or line.startswith('-') or line.startswith('•')):
+            # Remove the number/bullet and clean
+            point = line.lstrip('0123456789.-•) ').strip()
+            if point:
+                points.append(point)
+    return points
+
+
+class LLMComponent:
+    """
+    Base class for components that call the chat model
+
+    Every call names its task, whose route in the routing table (see
+    ``routing``) sets the model, temperature and max_tokens. Calls go
+    through ``_invoke`` / ``_ainvoke``, which answer from the persistent
+    LLM cache when possible and otherwise wait for the model's shared
+    RateGovernor before sending the request to the backend (see
+    ``backends``; LLM_BACKEND selects it by default). Transient errors
+    are retried here rather than in the client. Every call's latency,
+    tokens, retries, cost and outcome are recorded (see ``metrics``).
+    Bump ``prompt_version`` whenever a subclass changes its prompts so
+    earlier cached responses are no longer used.
+    """
+
+    prompt_version = "1"
+
+    def __init__(
+        self,
+        model: Optional[str] = None,
+        temperature: Optional[float] = None,
+        backend: Optional[LLMBackend] = None,
+        routes: Optional[Dict[str, TaskRoute]] = None
+    ):
+        """
+        Initialize the chat model
+
+        Args:
+            model: Model for every task, overriding the routing table
+            temperature: Sampling temperature (0-1) for every task,
+                overriding the routing table
+            backend: Backend serving the model (default: ``get_backend()``)
+            routes: Route per task (default: ``get_routes()``)
+        """
+        self.model = model
+        self.temperature = temperature
+        self.backend = backend or get_backend()
+        self.routes = routes or get_routes()
+        self.cache = get_llm_cache()
+        self.stats = get_routing_stats()
+        self.metrics = get_llm_metrics()
+        self.max_retries = int(os.getenv("LLM_MAX_RETRIES", "2"))
+
+    def route(self, task: str) -> TaskRoute:
+        """Model settings of a task"""
+        route = self.routes.get(task) or TaskRoute(os.getenv("LLM_MODEL", "gpt-4"))
+        if self.model:
+            route = replace(route, model=self.model)
+        if self.temperature is not None:
+            route = replace(route, temperature=self.temperature)
+        return route
+
+    def _cache_key(self, route: TaskRoute, messages: List, functions: Optional[List[Dict]] = None) -> str:
+        """Hash of everything that determines a completion"""
+        request = {
+            'backend': self.backend.name,
+            'model': route.model,
+            'temperature': route.temperature,
+            'max_tokens': route.max_tokens,
+            'prompt': f"{type(self).__name__}:{self.prompt_version}",
+            'messages': [(message.type, message.content) for message in messages],
+            'functions': functions,
+        }
+        return hashlib.sha256(json.dumps(request, sort_keys=True).encode('utf-8')).hexdigest()
+
+    def _cached(self, key: str) -> Optional[AIMessage]:
+        if self.cache is None:
+            return None
+        cached = self.cache.get(key)
+        if cached is None:
+            return None
+        return AIMessage(content=cached['content'], additional_kwargs=cached['additional_kwargs'])
+
+    def _store(self, key: str, model: str, response):
+        if self.cache is not None:
+            self.cache.put(key, model, {
+                'content': response.content,
+                'additional_kwargs': response.additional_kwargs
+            })
+
+    def _forget(self, task: str, messages: List, functions: Optional[List[Dict]] = None):
+        """Drop the cached response of a call, e.g. after it failed validation"""
+        if self.cache is not None:
+            self.cache.delete(self._cache_key(self.route(task), messages, functions))
+
+    def _retry_delay(self, error: Exception, attempt: int) -> Optional[float]:
+        """Seconds to wait before retrying a failed attempt, or None to give up"""
+        if attempt >= self.max_retries or not isinstance(error, RETRY_ERRORS):
+            return None
+
+        response = getattr(error, 'response', None)
+        retry_after = response.headers.get('retry-after') if response is not None else None
+        try:
+            if retry_after:
+                return float(retry_after)
+        except ValueError:
+            pass
+
+        if isinstance(error, openai.RateLimitError):
+            return RATE_LIMIT_PAUSE
+        return RETRY_BACKOFF * 2 ** attempt
+
+    def _retry(self, task: str, route: TaskRoute, error: Exception, attempt: int) -> Optional[float]:
+        """
+        Handle a failed attempt
+
+        Rate limit errors pause the model's governor, so every caller waits.
+
+        Returns:
+            Seconds to sleep before the next attempt (0 when the governor
+            does the waiting), or None if the call failed for good
+        """
+        delay = self._retry_delay(error, attempt)
+        if isinstance(error, openai.RateLimitError):
+            get_governor(route.model).pause(delay or RATE_LIMIT_PAUSE)
+        if delay is None:
+            return None
+
+        logger.warning(
+            f"Retrying {task} on {route.model} in {delay:.1f}s after {type(error).__name__} "
+            f"(attempt {attempt + 1}/{self.max_retries})"
+        )
+        return 0 if isinstance(error, openai.RateLimitError) else delay
+
+    def _record(
+        self,
+        task: str,
+        route: TaskRoute,
+        outcome: str,
+        start: float,
+        prompt_tokens: int = 0,
+        completion_tokens: int = 0,
+        retries: int = 0,
+        error: Optional[Exception] = None
+    ):
+        """Add a call to the per-task totals and the call metrics"""
+        seconds = time.perf_counter() - start
+        if outcome in REUSED_OUTCOMES:
+            self.stats.record_cached(task, route.model)
+        else:
+            self.stats.record(task, route.model, seconds, prompt_tokens, completion_tokens, error=error is not None)
+
+        self.metrics.record(
+            task=task,
+            model=route.model,
+            backend=self.backend.name,
+            outcome=outcome,
+            latency_ms=seconds * 1000,
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            retries=retries,
+            cost=call_cost(route.model, prompt_tokens, completion_tokens),
+            error=f"{type(error).__name__}: {str(error)}" if error is not None else None
+        )
+
+    def _completed(
+        self,
+        task: str,
+        route: TaskRoute,
+        key: str,
+        start: float,
+        prompt_tokens: int,
+        retries: int,
+        response
+    ):
+        """Cache a response and record the call"""
+        self._store(key, route.model, response)
+        function_call = response.additional_kwargs.get('function_call') or {}
+        completion_tokens = count_tokens(
+            (response.content or '') + (function_call.get('arguments') or ''), route.model
+        )
+        self._record(task, route, "ok", start, prompt_tokens, completion_tokens, retries)
+
+    def _failed(self, task: str, route: TaskRoute, start: float, prompt_tokens: int, retries: int, error: Exception):
+        outcome = "rate_limited" if isinstance(error, openai.RateLimitError) else "error"
+        self._record(task, route, outcome, start, prompt_tokens, retries=retries, error=error)
+
+    def _invoke(self, messages: List, task: str, functions: Optional[List[Dict]] = None):
+        """
+        Call the backend within the rate limits, or answer from the cache
+
+        Transient errors are retried up to ``max_retries`` times. Every
+        call is recorded in the per-task totals and the call metrics.
+
+        Args:
+            messages: Prompt messages
+            task: Routing table entry that selects the model
+            functions: Function definitions; the first one is forced
+
+        Returns:
+            The model's response message
+        """
+        start = time.perf_counter()
+        route = self.route(task)
+        key = self._cache_key(route, messages, functions)
+        cached = self._cached(key)
+        if cached is not None:
+            self._record(task, route, "cached", start)
+            return cached
+
+        # max_tokens is what the API counts against the token limit
+        prompt_tokens = estimate_tokens(messages, route.model, functions, completion_tokens=0)
+        governor = get_governor(route.model)
+
+        attempt = 0
+        while True:
+            governor.acquire(prompt_tokens + route.max_tokens)
+            try:
+                response = self.backend.invoke(
+                    messages, route.model, route.temperature, functions, max_tokens=route.max_tokens
+                )
+                break
+            except Exception as e:
+                delay = self._retry(task, route, e, attempt)
+                if delay is None:
+                    self._failed(task, route, start, prompt_tokens, attempt, e)
+                    raise
+                time.sleep(delay)
+                attempt += 1
+
+        self._completed(task, route, key, start, prompt_tokens, attempt, response)
+        return response
+
+    async def _ainvoke(self, messages: List, task: str, functions: Optional[List[Dict]] = None):
+        """
+        Asynchronous ``_invoke``
+
+        The cache and the call metrics live in SQLite, so their reads and
+        writes run in worker threads instead of stalling the event loop.
+        """
+        start = time.perf_counter()
+        route = self.route(task)
+        key = self._cache_key(route, messages, functions)
+        cached = await asyncio.to_thread(self._cached, key)
+        if cached is not None:
+            await asyncio.to_thread(self._record, task, route, "cached", start)
+            return cached
+
+        prompt_tokens = estimate_tokens(messages, route.model, functions, completion_tokens=0)
+        governor = get_governor(route.model)
+
+        attempt = 0
+        while True:
+            await governor.aacquire(prompt_tokens + route.max_tokens)
+            try:
+                response = await self.backend.ainvoke(
+                    messages, route.model, route.temperature, functions, max_tokens=route.max_tokens
+                )
+                break
+            except Exception as e:
+                delay = self._retry(task, route, e, attempt)
+                if delay is None:
+                    await asyncio.to_thread(self._failed, task, route, start, prompt_tokens, attempt, e)
+                    raise
+                await asyncio.sleep(delay)
+                attempt += 1
+
+        await asyncio.to_thread(self._completed, task, route, key, start, prompt_tokens, attempt, response)
+        return response
@@ -0,0 +1,258 @@
+"""
+Translation memory and terminology glossary
+"""
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+import logging
+
+from ..database import SessionLocal
+from ..models import GlossaryTerm, TranslationUnit
+
+logger = logging.getLogger(__name__)
+
+# Terms seeded into an empty glossary; edit the glossary_terms table to change them
+DEFAULT_GLOSSARY = {
+    "large language model": "大規模言語モデル",
+    "LLM": "大規模言語モデル（LLM）",
+    "generative AI": "生成AI",
+    "machine learning": "機械学習",
+    "deep learning": "深層学習",
+    "neural network": "ニューラルネットワーク",
+    "reinforcement learning": "強化学習",
+    "fine-tuning": "ファインチューニング",
+    "inference": "推論",
+    "training data": "学習データ",
+    "dataset": "データセット",
+    "benchmark": "ベンチマーク",
+    "parameters": "パラメータ",
+    "diffusion model": "拡散モデル",
+    "multimodal": "マルチモーダル",
+    "AI agent": "AIエージェント",
+    "open source": "オープンソース",
+    "open-weight": "オープンウェイト",
+    "hallucination": "ハルシネーション",
+    "alignment": "アライメント",
+    "transformer": "Transformer",
+    "computer vision": "コンピュータビジョン",
+    "natural language processing": "自然言語処理",
+    "cs.AI": "人工知能（cs.AI）",
+    "cs.CL": "計算言語学（cs.CL）",
+    "cs.LG": "機械学習（cs.LG）",
+    "cs.CV": "コンピュータビジョン（cs.CV）",
+    "cs.RO": "ロボティクス（cs.RO）",
+    "stat.ML": "統計的機械学習（stat.ML）",
+}
+
+
+def normalize(text: str) -> str:
+    """Text with whitespace collapsed, as stored in the memory"""
+    return " ".join((text or "").split())
+
+
+def unit_hash(kind: str, text: str) -> str:
+    return hashlib.sha256(f"{kind}\n{normalize(text)}".encode('utf-8')).hexdigest()
+
+
+class TranslationMemory:
+    """
+    English→Japanese translation memory with a term glossary
+
+    Titles, key points and summaries are stored once translated and reused
+    on exact matches (after whitespace normalization), so repeated content
+    is not sent to the model again. Glossary terms found in a text are
+    listed in its prompt so the same term is always translated the same
+    way. The glossary is kept in memory and reloaded every
+    ``glossary_refresh`` seconds.
+    """
+
+    def __init__(self, glossary_refresh: Optional[float] = None, max_terms: Optional[int] = None):
+        """
+        Initialize the memory
+
+        Args:
+            glossary_refresh: Seconds between glossary reloads (default: GLOSSARY_REFRESH_SECONDS or 300)
+            max_terms: Most glossary terms listed in a prompt (default: GLOSSARY_MAX_TERMS or 20)
+        """
+        self.glossary_refresh = (glossary_refresh if glossary_refresh is not None
+                                 else float(os.getenv("GLOSSARY_REFRESH_SECONDS", "300")))
+        self.max_terms = max_terms or int(os.getenv("GLOSSARY_MAX_TERMS", "20"))
+
+        self.hits = 0
+        self.misses = 0
+
+        self._glossary: Dict[str, str] = {}
+        self._lower: Dict[str, str] = {}
+        self._pattern: Optional[re.Pattern] = None
+        self._loaded_at = 0.0
+        self._lock = threading.Lock()
+
+    def lookup(self, kind: str, texts: Iterable[str]) -> Dict[str, str]:
+        """
+        Stored translations of texts
+
+        Args:
+            kind: "title", "key_point" or "summary"
+            texts: English texts
+
+        Returns:
+            Japanese translation per text that is in the memory
+        """
+        texts = [text for text in texts if normalize(text)]
+        hashes = {unit_hash(kind, text): text for text in texts}
+        if not hashes:
+            return {}
+
+        db = SessionLocal()
+        try:
+            units = db.query(TranslationUnit).filter(TranslationUnit.source_hash.in_(list(hashes))).all()
+            for unit in units:
+                unit.hits = (unit.hits or 0) + 1
+                unit.last_used_at = datetime.now()
+            db.commit()
+
+            found = {hashes[unit.source_hash]: unit.target_text for unit in units}
+        except Exception as e:
+            logger.error(f"Error reading translation memory: {str(e)}")
+            db.rollback()
+            found = {}
+        finally:
+            db.close()
+
+        with self._lock:
+            self.hits += len(found)
+            self.misses += len(hashes) - len(found)
+        return found
+
+    def store(self, kind: str, pairs: Dict[str, str]):
+        """
+        Add translations to the memory
+
+        Args:
+            kind: "title", "key_point" or "summary"
+            pairs: Japanese translation per English text
+        """
+        units = {
+            unit_hash(kind, source): (normalize(source), target.strip())
+            for source, target in pairs.items()
+            if normalize(source) and target and target.strip()
+        }
+        if not units:
+            return
+
+        db = SessionLocal()
+        try:
+            existing = {
+                source_hash for (source_hash,) in
+                db.query(TranslationUnit.source_hash).filter(TranslationUnit.source_hash.in_(list(units)))
+            }
+            for source_hash, (source, target) in units.items():
+                if source_hash not in existing:
+                    db.add(TranslationUnit(
+                        source_hash=source_hash, kind=kind, source_text=source, target_text=target
+                    ))
+            db.commit()
+        except Exception as e:
+            # A concurrent writer may have stored the same text first
+            logger.warning(f"Error writing translation memory: {str(e)}")
+            db.rollback()
+        finally:
+            db.close()
+
+    def glossary(self) -> Dict[str, str]:
+        """Japanese translation per glossary term, seeding an empty glossary first"""
+        with self._lock:
+            if self._pattern is not None and time.monotonic() - self._loaded_at < self.glossary_refresh:
+                return self._glossary
+
+        db = SessionLocal()
+        try:
+            if not db.query(GlossaryTerm.id).first():
+                seed_glossary(db)
+            terms = {term.term: term.translation for term in db.query(GlossaryTerm)}
+        except Exception as e:
+            logger.error(f"Error loading glossary: {str(e)}")
+            db.rollback()
+            terms = dict(self._glossary)
+        finally:
+            db.close()
+
+        # Longest terms first so "large language model" wins over "language model"
+        alternatives = sorted(terms, key=len, reverse=True)
+        pattern = re.compile(
+            r"(?<![\w.-])(" + "|".join(map(re.escape, alternatives)) + r")(?![\w-])",
+            re.IGNORECASE
+        ) if alternatives else None
+
+        with self._lock:
+            self._glossary = terms
+            self._lower = {term.lower(): term for term in terms}
+            self._pattern = pattern or re.compile(r"(?!)")
+            self._loaded_at = time.monotonic()
+            return terms
+
+    def glossary_hits(self, *texts: str) -> List[Tuple[str, str]]:
+        """Glossary terms found in texts with their translations, in order of appearance"""
+        glossary = self.glossary()
+        found: Dict[str, str] = {}
+        for text in texts:
+            for match in self._pattern.finditer(text or ""):
+                term = self._lower.get(match.group(1).lower())
+                if term and term not in found:
+                    found[term] = glossary[term]
+                if len(found) >= self.max_terms:
+                    return list(found.items())
+        return list(found.items())
+
+    def glossary_note(self, *texts: str) -> str:
+        """Prompt section listing the glossary terms found in texts, or an empty string"""
+        hits = self.glossary_hits(*texts)
+        if not hits:
+            return ""
+        lines = "\n".join(f"- {term}: {translation}" for term, translation in hits)
+        return f"\n\nUse these Japanese translations for the following terms:\n{lines}"
+
+
+def seed_glossary(db):
+    """Add DEFAULT_GLOSSARY and the terms in GLOSSARY_PATH (a JSON object) that are missing"""
+    terms = dict(DEFAULT_GLOSSARY)
+    path = os.getenv("GLOSSARY_PATH")
+    if path:
+        try:
+            with open(path, encoding='utf-8') as f:
+                terms.update(json.load(f))
+        except (OSError, ValueError) as e:
+            logger.error(f"Error reading glossary file {path}: {str(e)}")
+
+    existing = {term for (term,) in db.query(GlossaryTerm.term)}
+    for term, translation in terms.items():
+        if term not in existing:
+            db.add(GlossaryTerm(term=term, translation=translation))
+    db.commit()
+    logger.info(f"Seeded glossary with {len(terms) - len(existing)} terms")
+
+
+_default_memory: Optional[TranslationMemory] = None
+_default_memory_lock = threading.Lock()
+
+
+def get_translation_memory() -> Optional[TranslationMemory]:
+    """
+    Shared translation memory
+
+    Returns None when disabled with TRANSLATION_MEMORY_ENABLED=False.
+    """
+    global _default_memory
+
+    if os.getenv("TRANSLATION_MEMORY_ENABLED", "True") != "True":
+        return None
+
+    with _default_memory_lock:
+        if _default_memory is None:
+            _default_memory = TranslationMemory()
+        return _default_memory
@@ -0,0 +1,237 @@
+"""
+Instrumentation of LLM calls: per-call records and latency/token histograms
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple
+import bisect
+import os
+import threading
+import uuid
+import logging
+
+from ..database import SessionLocal
+from ..models import LLMCall
+
+logger = logging.getLogger(__name__)
+
+# Pipeline run and article source the current LLM calls belong to
+current_run: ContextVar[Optional[str]] = ContextVar("current_run", default=None)
+current_source: ContextVar[Optional[str]] = ContextVar("current_source", default=None)
+
+# Outcomes of calls answered without the model (LLM cache, translation memory)
+REUSED_OUTCOMES = ("cached", "memory")
+
+# Upper bounds of the histogram buckets
+LATENCY_BUCKETS_MS = (100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000)
+TOKEN_BUCKETS = (100, 250, 500, 1000, 2000, 4000, 8000, 16000)
+
+
+def new_run_id(kind: str) -> str:
+    """Readable unique ID for a pipeline run, e.g. scrape-20240101-120000-1a2b"""
+    return f"{kind}-{datetime.now().strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:4]}"
+
+
+@contextmanager
+def llm_run(run_id: str):
+    """Attribute the LLM calls made inside the block (and tasks started in it) to a run"""
+    token = current_run.set(run_id)
+    try:
+        yield run_id
+    finally:
+        current_run.reset(token)
+
+
+@contextmanager
+def llm_source(source: Optional[str]):
+    """Attribute the LLM calls made inside the block to an article source"""
+    token = current_source.set(source)
+    try:
+        yield
+    finally:
+        current_source.reset(token)
+
+
+class Histogram:
+    """Fixed-bucket histogram with approximate quantiles"""
+
+    def __init__(self, bounds: Sequence[float]):
+        self.bounds = list(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-quantile (max for the overflow bucket)"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.bounds + [self.max], self.counts):
+            seen += count
+            if seen >= rank:
+                return round(float(min(bound, self.max)), 1)
+        return self.max
+
+    def as_dict(self) -> Dict:
+        return {
+            'count': self.count,
+            'mean': round(self.total / self.count, 1) if self.count else 0.0,
+            'p50': self.quantile(0.5),
+            'p95': self.quantile(0.95),
+            'max': round(self.max, 1),
+            'buckets': {
+                **{f"le_{bound}": count for bound, count in zip(self.bounds, self.counts)},
+                'inf': self.counts[-1],
+            },
+        }
+
+
+class LLMMetrics:
+    """
+    Recorder of every LLM call made by the AI components
+
+    Each call is added to in-process latency and token histograms per task
+    and model, and buffered as an LLMCall row tagged with the current run
+    and source (see ``llm_run`` / ``llm_source``). Rows are written in
+    batches of ``flush_size`` and at the end of each run with ``flush``.
+    Thread-safe.
+    """
+
+    def __init__(self, enabled: Optional[bool] = None, flush_size: Optional[int] = None):
+        """
+        Initialize the recorder
+
+        Args:
+            enabled: Write call rows to the database (default: LLM_METRICS_ENABLED or True)
+            flush_size: Buffered rows that trigger a write (default: LLM_METRICS_FLUSH_SIZE or 50)
+        """
+        self.enabled = enabled if enabled is not None else os.getenv("LLM_METRICS_ENABLED", "True") == "True"
+        self.flush_size = flush_size or int(os.getenv("LLM_METRICS_FLUSH_SIZE", "50"))
+
+        self.latency: Dict[Tuple[str, str], Histogram] = {}
+        self.tokens: Dict[Tuple[str, str], Histogram] = {}
+        self.pending: List[Dict] = []
+        # Tokens and cost per run, for run budgets
+        self.runs: Dict[str, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def record(
+        self,
+        task: str,
+        model: str,
+        backend: str,
+        outcome: str,
+        latency_ms: float,
+        prompt_tokens: int = 0,
+        completion_tokens: int = 0,
+        retries: int = 0,
+        cost: float = 0.0,
+        error: Optional[str] = None
+    ):
+        """
+        Record one LLM call
+
+        Args:
+            task: Routing task of the call
+            model: Model the call was sent to
+            backend: Backend name
+            outcome: "ok", "cached", "memory", "rate_limited" or "error"
+            latency_ms: Wall time including retries
+            prompt_tokens: Prompt tokens
+            completion_tokens: Completion tokens
+            retries: Attempts after the first one
+            cost: Estimated cost in USD
+            error: Error message of a failed call
+        """
+        row = {
+            'run_id': current_run.get(),
+            'source': current_source.get(),
+            'task': task,
+            'model': model,
+            'backend': backend,
+            'outcome': outcome,
+            'latency_ms': round(latency_ms, 1),
+            'prompt_tokens': prompt_tokens,
+            'completion_tokens': completion_tokens,
+            'retries': retries,
+            'cost': cost,
+            'error': error[:500] if error else None,
+            'created_at': datetime.now(),
+        }
+
+        with self._lock:
+            if outcome not in REUSED_OUTCOMES:
+                key = (task, model)
+                self.latency.setdefault(key, Histogram(LATENCY_BUCKETS_MS)).observe(latency_ms)
+                self.tokens.setdefault(key, Histogram(TOKEN_BUCKETS)).observe(prompt_tokens + completion_tokens)
+                if row['run_id']:
+                    usage = self.runs.setdefault(row['run_id'], [0, 0.0])
+                    usage[0] += prompt_tokens + completion_tokens
+                    usage[1] += cost
+            if self.enabled:
+                self.pending.append(row)
+            flush = len(self.pending) >= self.flush_size
+
+        if flush:
+            self.flush()
+
+    def flush(self):
+        """Write the buffered call rows"""
+        with self._lock:
+            rows, self.pending = self.pending, []
+        if not rows:
+            return
+
+        db = SessionLocal()
+        try:
+            db.bulk_insert_mappings(LLMCall, rows)
+            db.commit()
+        except Exception as e:
+            logger.error(f"Error writing {len(rows)} LLM call records: {str(e)}")
+            db.rollback()
+        finally:
+            db.close()
+
+    def run_usage(self, run_id: str) -> Tuple[int, float]:
+        """Tokens and estimated cost of the calls made so far in a run of this process"""
+        with self._lock:
+            tokens, cost = self.runs.get(run_id, (0, 0.0))
+        return int(tokens), cost
+
+    def end_run(self, run_id: str):
+        """Drop the in-process totals of a finished run"""
+        with self._lock:
+            self.runs.pop(run_id, None)
+
+    def histograms(self) -> Dict[str, Dict]:
+        """Latency (ms) and token histograms per "task:model" """
+        with self._lock:
+            return {
+                f"{task}:{model}": {
+                    'latency_ms': self.latency[(task, model)].as_dict(),
+                    'tokens': self.tokens[(task, model)].as_dict(),
+                }
+                for task, model in sorted(self.latency)
+            }
+
+
+_metrics: Optional[LLMMetrics] = None
+_metrics_lock = threading.Lock()
+
+
+def get_llm_metrics() -> LLMMetrics:
+    """Recorder shared by all components"""
+    global _metrics
+    with _metrics_lock:
+        if _metrics is None:
+            _metrics = LLMMetrics()
+        return _metrics
@@ -0,0 +1,307 @@
+"""
+Single-call article processing with structured output
+"""
+from typing import Dict, List, Optional, Tuple
+from langchain.schema import HumanMessage, SystemMessage
+from pydantic import BaseModel, Field, ValidationError
+import asyncio
+import math
+import os
+import logging
+
+from .backends import LLMBackend
+from .llm import LLMComponent
+from .routing import TaskRoute, call_cost
+from .summarizer import ArticleSummarizer
+from .translator import ArticleTranslator
+
+logger = logging.getLogger(__name__)
+
+# Tokens of instructions, framing and function schema added to each prompt
+PROMPT_OVERHEAD = 600
+
+
+class ArticleDigest(BaseModel):
+    """Summary, key points and Japanese translation of an article"""
+    summary_en: str = Field(min_length=1, description="English summary, 100-150 words")
+    key_points_en: List[str] = Field(
+        min_length=1, max_length=5, description="3-5 English key points, one sentence each"
+    )
+    title_ja: str = Field(min_length=1, description="Japanese title, under 60 characters")
+    summary_ja: str = Field(
+        min_length=1, description="Summary in easy Japanese (やさしい日本語), 150-200 characters"
+    )
+    key_points_ja: List[str] = Field(
+        min_length=1, max_length=5,
+        description="Key points in easy Japanese, under 100 characters each"
+    )
+
+
+DIGEST_FUNCTION = {
+    "name": "record_article_digest",
+    "description": ArticleDigest.__doc__,
+    "parameters": ArticleDigest.model_json_schema(),
+}
+
+
+class ArticleProcessor(LLMComponent):
+    """
+    Summarize and translate an article
+
+    In "combined" mode (the default) one function-calling request returns
+    the English summary and key points together with their Japanese
+    translation, so the article is sent once instead of twice and five
+    round trips become one. Responses that fail schema validation fall
+    back to the "multi" path: the separate summarizer and translator calls.
+    Articles over the token budget are condensed by the summarizer first.
+    """
+
+    prompt_version = "2"
+
+    def __init__(
+        self,
+        summarizer: Optional[ArticleSummarizer] = None,
+        translator: Optional[ArticleTranslator] = None,
+        model: Optional[str] = None,
+        temperature: Optional[float] = None,
+        mode: Optional[str] = None,
+        backend: Optional[LLMBackend] = None,
+        routes: Optional[Dict[str, TaskRoute]] = None
+    ):
+        """
+        Initialize the processor
+
+        Args:
+            summarizer: Summarizer for the multi-call path
+            translator: Translator for the multi-call path
+            model: Model for every task, overriding the routing table
+            temperature: Sampling temperature (0-1), overriding the routing table
+            mode: "combined" or "multi" (default: AI_PROCESSING_MODE or combined)
+            backend: Backend serving the model, shared with the default
+                summarizer and translator (default: ``get_backend()``)
+            routes: Route per task (default: ``get_routes()``)
+        """
+        super().__init__(model=model, temperature=temperature, backend=backend, routes=routes)
+
+        options = dict(model=model, temperature=temperature, backend=self.backend, routes=self.routes)
+        self.summarizer = summarizer or ArticleSummarizer(**options)
+        self.translator = translator or ArticleTranslator(**options)
+        self.mode = mode or os.getenv("AI_PROCESSING_MODE", "combined")
+
+    def process(self, title: str, content: str) -> Optional[Dict]:
+        """
+        Summarize an article and translate it to Japanese
+
+        Args:
+            title: Article title
+            content: Article content
+
+        Returns:
+            Dictionary with summary_en, key_points_en, title_ja, summary_ja
+            and key_points_ja, or None on failure
+        """
+        # Long articles are condensed once for all the calls below
+        content = self.summarizer.condense(title, content)
+        if not content:
+            return None
+
+        if self.mode == "combined":
+            digest = self.process_combined(title, content)
+            if digest:
+                return digest
+            logger.warning(f"Falling back to separate calls for: {title[:50]}...")
+
+        return self.process_multi(title, content)
+
+    async def aprocess(self, title: str, content: str) -> Optional[Dict]:
+        """Asynchronous ``process``"""
+        content = await self.summarizer.acondense(title, content)
+        if not content:
+            return None
+
+        if self.mode == "combined":
+            digest = await self.aprocess_combined(title, content)
+            if digest:
+                return digest
+            logger.warning(f"Falling back to separate calls for: {title[:50]}...")
+
+        return await self.aprocess_multi(title, content)
+
+    def estimate_usage(self, title: str, content: str) -> Tuple[int, float]:
+        """
+        Upper estimate of the tokens and cost of processing an article
+
+        Every call is assumed to use its route's full max_tokens; long
+        articles add one chunk_notes call per chunk. Cache and translation
+        memory hits are not anticipated.
+
+        Args:
+            title: Article title
+            content: Article content
+
+        Returns:
+            Tokens and estimated cost in USD
+        """
+        budget = self.summarizer.budget
+        article_tokens = budget.count(title) + budget.count(content)
+        calls = []
+
+        if article_tokens > budget.max_input_tokens:
+            chunks = min(math.ceil(article_tokens / budget.chunk_tokens), budget.max_chunks)
+            calls += [("chunk_notes", budget.chunk_tokens)] * chunks
+            article_tokens = budget.max_input_tokens
+
+        if self.mode == "combined":
+            calls.append(("digest", article_tokens))
+        else:
+            calls += [("summary", article_tokens), ("key_points", article_tokens)]
+            calls += [
+                ("title_translation", 100),
+                ("summary_translation", self.route("summary").max_tokens),
+                ("key_points_translation", self.route("key_points").max_tokens),
+            ]
+
+        tokens = 0
+        cost = 0.0
+        for task, prompt_tokens in calls:
+            route = self.route(task)
+            tokens += PROMPT_OVERHEAD + prompt_tokens + route.max_tokens
+            cost += call_cost(route.model, PROMPT_OVERHEAD + prompt_tokens, route.max_tokens)
+        return tokens, cost
+
+    def _digest_messages(self, title: str, content: str) -> List:
+        system_prompt = """You are an expert at summarizing AI and technology articles and translating them for Japanese readers.
+Record a digest of the article with the provided function.
+
+Guidelines:
+- summary_en: 100-150 words covering the main findings, innovations or news; keep facts, numbers and names
+- key_points_en: 3-5 key takeaways, one clear sentence each, prioritizing newsworthy information
+- title_ja: a catchy, informative Japanese title under 60 characters
+- summary_ja: the summary in easy-to-understand Japanese (やさしい日本語) for a general audience, 150-200 characters
+- key_points_ja: the key points in easy Japanese, under 100 characters each, with brief explanations of technical terms
+- Use appropriate Japanese technical terms and 「」 for quotations and emphasis"""
+
+        content = self.summarizer.budget.truncate(content)
+        human_prompt = f"""Title: {title}
+
+Content: {content}"""
+        human_prompt += self.translator._glossary_note(title, content)
+
+        return [
+            SystemMessage(content=system_prompt),
+            HumanMessage(content=human_prompt)
+        ]
+
+    def _parse_digest(self, title: str, response) -> Optional[Dict]:
+        """Validate the function call arguments of a combined response"""
+        try:
+            function_call = response.additional_kwargs.get("function_call") or {}
+            digest = ArticleDigest.model_validate_json(function_call.get("arguments") or "")
+
+            logger.info(f"Processed in one call: {title[:50]}...")
+            return digest.model_dump()
+
+        except ValidationError as e:
+            first = e.errors()[0]
+            logger.error(
+                f"Invalid structured response ({e.error_count()} errors): "
+                f"{'.'.join(map(str, first['loc']))}: {first['msg']}"
+            )
+            return None
+
+    def _remember_digest(self, title: str, digest: Dict):
+        """Add the title and key point translations of a digest to the translation memory"""
+        self.translator._remember("title", {title: digest['title_ja']})
+        if len(digest['key_points_en']) == len(digest['key_points_ja']):
+            self.translator._remember("key_point", dict(zip(digest['key_points_en'], digest['key_points_ja'])))
+
+    def process_combined(self, title: str, content: str) -> Optional[Dict]:
+        """Summarize and translate an article with one structured-output call"""
+        try:
+            messages = self._digest_messages(title, content)
+            response = self._invoke(messages, task="digest", functions=[DIGEST_FUNCTION])
+            digest = self._parse_digest(title, response)
+            if digest is None:
+                self._forget("digest", messages, [DIGEST_FUNCTION])
+            else:
+                self._remember_digest(title, digest)
+            return digest
+
+        except Exception as e:
+            logger.error(f"Error processing article: {str(e)}")
+            return None
+
+    async def aprocess_combined(self, title: str, content: str) -> Optional[Dict]:
+        """Asynchronous ``process_combined``"""
+        try:
+            messages = await asyncio.to_thread(self._digest_messages, title, content)
+            response = await self._ainvoke(messages, task="digest", functions=[DIGEST_FUNCTION])
+            digest = self._parse_digest(title, response)
+            if digest is None:
+                await asyncio.to_thread(self._forget, "digest", messages, [DIGEST_FUNCTION])
+            else:
+                await asyncio.to_thread(self._remember_digest, title, digest)
+            return digest
+
+        except Exception as e:
+            logger.error(f"Error processing article: {str(e)}")
+            return None
+
+    def process_multi(self, title: str, content: str) -> Optional[Dict]:
+        """Summarize and translate an article with separate calls"""
+        # 1. Summarize in English
+        logger.info("Summarizing article...")
+        summary_en = self.summarizer.summarize(title, content)
+        if not summary_en:
+            logger.error("Failed to generate summary")
+            return None
+
+        # 2. Extract key points in English
+        logger.info("Extracting key points...")
+        key_points_en = self.summarizer.extract_key_points(title, content)
+        if not key_points_en:
+            logger.error("Failed to extract key points")
+            return None
+
+        # 3. Translate to Japanese
+        logger.info("Translating to Japanese...")
+        translation = self.translator.translate_article(title, summary_en, key_points_en)
+        if not translation:
+            logger.error("Failed to translate article")
+            return None
+
+        return {
+            'summary_en': summary_en,
+            'key_points_en': key_points_en,
+            'title_ja': translation['title_ja'],
+            'summary_ja': translation['summary_ja'],
+            'key_points_ja': translation['key_points_ja']
+        }
+
+    async def aprocess_multi(self, title: str, content: str) -> Optional[Dict]:
+        """Asynchronous ``process_multi``; summary and key points are requested concurrently"""
+        logger.info("Summarizing article and extracting key points...")
+        summary_en, key_points_en = await asyncio.gather(
+            self.summarizer.asummarize(title, content),
+            self.summarizer.aextract_key_points(title, content)
+        )
+        if not summary_en:
+            logger.error("Failed to generate summary")
+            return None
+        if not key_points_en:
+            logger.error("Failed to extract key points")
+            return None
+
+        logger.info("Translating to Japanese...")
+        translation = await self.translator.atranslate_article(title, summary_en, key_points_en)
+        if not translation:
+            logger.error("Failed to translate article")
+            return None
+
+        return {
+            'summary_en': summary_en,
+            'key_points_en': key_points_en,
+            'title_ja': translation['title_ja'],
+            'summary_ja': translation['summary_ja'],
+            'key_points_ja': translation['key_points_ja']
+        }
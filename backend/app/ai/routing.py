@@ -0,0 +1,208 @@
+"""
+Per-task model routing and call statistics
+"""
+from dataclasses import dataclass, replace
+from typing import Dict, Optional, Tuple
+import json
+import os
+import threading
+import logging
+
+logger = logging.getLogger(__name__)
+
+# USD per 1K prompt and completion tokens; the longest matching prefix applies
+MODEL_PRICES: Dict[str, Tuple[float, float]] = {
+    "gpt-4o-mini": (0.00015, 0.0006),
+    "gpt-4o": (0.005, 0.015),
+    "gpt-4-turbo": (0.01, 0.03),
+    "gpt-4-1106": (0.01, 0.03),
+    "gpt-4-0125": (0.01, 0.03),
+    "gpt-4-32k": (0.06, 0.12),
+    "gpt-4": (0.03, 0.06),
+    "gpt-3.5-turbo": (0.0005, 0.0015),
+}
+
+
+@dataclass
+class TaskRoute:
+    """Model settings for one kind of LLM call"""
+    model: str
+    temperature: float = 0.3
+    max_tokens: int = 400
+
+
+def default_routes() -> Dict[str, TaskRoute]:
+    """
+    Built-in routing table
+
+    Steps whose output readers see directly use LLM_MODEL (default gpt-4);
+    short or intermediate steps use LLM_FAST_MODEL (default gpt-3.5-turbo).
+    """
+    quality = os.getenv("LLM_MODEL", "gpt-4")
+    fast = os.getenv("LLM_FAST_MODEL", "gpt-3.5-turbo")
+
+    return {
+        "digest": TaskRoute(quality, 0.3, 1500),
+        "summary": TaskRoute(quality, 0.3, 400),
+        "key_points": TaskRoute(quality, 0.3, 400),
+        "chunk_notes": TaskRoute(fast, 0.3, 400),
+        "title_translation": TaskRoute(fast, 0.3, 100),
+        "summary_translation": TaskRoute(quality, 0.3, 600),
+        "key_points_translation": TaskRoute(fast, 0.3, 800),
+    }
+
+
+def load_routes(config: Optional[str] = None) -> Dict[str, TaskRoute]:
+    """
+    Routing table with overrides applied
+
+    Args:
+        config: JSON object, or path to a JSON file, mapping task names to
+            any of model, temperature and max_tokens (default: LLM_ROUTES),
+            e.g. {"summary_translation": {"model": "gpt-3.5-turbo"}}
+
+    Returns:
+        Route per task
+    """
+    routes = default_routes()
+    config = config or os.getenv("LLM_ROUTES", "")
+    if not config:
+        return routes
+
+    try:
+        if os.path.isfile(config):
+            with open(config, encoding='utf-8') as f:
+                config = f.read()
+
+        for task, settings in json.loads(config).items():
+            base = routes.get(task) or TaskRoute(os.getenv("LLM_MODEL", "gpt-4"))
+            routes[task] = replace(base, **settings)
+
+    except Exception as e:
+        logger.error(f"Invalid LLM_ROUTES, using the default routes: {str(e)}")
+        return default_routes()
+
+    return routes
+
+
+_routes: Optional[Dict[str, TaskRoute]] = None
+
+
+def get_routes() -> Dict[str, TaskRoute]:
+    """Routing table shared by all components"""
+    global _routes
+    if _routes is None:
+        _routes = load_routes()
+    return _routes
+
+
+def model_price(model: str) -> Tuple[float, float]:
+    """Prompt and completion price per 1K tokens (0 for unknown models)"""
+    prices = dict(MODEL_PRICES)
+    if os.getenv("LLM_PRICES"):
+        prices.update({name: tuple(price) for name, price in json.loads(os.getenv("LLM_PRICES")).items()})
+
+    matches = [name for name in prices if model.startswith(name)]
+    if not matches:
+        return 0.0, 0.0
+    return prices[max(matches, key=len)]
+
+
+def call_cost(model: str, prompt_tokens: int, completion_tokens: int) -> float:
+    """Estimated USD cost of a call"""
+    prompt_price, completion_price = model_price(model)
+    return (prompt_tokens * prompt_price + completion_tokens * completion_price) / 1000
+
+
+@dataclass
+class TaskStats:
+    """Calls of one task on one model"""
+    calls: int = 0
+    cached: int = 0
+    errors: int = 0
+    seconds: float = 0.0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cost: float = 0.0
+    max_seconds: float = 0.0
+
+    def as_dict(self) -> Dict:
+        return {
+            'calls': self.calls,
+            'cached': self.cached,
+            'errors': self.errors,
+            'avg_latency': round(self.seconds / self.calls, 3) if self.calls else 0.0,
+            'max_latency': round(self.max_seconds, 3),
+            'prompt_tokens': self.prompt_tokens,
+            'completion_tokens': self.completion_tokens,
+            'cost': round(self.cost, 4),
+        }
+
+
+class RoutingStats:
+    """
+    Latency, token and cost totals per task and model
+
+    Token counts are computed locally from the prompt and the response, and
+    costs from MODEL_PRICES (LLM_PRICES overrides, e.g. {"llama3": [0, 0]}),
+    so both are estimates. Thread-safe.
+    """
+
+    def __init__(self):
+        self.tasks: Dict[Tuple[str, str], TaskStats] = {}
+        self._lock = threading.Lock()
+
+    def _get(self, task: str, model: str) -> TaskStats:
+        return self.tasks.setdefault((task, model), TaskStats())
+
+    def record(
+        self,
+        task: str,
+        model: str,
+        seconds: float,
+        prompt_tokens: int,
+        completion_tokens: int,
+        error: bool = False
+    ):
+        """Record a call sent to the backend"""
+        cost = call_cost(model, prompt_tokens, completion_tokens)
+        with self._lock:
+            stats = self._get(task, model)
+            stats.calls += 1
+            stats.errors += int(error)
+            stats.seconds += seconds
+            stats.max_seconds = max(stats.max_seconds, seconds)
+            stats.prompt_tokens += prompt_tokens
+            stats.completion_tokens += completion_tokens
+            stats.cost += cost
+
+    def record_cached(self, task: str, model: str):
+        """Record a call answered from the LLM cache"""
+        with self._lock:
+            self._get(task, model).cached += 1
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """Totals per "task:model" """
+        with self._lock:
+            return {f"{task}:{model}": stats.as_dict() for (task, model), stats in sorted(self.tasks.items())}
+
+    def reset(self):
+        with self._lock:
+            self.tasks.clear()
+
+    def log_summary(self):
+        """Log one line per task and model"""
+        for name, stats in self.snapshot().items():
+            logger.info(
+                f"LLM {name}: {stats['calls']} calls ({stats['cached']} cached, {stats['errors']} errors), "
+                f"avg {stats['avg_latency']}s, max {stats['max_latency']}s, "
+                f"{stats['prompt_tokens']}+{stats['completion_tokens']} tokens, ${stats['cost']}"
+            )
+
+
+_stats = RoutingStats()
+
+
+def get_routing_stats() -> RoutingStats:
+    """Statistics shared by all components"""
+    return _stats
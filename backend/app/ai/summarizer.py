@@ -1,50 +1,146 @@
 """
 AI-powered article summarization using LangChain and OpenAI
 """
-from typing import Dict, Optional
-from langchain_openai import ChatOpenAI
-from langchain.prompts import ChatPromptTemplate
+from typing import Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
 from langchain.schema import HumanMessage, SystemMessage
-import os
+import asyncio
+import contextvars
 import logging
 
+from .budget import TokenBudget
+from .backends import LLMBackend
+from .llm import LLMComponent, parse_numbered_list
+from .routing import TaskRoute
+
 logger = logging.getLogger(__name__)
 
 
-class ArticleSummarizer:
-    """Summarize English articles using GPT"""
+class ArticleSummarizer(LLMComponent):
+    """
+    Summarize English articles using GPT
+
+    Articles within the token budget are summarized in a single pass.
+    Longer ones are condensed map-reduce style first: notes are taken
+    from every chunk concurrently, and the summary and key points are
+    written from the combined notes.
+    """
+
+    prompt_version = "2"
 
-    def __init__(self, model: str = "gpt-4", temperature: float = 0.3):
+    def __init__(
+        self,
+        model: Optional[str] = None,
+        temperature: Optional[float] = None,
+        backend: Optional[LLMBackend] = None,
+        routes: Optional[Dict[str, TaskRoute]] = None
+    ):
         """
         Initialize the summarizer
 
         Args:
-            model: OpenAI model to use (gpt-4, gpt-3.5-turbo, etc.)
-            temperature: Sampling temperature (0-1)
+            model: Model for every task, overriding the routing table
+                (summary, key_points, chunk_notes)
+            temperature: Sampling temperature (0-1), overriding the routing table
+            backend: Backend serving the model (default: ``get_backend()``)
+            routes: Route per task (default: ``get_routes()``)
         """
-        api_key = os.getenv("OPENAI_API_KEY")
-        if not api_key:
-            raise ValueError("OPENAI_API_KEY not found in environment variables")
+        super().__init__(model=model, temperature=temperature, backend=backend, routes=routes)
+        self.budget = TokenBudget(self.route("summary").model)
 
-        self.llm = ChatOpenAI(
-            model=model,
-            temperature=temperature,
-            openai_api_key=api_key
-        )
+    def _notes_messages(self, title: str, chunk: str, part: int, parts: int) -> List:
+        system_prompt = """You are an expert at analyzing technical articles about AI and technology.
+You will be given one part of a longer article. Take notes that a summary of the whole article can be written from.
 
-    def summarize(self, title: str, content: str) -> Optional[str]:
+Guidelines:
+- List the main findings, innovations, or news in this part
+- Preserve important facts, numbers, and names
+- Use concise bullet points
+- Skip navigation text, advertisements and unrelated content"""
+
+        human_prompt = f"""Article title: {title}
+
+Part {part} of {parts}:
+
+{chunk}"""
+
+        return [
+            SystemMessage(content=system_prompt),
+            HumanMessage(content=human_prompt)
+        ]
+
+    def _chunk_notes(self, title: str, chunk: str, part: int, parts: int) -> Optional[str]:
+        try:
+            response = self._invoke(
+                self._notes_messages(title, chunk, part, parts),
+                task="chunk_notes"
+            )
+            return response.content.strip()
+        except Exception as e:
+            logger.error(f"Error taking notes on part {part}/{parts}: {str(e)}")
+            return None
+
+    async def _achunk_notes(self, title: str, chunk: str, part: int, parts: int) -> Optional[str]:
+        try:
+            response = await self._ainvoke(
+                self._notes_messages(title, chunk, part, parts),
+                task="chunk_notes"
+            )
+            return response.content.strip()
+        except Exception as e:
+            logger.error(f"Error taking notes on part {part}/{parts}: {str(e)}")
+            return None
+
+    def _join_notes(self, title: str, notes: List[Optional[str]]) -> Optional[str]:
+        notes = [note for note in notes if note]
+        if not notes:
+            logger.error(f"Failed to condense: {title[:50]}...")
+            return None
+        logger.info(f"Condensed long article from {len(notes)} parts: {title[:50]}...")
+        return self.budget.truncate('\n\n'.join(notes))
+
+    def condense(self, title: str, content: str) -> Optional[str]:
         """
-        Summarize an article
+        Fit an article into the input budget
 
         Args:
             title: Article title
             content: Article content
 
         Returns:
-            Summarized text in English
+            The content itself if it fits, otherwise notes taken from its
+            chunks concurrently (None if every chunk failed)
         """
-        try:
-            system_prompt = """You are an expert at summarizing technical articles about AI and technology.
+        if self.budget.fits(content):
+            return content
+
+        chunks = self.budget.split(content)
+        with ThreadPoolExecutor(max_workers=len(chunks)) as executor:
+            # Each thread runs in a copy of this context so calls keep their run and source
+            futures = [
+                executor.submit(
+                    contextvars.copy_context().run,
+                    self._chunk_notes, title, chunk, part + 1, len(chunks)
+                )
+                for part, chunk in enumerate(chunks)
+            ]
+            notes = [future.result() for future in futures]
+        return self._join_notes(title, notes)
+
+    async def acondense(self, title: str, content: str) -> Optional[str]:
+        """Asynchronous ``condense``"""
+        if self.budget.fits(content):
+            return content
+
+        chunks = self.budget.split(content)
+        notes = await asyncio.gather(*(
+            self._achunk_notes(title, chunk, part + 1, len(chunks))
+            for part, chunk in enumerate(chunks)
+        ))
+        return self._join_notes(title, notes)
+
+    def _summary_messages(self, title: str, content: str) -> List:
+        system_prompt = """You are an expert at summarizing technical articles about AI and technology.
 Your task is to create a concise, accurate summary that captures the key points of the article.
 
 Guidelines:
@@ -54,20 +150,74 @@ Guidelines:
 - Use clear, accessible language
 - Preserve important facts, numbers, and names"""
 
-            human_prompt = f"""Please summarize the following article:
+        human_prompt = f"""Please summarize the following article:
 
 Title: {title}
 
-Content: {content[:4000]}  # Limit content length
+Content: {self.budget.truncate(content)}
 
 Provide a concise summary in English."""
 
-            messages = [
-                SystemMessage(content=system_prompt),
-                HumanMessage(content=human_prompt)
-            ]
+        return [
+            SystemMessage(content=system_prompt),
+            HumanMessage(content=human_prompt)
+        ]
+
+    def _key_points_messages(self, title: str, content: str) -> List:
+        system_prompt = """You are an expert at analyzing technical articles about AI and technology.
+Your task is to extract the most important key points from the article.
+
+Guidelines:
+- Identify 3-5 key takeaways
+- Each point should be one clear sentence
+- Focus on actionable insights, findings, or implications
+- Prioritize unique or newsworthy information"""
+
+        human_prompt = f"""Please extract the key points from the following article:
+
+Title: {title}
+
+Content: {self.budget.truncate(content)}
+
+Provide 3-5 key points as a numbered list. Each point should be a single sentence."""
 
-            response = self.llm.invoke(messages)
+        return [
+            SystemMessage(content=system_prompt),
+            HumanMessage(content=human_prompt)
+        ]
+
+    def summarize(self, title: str, content: str) -> Optional[str]:
+        """
+        Summarize an article
+
+        Args:
+            title: Article title
+            content: Article content
+
+        Returns:
+            Summarized text in English
+        """
+        try:
+            content = self.condense(title, content)
+            if not content:
+                return None
+            response = self._invoke(self._summary_messages(title, content), task="summary")
+            summary = response.content.strip()
+
+            logger.info(f"Successfully summarized: {title[:50]}...")
+            return summary
+
+        except Exception as e:
+            logger.error(f"Error summarizing article: {str(e)}")
+            return None
+
+    async def asummarize(self, title: str, content: str) -> Optional[str]:
+        """Asynchronous ``summarize``"""
+        try:
+            content = await self.acondense(title, content)
+            if not content:
+                return None
+            response = await self._ainvoke(self._summary_messages(title, content), task="summary")
             summary = response.content.strip()
 
             logger.info(f"Successfully summarized: {title[:50]}...")
@@ -89,41 +239,27 @@ Provide a concise summary in English."""
             List of key points in English
         """
         try:
-            system_prompt = """You are an expert at analyzing technical articles about AI and technology.
-Your task is to extract the most important key points from the article.
+            content = self.condense(title, content)
+            if not content:
+                return None
+            response = self._invoke(self._key_points_messages(title, content), task="key_points")
+            key_points = parse_numbered_list(response.content.strip())
 
-Guidelines:
-- Identify 3-5 key takeaways
-- Each point should be one clear sentence
-- Focus on actionable insights, findings, or implications
-- Prioritize unique or newsworthy information"""
-
-            human_prompt = f"""Please extract the key points from the following article:
-
-Title: {title}
-
-Content: {content[:4000]}
-
-Provide 3-5 key points as a numbered list. Each point should be a single sentence."""
+            logger.info(f"Extracted {len(key_points)} key points from: {title[:50]}...")
+            return key_points[:5]  # Limit to 5 points
 
-            messages = [
-                SystemMessage(content=system_prompt),
-                HumanMessage(content=human_prompt)
-            ]
+        except Exception as e:
+            logger.error(f"Error extracting key points: {str(e)}")
+            return None
 
-            response = self.llm.invoke(messages)
-            key_points_text = response.content.strip()
-
-            # Parse the numbered list into an array
-            key_points = []
-            for line in key_points_text.split('\n'):
-                line = line.strip()
-                # Remove numbering (1., 2., etc.)
-                if line and (line[0].isdigit() or line.startswith('-')):
-                    # Remove the number/bullet and clean
-                    point = line.lstrip('0123456789.-) ').strip()
-                    if point:
-                        key_points.append(point)
+    async def aextract_key_points(self, title: str, content: str) -> Optional[list]:
+        """Asynchronous ``extract_key_points``"""
+        try:
+            content = await self.acondense(title, content)
+            if not content:
+                return None
+            response = await self._ainvoke(self._key_points_messages(title, content), task="key_points")
+            key_points = parse_numbered_list(response.content.strip())
 
             logger.info(f"Extracted {len(key_points)} key points from: {title[:50]}...")
             return key_points[:5]  # Limit to 5 points
@@ -1,35 +1,134 @@
 """
 AI-powered translation to simple Japanese using LangChain and OpenAI
 """
-from typing import List, Optional
-from langchain_openai import ChatOpenAI
+from typing import Dict, List, Optional, Tuple
 from langchain.schema import HumanMessage, SystemMessage
-import os
+import asyncio
+import time
 import logging
 
-logger = logging.getLogger(__name__)
+from .backends import LLMBackend
+from .llm import LLMComponent, parse_numbered_list
+from .memory import get_translation_memory
+from .routing import TaskRoute
 
+logger = logging.getLogger(__name__)
 
-class ArticleTranslator:
-    """Translate articles to simple Japanese using GPT"""
 
-    def __init__(self, model: str = "gpt-4", temperature: float = 0.3):
+class ArticleTranslator(LLMComponent):
+    """
+    Translate articles to simple Japanese using GPT
+
+    Titles, summaries and individual key points already in the translation
+    memory are reused without calling the model, and glossary terms found
+    in the English text are listed in the prompt (see ``memory``). The
+    asynchronous methods do this bookkeeping, which may query the database,
+    in worker threads.
+    """
+
+    def __init__(
+        self,
+        model: Optional[str] = None,
+        temperature: Optional[float] = None,
+        backend: Optional[LLMBackend] = None,
+        routes: Optional[Dict[str, TaskRoute]] = None
+    ):
         """
         Initialize the translator
 
         Args:
-            model: OpenAI model to use
-            temperature: Sampling temperature (0-1)
+            model: Model for every task, overriding the routing table
+                (title_translation, summary_translation, key_points_translation)
+            temperature: Sampling temperature (0-1), overriding the routing table
+            backend: Backend serving the model (default: ``get_backend()``)
+            routes: Route per task (default: ``get_routes()``)
         """
-        api_key = os.getenv("OPENAI_API_KEY")
-        if not api_key:
-            raise ValueError("OPENAI_API_KEY not found in environment variables")
+        super().__init__(model=model, temperature=temperature, backend=backend, routes=routes)
+        self.memory = get_translation_memory()
+
+    def _glossary_note(self, *texts: str) -> str:
+        return self.memory.glossary_note(*texts) if self.memory else ""
+
+    def _recall(self, kind: str, texts: List[str]) -> Dict[str, str]:
+        return self.memory.lookup(kind, texts) if self.memory else {}
+
+    def _remember(self, kind: str, pairs: Dict[str, str]):
+        if self.memory:
+            self.memory.store(kind, pairs)
+
+    def _reused(self, task: str, count: int = 1):
+        """Record calls answered from the translation memory"""
+        for _ in range(count):
+            self._record(task, self.route(task), "memory", time.perf_counter())
+
+    def _title_messages(self, title: str) -> List:
+        system_prompt = """You are an expert translator specializing in AI and technology news.
+Translate English article titles to natural, engaging Japanese.
+
+Guidelines:
+- Make it catchy and informative
+- Use appropriate technical terms in Japanese
+- Keep it concise (under 60 characters)
+- Sound natural to Japanese readers"""
+
+        human_prompt = f"Translate this article title to Japanese:\n\n{title}"
+        human_prompt += self._glossary_note(title)
+
+        return [
+            SystemMessage(content=system_prompt),
+            HumanMessage(content=human_prompt)
+        ]
+
+    def _summary_messages(self, summary: str) -> List:
+        system_prompt = """You are an expert translator specializing in AI and technology content.
+Translate English summaries into clear, easy-to-understand Japanese (やさしい日本語).
+
+Guidelines:
+- Use simple, accessible Japanese suitable for a general audience
+- Break down complex technical concepts into understandable language
+- Maintain accuracy while prioritizing clarity
+- Use appropriate technical terms when necessary, with explanations
+- Keep the tone informative but friendly
+- Aim for 150-200 characters in Japanese"""
+
+        human_prompt = f"""Translate this article summary to easy-to-understand Japanese:
+
+{summary}
 
-        self.llm = ChatOpenAI(
-            model=model,
-            temperature=temperature,
-            openai_api_key=api_key
-        )
+Make it accessible for readers who may not be technical experts."""
+        human_prompt += self._glossary_note(summary)
+
+        return [
+            SystemMessage(content=system_prompt),
+            HumanMessage(content=human_prompt)
+        ]
+
+    def _key_points_messages(self, key_points: List[str]) -> List:
+        # Join key points into a single text
+        key_points_text = '\n'.join([f"{i+1}. {point}" for i, point in enumerate(key_points)])
+
+        system_prompt = """You are an expert translator specializing in AI and technology content.
+Translate key points into clear Japanese with helpful context.
+
+Guidelines:
+- Use simple, accessible Japanese (やさしい日本語)
+- Add brief explanations for technical terms
+- Make each point self-contained and clear
+- Keep each point concise (under 100 characters)
+- Use 「」for quotations and emphasis
+- Maintain the informative value while being accessible"""
+
+        human_prompt = f"""Translate these key points to easy-to-understand Japanese:
+
+{key_points_text}
+
+Provide the translation as a numbered list. Add brief explanations for technical terms where helpful."""
+        human_prompt += self._glossary_note(*key_points)
+
+        return [
+            SystemMessage(content=system_prompt),
+            HumanMessage(content=human_prompt)
+        ]
 
     def translate_title(self, title: str) -> Optional[str]:
         """
@@ -42,24 +141,35 @@ class ArticleTranslator:
             Japanese title
         """
         try:
-            system_prompt = """You are an expert translator specializing in AI and technology news.
-Translate English article titles to natural, engaging Japanese.
+            remembered = self._recall("title", [title]).get(title)
+            if remembered:
+                self._reused("title_translation")
+                return remembered
 
-Guidelines:
-- Make it catchy and informative
-- Use appropriate technical terms in Japanese
-- Keep it concise (under 60 characters)
-- Sound natural to Japanese readers"""
+            response = self._invoke(self._title_messages(title), task="title_translation")
+            translated_title = response.content.strip()
+            self._remember("title", {title: translated_title})
 
-            human_prompt = f"Translate this article title to Japanese:\n\n{title}"
+            logger.info(f"Translated title: {title[:50]}...")
+            return translated_title
 
-            messages = [
-                SystemMessage(content=system_prompt),
-                HumanMessage(content=human_prompt)
-            ]
+        except Exception as e:
+            logger.error(f"Error translating title: {str(e)}")
+            return None
 
-            response = self.llm.invoke(messages)
+    async def atranslate_title(self, title: str) -> Optional[str]:
+        """Asynchronous ``translate_title``"""
+        try:
+            remembered = (await asyncio.to_thread(self._recall, "title", [title])).get(title)
+            if remembered:
+                await asyncio.to_thread(self._reused, "title_translation")
+                return remembered
+
+            response = await self._ainvoke(
+                await asyncio.to_thread(self._title_messages, title), task="title_translation"
+            )
             translated_title = response.content.strip()
+            await asyncio.to_thread(self._remember, "title", {title: translated_title})
 
             logger.info(f"Translated title: {title[:50]}...")
             return translated_title
@@ -79,30 +189,35 @@ Guidelines:
             Japanese summary
         """
         try:
-            system_prompt = """You are an expert translator specializing in AI and technology content.
-Translate English summaries into clear, easy-to-understand Japanese (やさしい日本語).
+            remembered = self._recall("summary", [summary]).get(summary)
+            if remembered:
+                self._reused("summary_translation")
+                return remembered
 
-Guidelines:
-- Use simple, accessible Japanese suitable for a general audience
-- Break down complex technical concepts into understandable language
-- Maintain accuracy while prioritizing clarity
-- Use appropriate technical terms when necessary, with explanations
-- Keep the tone informative but friendly
-- Aim for 150-200 characters in Japanese"""
-
-            human_prompt = f"""Translate this article summary to easy-to-understand Japanese:
-
-{summary}
+            response = self._invoke(self._summary_messages(summary), task="summary_translation")
+            translated_summary = response.content.strip()
+            self._remember("summary", {summary: translated_summary})
 
-Make it accessible for readers who may not be technical experts."""
+            logger.info("Successfully translated summary to Japanese")
+            return translated_summary
 
-            messages = [
-                SystemMessage(content=system_prompt),
-                HumanMessage(content=human_prompt)
-            ]
+        except Exception as e:
+            logger.error(f"Error translating summary: {str(e)}")
+            return None
 
-            response = self.llm.invoke(messages)
+    async def atranslate_summary(self, summary: str) -> Optional[str]:
+        """Asynchronous ``translate_summary``"""
+        try:
+            remembered = (await asyncio.to_thread(self._recall, "summary", [summary])).get(summary)
+            if remembered:
+                await asyncio.to_thread(self._reused, "summary_translation")
+                return remembered
+
+            response = await self._ainvoke(
+                await asyncio.to_thread(self._summary_messages, summary), task="summary_translation"
+            )
             translated_summary = response.content.strip()
+            await asyncio.to_thread(self._remember, "summary", {summary: translated_summary})
 
             logger.info("Successfully translated summary to Japanese")
             return translated_summary
@@ -122,43 +237,45 @@ Make it accessible for readers who may not be technical experts."""
             List of Japanese key points with explanations
         """
         try:
-            # Join key points into a single text
-            key_points_text = '\n'.join([f"{i+1}. {point}" for i, point in enumerate(key_points)])
-
-            system_prompt = """You are an expert translator specializing in AI and technology content.
-Translate key points into clear Japanese with helpful context.
-
-Guidelines:
-- Use simple, accessible Japanese (やさしい日本語)
-- Add brief explanations for technical terms
-- Make each point self-contained and clear
-- Keep each point concise (under 100 characters)
-- Use 「」for quotations and emphasis
-- Maintain the informative value while being accessible"""
-
-            human_prompt = f"""Translate these key points to easy-to-understand Japanese:
-
-{key_points_text}
-
-Provide the translation as a numbered list. Add brief explanations for technical terms where helpful."""
+            known = self._recall("key_point", key_points)
+            missing = [point for point in key_points if point not in known]
+            if not missing:
+                self._reused("key_points_translation")
+                return [known[point] for point in key_points]
+
+            response = self._invoke(
+                self._key_points_messages(missing),
+                task="key_points_translation"
+            )
+            translated_points, pairs = self._merge_key_points(
+                key_points, known, missing, parse_numbered_list(response.content.strip())
+            )
+            self._remember("key_point", pairs)
 
-            messages = [
-                SystemMessage(content=system_prompt),
-                HumanMessage(content=human_prompt)
-            ]
+            logger.info(f"Translated {len(translated_points)} key points to Japanese")
+            return translated_points
 
-            response = self.llm.invoke(messages)
-            translated_text = response.content.strip()
+        except Exception as e:
+            logger.error(f"Error translating key points: {str(e)}")
+            return None
 
-            # Parse back into list
-            translated_points = []
-            for line in translated_text.split('\n'):
-                line = line.strip()
-                if line and (line[0].isdigit() or line.startswith('-') or line.startswith('•')):
-                    # Remove numbering
-                    point = line.lstrip('0123456789.-•) ').strip()
-                    if point:
-                        translated_points.append(point)
+    async def atranslate_key_points(self, key_points: List[str]) -> Optional[List[str]]:
+        """Asynchronous ``translate_key_points``"""
+        try:
+            known = await asyncio.to_thread(self._recall, "key_point", key_points)
+            missing = [point for point in key_points if point not in known]
+            if not missing:
+                await asyncio.to_thread(self._reused, "key_points_translation")
+                return [known[point] for point in key_points]
+
+            response = await self._ainvoke(
+                await asyncio.to_thread(self._key_points_messages, missing),
+                task="key_points_translation"
+            )
+            translated_points, pairs = self._merge_key_points(
+                key_points, known, missing, parse_numbered_list(response.content.strip())
+            )
+            await asyncio.to_thread(self._remember, "key_point", pairs)
 
             logger.info(f"Translated {len(translated_points)} key points to Japanese")
             return translated_points
@@ -184,16 +301,55 @@ Provide the translation as a numbered list. Add brief explanations for technical
             translated_summary = self.translate_summary(summary)
             translated_key_points = self.translate_key_points(key_points)
 
-            if not all([translated_title, translated_summary, translated_key_points]):
-                logger.error("Failed to translate some components")
-                return None
+            return self._translation(translated_title, translated_summary, translated_key_points)
 
-            return {
-                'title_ja': translated_title,
-                'summary_ja': translated_summary,
-                'key_points_ja': translated_key_points
-            }
+        except Exception as e:
+            logger.error(f"Error translating article: {str(e)}")
+            return None
+
+    async def atranslate_article(self, title: str, summary: str, key_points: List[str]) -> Optional[dict]:
+        """Asynchronous ``translate_article``; the three translations run concurrently"""
+        try:
+            translated_title, translated_summary, translated_key_points = await asyncio.gather(
+                self.atranslate_title(title),
+                self.atranslate_summary(summary),
+                self.atranslate_key_points(key_points)
+            )
+
+            return self._translation(translated_title, translated_summary, translated_key_points)
 
         except Exception as e:
             logger.error(f"Error translating article: {str(e)}")
             return None
+
+    def _merge_key_points(
+        self,
+        key_points: List[str],
+        known: Dict[str, str],
+        missing: List[str],
+        translated: List[str]
+    ) -> Tuple[List[str], Dict[str, str]]:
+        """
+        Combine remembered and newly translated key points
+
+        Returns:
+            Japanese key points, and the new pairs for the memory (none if
+            the model returned a different number of points than requested,
+            since they cannot be matched up)
+        """
+        if len(translated) != len(missing):
+            return [known[point] for point in key_points if point in known] + translated, {}
+
+        pairs = dict(zip(missing, translated))
+        return [known.get(point) or pairs[point] for point in key_points], pairs
+
+    def _translation(self, title_ja, summary_ja, key_points_ja) -> Optional[dict]:
+        if not all([title_ja, summary_ja, key_points_ja]):
+            logger.error("Failed to translate some components")
+            return None
+
+        return {
+            'title_ja': title_ja,
+            'summary_ja': summary_ja,
+            'key_points_ja': key_points_ja
+        }
@@ -78,7 +78,11 @@ def get_latest_articles(
 @router.get("/{article_id}", response_model=ArticleDetailResponse)
 def get_article(article_id: int, db: Session = Depends(get_db)):
     """Get detailed article by ID"""
-    article = db.query(Article).filter(Article.id == article_id).first()
+    article = (
+        db.query(Article)
+        .filter(Article.id == article_id, Article.is_published == True)  # Pending articles are not served
+        .first()
+    )
 
     if not article:
         raise HTTPException(status_code=404, detail="Article not found")
@@ -0,0 +1,123 @@
+"""
+LLM usage metrics API endpoints
+"""
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from sqlalchemy import case, desc, func
+from typing import Dict, List, Optional
+from datetime import datetime, timedelta
+
+from ..database import get_db
+from ..models import LLMCall
+from ..schemas import LLMUsage, LLMRunBreakdown
+from ..ai.metrics import REUSED_OUTCOMES, get_llm_metrics
+
+router = APIRouter(prefix="/metrics", tags=["metrics"])
+
+
+def usage_query(db: Session, key=None):
+    """Aggregate LLMCall rows, grouped by ``key`` if given"""
+    columns = [
+        func.count(LLMCall.id).label("calls"),
+        func.sum(case((LLMCall.outcome.in_(REUSED_OUTCOMES), 1), else_=0)).label("cached"),
+        func.sum(case((LLMCall.outcome.in_(["error", "rate_limited"]), 1), else_=0)).label("errors"),
+        func.sum(LLMCall.retries).label("retries"),
+        func.sum(LLMCall.prompt_tokens).label("prompt_tokens"),
+        func.sum(LLMCall.completion_tokens).label("completion_tokens"),
+        func.sum(LLMCall.cost).label("cost"),
+        func.avg(case((LLMCall.outcome.notin_(REUSED_OUTCOMES), LLMCall.latency_ms))).label("avg_latency_ms"),
+        func.max(LLMCall.latency_ms).label("max_latency_ms"),
+        func.min(LLMCall.created_at).label("started_at"),
+        func.max(LLMCall.created_at).label("finished_at"),
+    ]
+    if key is None:
+        return db.query(*columns)
+    return db.query(key.label("key"), *columns).group_by(key)
+
+
+def to_usage(row) -> LLMUsage:
+    values = row._asdict()
+    return LLMUsage(
+        key=values.get("key"),
+        calls=values["calls"] or 0,
+        cached=values["cached"] or 0,
+        errors=values["errors"] or 0,
+        retries=values["retries"] or 0,
+        prompt_tokens=values["prompt_tokens"] or 0,
+        completion_tokens=values["completion_tokens"] or 0,
+        cost=round(values["cost"] or 0.0, 4),
+        avg_latency_ms=round(values["avg_latency_ms"] or 0.0, 1),
+        max_latency_ms=round(values["max_latency_ms"] or 0.0, 1),
+        started_at=values["started_at"],
+        finished_at=values["finished_at"]
+    )
+
+
+@router.get("/llm/runs", response_model=List[LLMUsage])
+def get_llm_runs(
+    limit: int = Query(20, ge=1, le=200),
+    db: Session = Depends(get_db)
+):
+    """
+    LLM usage of the most recent pipeline runs
+
+    Args:
+        limit: Number of runs
+    """
+    rows = (
+        usage_query(db, LLMCall.run_id)
+        .filter(LLMCall.run_id.isnot(None))
+        .order_by(desc("started_at"))
+        .limit(limit)
+        .all()
+    )
+    return [to_usage(row) for row in rows]
+
+
+@router.get("/llm/runs/{run_id}", response_model=LLMRunBreakdown)
+def get_llm_run(run_id: str, db: Session = Depends(get_db)):
+    """LLM usage of one pipeline run, per source and per task and model"""
+    total = usage_query(db).filter(LLMCall.run_id == run_id).one()
+    if not total.calls:
+        raise HTTPException(status_code=404, detail="Run not found")
+
+    task_model = LLMCall.task + ":" + LLMCall.model
+    return LLMRunBreakdown(
+        run_id=run_id,
+        total=to_usage(total),
+        by_source=[
+            to_usage(row)
+            for row in usage_query(db, LLMCall.source).filter(LLMCall.run_id == run_id).order_by(desc("cost"))
+        ],
+        by_task=[
+            to_usage(row)
+            for row in usage_query(db, task_model).filter(LLMCall.run_id == run_id).order_by(desc("cost"))
+        ]
+    )
+
+
+@router.get("/llm/sources", response_model=List[LLMUsage])
+def get_llm_sources(
+    hours: int = Query(24, ge=1, le=24 * 90),
+    source: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """
+    LLM usage per article source
+
+    Args:
+        hours: Only calls made within this many hours
+        source: Filter by source (e.g., TechCrunch)
+    """
+    query = usage_query(db, LLMCall.source).filter(
+        LLMCall.created_at >= datetime.now() - timedelta(hours=hours)
+    )
+    if source:
+        query = query.filter(LLMCall.source == source)
+    return [to_usage(row) for row in query.order_by(desc("cost")).all()]
+
+
+@router.get("/llm/histograms")
+def get_llm_histograms() -> Dict[str, Dict]:
+    """Latency (ms) and token histograms per task and model since the server started"""
+    return get_llm_metrics().histograms()
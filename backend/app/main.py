@@ -8,27 +8,44 @@ import os
 from dotenv import load_dotenv
 
 from .database import engine, Base
-from .api import articles, search
+from .models import upgrade_schema
+from .api import articles, search, metrics
 from .scheduler import NewsScraperScheduler
+from .scheduler.leader import LeaderElection
 
 load_dotenv()
 
 # Create database tables
 Base.metadata.create_all(bind=engine)
+upgrade_schema(engine)
 
 # Initialize scheduler
 scheduler = NewsScraperScheduler()
+scraping_interval = int(os.getenv("SCRAPING_INTERVAL_HOURS", "24"))
+
+# Of all uvicorn workers and replicas, only the elected leader runs the scheduled jobs
+election = None
+if os.getenv("LEADER_ELECTION_ENABLED", "True") == "True":
+    election = LeaderElection(
+        on_elected=lambda: scheduler.start(interval_hours=scraping_interval),
+        # A demoted leader must not start new runs while the next leader starts its own
+        on_demoted=lambda: scheduler.stop(wait=False)
+    )
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Lifespan context manager for startup and shutdown events"""
     # Startup
-    scraping_interval = int(os.getenv("SCRAPING_INTERVAL_HOURS", "24"))
-    scheduler.start(interval_hours=scraping_interval)
+    if election:
+        election.start()
+    else:
+        scheduler.start(interval_hours=scraping_interval)
     yield
-    # Shutdown
+    # Shutdown: finish running jobs before another process can take over
     scheduler.stop()
+    if election:
+        election.stop()
 
 
 # Create FastAPI app
@@ -53,6 +70,7 @@ app.add_middleware(
 # Include routers
 app.include_router(articles.router)
 app.include_router(search.router)
+app.include_router(metrics.router)
 
 
 @app.get("/")
@@ -70,7 +88,8 @@ def health_check():
     """Health check endpoint"""
     return {
         "status": "healthy",
-        "scheduler_running": scheduler.scheduler.running
+        "scheduler_running": scheduler.scheduler.running,
+        "scheduler_leader": election.is_leader if election else True
     }
 
 
@@ -1,7 +1,8 @@
 """
 SQLAlchemy database models
 """
-from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean
+from sqlalchemy import Column, Integer, Float, String, Text, DateTime, Boolean, JSON, inspect, text
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.sql import func
 from sqlalchemy.types import TypeDecorator, String as SQLString
 from .database import Base, DATABASE_URL
@@ -38,6 +39,7 @@ class Article(Base):
     # Source information
     source = Column(String(100), nullable=False, index=True)  # TechCrunch, VentureBeat, etc.
     source_url = Column(String(500), unique=True, nullable=False)
+    canonical_url = Column(String(500), index=True)  # Normalized URL used for deduplication
 
     # Original content (English)
     title_en = Column(String(500), nullable=False)
@@ -62,6 +64,10 @@ class Article(Base):
     is_processed = Column(Boolean, default=False)
     is_published = Column(Boolean, default=False)
 
+    # Processing priority; deferred_at is set while a run budget holds the article back
+    priority_score = Column(Float)
+    deferred_at = Column(DateTime, index=True)
+
     # SEO
     image_url = Column(String(500))
     author = Column(String(200))
@@ -71,3 +77,217 @@ class Article(Base):
 
     def __repr__(self):
         return f"<Article {self.id}: {self.title_ja[:30]}>"
+
+
+class FeedState(Base):
+    """Conditional-GET state for a source feed, persisted across runs"""
+    __tablename__ = "feed_states"
+
+    id = Column(Integer, primary_key=True, index=True)
+    feed_url = Column(String(500), unique=True, nullable=False)
+
+    # Validators returned by the server for conditional requests
+    etag = Column(String(500))
+    last_modified = Column(String(100))
+
+    # Entry IDs seen on recent fetches (newest first)
+    seen_entry_ids = Column(JSON)
+
+    # Progress of paginated harvests (see ArxivScraper.aharvest)
+    checkpoint = Column(JSON)
+
+    last_fetched_at = Column(DateTime)
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+
+    def __repr__(self):
+        return f"<FeedState {self.feed_url}>"
+
+
+class BatchJob(Base):
+    """Offline batch of LLM requests submitted for pending articles"""
+    __tablename__ = "batch_jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    batch_id = Column(String(100), unique=True, nullable=False)
+    input_file_id = Column(String(100))
+    output_file_id = Column(String(100))
+    error_file_id = Column(String(100))
+
+    # validating, in_progress, completed, failed, expired, cancelled; ingested once stored
+    status = Column(String(50), nullable=False, index=True)
+    article_ids = Column(JSON)
+    job_path = Column(String(500))  # Local copy of the JSONL job file
+
+    ingested_count = Column(Integer, default=0)
+    failed_count = Column(Integer, default=0)
+
+    created_at = Column(DateTime, server_default=func.now())
+    completed_at = Column(DateTime)
+
+    def __repr__(self):
+        return f"<BatchJob {self.batch_id}: {self.status}>"
+
+
+class SourcePoll(Base):
+    """Learned publish rate and poll interval of a source (see app.scheduler.polling)"""
+    __tablename__ = "source_polls"
+
+    id = Column(Integer, primary_key=True, index=True)
+    source = Column(String(100), unique=True, nullable=False)
+
+    rate_per_hour = Column(Float)  # Moving average of new entries per hour
+    interval_minutes = Column(Float, nullable=False)
+    last_new_entries = Column(Integer, default=0)
+    polls = Column(Integer, default=0)
+    failures = Column(Integer, default=0)  # Consecutive failed polls
+
+    last_polled_at = Column(DateTime)
+    next_poll_at = Column(DateTime, index=True)
+
+    def __repr__(self):
+        return f"<SourcePoll {self.source}: every {self.interval_minutes:.0f} min>"
+
+
+class LLMCall(Base):
+    """One LLM call made by the AI components (see app.ai.metrics)"""
+    __tablename__ = "llm_calls"
+
+    id = Column(Integer, primary_key=True, index=True)
+
+    # Pipeline run and article source the call was made for
+    run_id = Column(String(100), index=True)
+    source = Column(String(100), index=True)
+
+    task = Column(String(50), nullable=False, index=True)  # Routing task, e.g. summary
+    model = Column(String(100), nullable=False)
+    backend = Column(String(50))
+
+    # ok, cached, memory (translation memory), rate_limited or error
+    outcome = Column(String(20), nullable=False)
+    error = Column(String(500))
+
+    prompt_tokens = Column(Integer, default=0)
+    completion_tokens = Column(Integer, default=0)
+    latency_ms = Column(Float)  # Wall time including retries
+    retries = Column(Integer, default=0)
+    cost = Column(Float, default=0.0)  # Estimated USD
+
+    created_at = Column(DateTime, server_default=func.now(), index=True)
+
+    def __repr__(self):
+        return f"<LLMCall {self.task} {self.model}: {self.outcome}>"
+
+
+class TranslationUnit(Base):
+    """English text and its Japanese translation, reused by the translation memory"""
+    __tablename__ = "translation_memory"
+
+    id = Column(Integer, primary_key=True, index=True)
+    # Hash of the kind and the normalized English text
+    source_hash = Column(String(64), unique=True, nullable=False)
+    kind = Column(String(20), nullable=False)  # title, key_point, summary
+
+    source_text = Column(Text, nullable=False)
+    target_text = Column(Text, nullable=False)
+
+    hits = Column(Integer, default=0)
+    created_at = Column(DateTime, server_default=func.now())
+    last_used_at = Column(DateTime)
+
+    def __repr__(self):
+        return f"<TranslationUnit {self.kind}: {self.source_text[:30]}>"
+
+
+class GlossaryTerm(Base):
+    """Fixed Japanese rendering of a technical term, injected into translation prompts"""
+    __tablename__ = "glossary_terms"
+
+    id = Column(Integer, primary_key=True, index=True)
+    term = Column(String(200), unique=True, nullable=False)
+    translation = Column(String(200), nullable=False)
+    note = Column(String(500))
+
+    created_at = Column(DateTime, server_default=func.now())
+
+    def __repr__(self):
+        return f"<GlossaryTerm {self.term}: {self.translation}>"
+
+
+class PipelineJob(Base):
+    """One unit of work of the staged scraping pipeline (see app.scheduler.jobs)"""
+    __tablename__ = "pipeline_jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    stage = Column(String(20), nullable=False, index=True)  # fetch, extract, process, store
+    # "<stage>:<key>"; a job is enqueued at most once per key
+    job_key = Column(String(600), unique=True, nullable=False)
+    payload = Column(JSON)
+    priority = Column(Float, default=0.0)
+    run_id = Column(String(100), index=True)
+
+    # queued, leased, done or failed (after max_attempts)
+    status = Column(String(20), nullable=False, index=True)
+    attempts = Column(Integer, default=0)
+    max_attempts = Column(Integer, default=5)
+    available_at = Column(DateTime, index=True)  # Not leased before this time (retry backoff)
+    lease_owner = Column(String(100))
+    lease_expires_at = Column(DateTime)
+    last_error = Column(Text)
+
+    created_at = Column(DateTime, server_default=func.now())
+    finished_at = Column(DateTime)
+
+    def __repr__(self):
+        return f"<PipelineJob {self.job_key[:40]}: {self.status}>"
+
+
+# Columns added to existing tables after their first release.
+# create_all() only creates missing tables, so these are added in place.
+ADDED_COLUMNS = {
+    "articles": ["canonical_url", "priority_score", "deferred_at"],
+    "feed_states": ["checkpoint"],
+    "source_polls": ["failures"],
+}
+
+
+# Advisory lock that serializes schema upgrades on PostgreSQL
+SCHEMA_LOCK_KEY = 0x61695f6e  # "ai_n"
+
+
+def upgrade_schema(bind):
+    """
+    Add columns from ADDED_COLUMNS that are missing in the database
+
+    Every worker process runs this at startup. On PostgreSQL concurrent
+    upgrades wait for each other on an advisory lock; elsewhere a column
+    or index that another process added in the meantime is skipped.
+    """
+    with bind.begin() as conn:
+        if bind.dialect.name == "postgresql":
+            conn.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": SCHEMA_LOCK_KEY})
+
+        # Inspect only once the lock is held, so earlier upgrades are seen
+        inspector = inspect(conn)
+        table_names = inspector.get_table_names()
+
+        for table_name, column_names in ADDED_COLUMNS.items():
+            if table_name not in table_names:
+                continue
+
+            existing = {column["name"] for column in inspector.get_columns(table_name)}
+            table = Base.metadata.tables[table_name]
+
+            for column_name in column_names:
+                column = table.c[column_name]
+                if column_name not in existing:
+                    column_type = column.type.compile(dialect=bind.dialect)
+                    try:
+                        conn.execute(text(f"ALTER TABLE {table_name} ADD COLUMN {column_name} {column_type}"))
+                    except DBAPIError as e:
+                        # Added by another worker since the inspection
+                        if "duplicate column" not in str(e).lower():
+                            raise
+                if column.index:
+                    conn.execute(text(
+                        f"CREATE INDEX IF NOT EXISTS ix_{table_name}_{column_name} ON {table_name} ({column_name})"
+                    ))
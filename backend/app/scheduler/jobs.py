@@ -0,0 +1,267 @@
+"""
+Durable job queue in the database, with leases and retries
+"""
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+import os
+import socket
+import uuid
+import logging
+
+from sqlalchemy import and_, func, or_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from ..database import SessionLocal
+from ..models import PipelineJob
+
+logger = logging.getLogger(__name__)
+
+
+def worker_id() -> str:
+    """Unique lease owner name for a worker, e.g. host:1234:1a2b"""
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:4]}"
+
+
+class JobQueue:
+    """
+    Queue of pipeline jobs stored in the ``pipeline_jobs`` table
+
+    A job is leased by one worker at a time: ``lease`` claims jobs with a
+    compare-and-set update, so any number of worker processes can share
+    the queue, and a job whose lease expires (its worker died) is handed
+    out again. Failed jobs are retried with exponential backoff up to
+    ``max_attempts`` times. Each job has a unique key, so enqueueing the
+    same work twice is a no-op and handlers can be re-run safely.
+    """
+
+    def __init__(
+        self,
+        lease_seconds: Optional[int] = None,
+        max_attempts: Optional[int] = None,
+        retry_backoff: Optional[float] = None
+    ):
+        """
+        Initialize the queue
+
+        Args:
+            lease_seconds: How long a worker holds a job (default: JOB_LEASE_SECONDS or 600)
+            max_attempts: Attempts before a job fails for good (default: JOB_MAX_ATTEMPTS or 5)
+            retry_backoff: Seconds before the first retry, doubled for each
+                further attempt (default: JOB_RETRY_BACKOFF or 30)
+        """
+        self.lease_seconds = lease_seconds or int(os.getenv("JOB_LEASE_SECONDS", "600"))
+        self.max_attempts = max_attempts or int(os.getenv("JOB_MAX_ATTEMPTS", "5"))
+        self.retry_backoff = retry_backoff if retry_backoff is not None else float(os.getenv("JOB_RETRY_BACKOFF", "30"))
+
+    def enqueue(
+        self,
+        stage: str,
+        key: str,
+        payload: Dict,
+        priority: float = 0.0,
+        run_id: Optional[str] = None,
+        db: Optional[Session] = None
+    ) -> bool:
+        """
+        Add a job unless one with the same stage and key exists
+
+        A job that failed for good is queued again with fresh attempts.
+
+        Args:
+            stage: Pipeline stage that handles the job
+            key: Identity of the work within the stage, e.g. a canonical URL
+            payload: JSON-serializable input of the handler
+            priority: Jobs with higher priority are leased first
+            run_id: Pipeline run the job belongs to
+            db: Session to use (default: a new one)
+
+        Returns:
+            True if the job was added or revived
+        """
+        own_session = db is None
+        db = db or SessionLocal()
+        job_key = f"{stage}:{key}"
+        try:
+            job = db.query(PipelineJob).filter(PipelineJob.job_key == job_key).first()
+            if job is not None:
+                if job.status != "failed":
+                    return False
+                job.status = "queued"
+                job.attempts = 0
+                job.payload = payload
+                job.available_at = datetime.now()
+                job.last_error = None
+            else:
+                db.add(PipelineJob(
+                    stage=stage,
+                    job_key=job_key,
+                    payload=payload,
+                    priority=priority,
+                    run_id=run_id,
+                    status="queued",
+                    attempts=0,
+                    max_attempts=self.max_attempts,
+                    available_at=datetime.now()
+                ))
+            db.commit()
+            return True
+
+        except IntegrityError:
+            # Enqueued by another worker in the meantime
+            db.rollback()
+            return False
+        finally:
+            if own_session:
+                db.close()
+
+    def lease(self, owner: str, stages: Optional[List[str]] = None, limit: int = 1) -> List[PipelineJob]:
+        """
+        Claim jobs that are ready, highest priority first
+
+        A job whose lease expired is handed out again, unless that lease
+        was its last attempt: then its worker kept dying on it, and it
+        fails for good.
+
+        Args:
+            owner: Lease owner name (see ``worker_id``)
+            stages: Stages to take jobs from (default: all)
+            limit: Most jobs to claim
+
+        Returns:
+            The claimed jobs, detached from their session
+        """
+        now = datetime.now()
+        expired = and_(PipelineJob.status == "leased", PipelineJob.lease_expires_at < now)
+        ready = or_(
+            and_(PipelineJob.status == "queued", PipelineJob.available_at <= now),
+            and_(expired, PipelineJob.attempts < PipelineJob.max_attempts)
+        )
+
+        db = SessionLocal()
+        try:
+            exhausted = (
+                db.query(PipelineJob)
+                .filter(expired, PipelineJob.attempts >= PipelineJob.max_attempts)
+                .update({
+                    PipelineJob.status: "failed",
+                    PipelineJob.lease_expires_at: None,
+                    PipelineJob.finished_at: now,
+                    PipelineJob.last_error: "Lease expired on the last attempt"
+                }, synchronize_session=False)
+            )
+            db.commit()
+            if exhausted:
+                logger.error(f"{exhausted} jobs failed for good after their last lease expired")
+
+            query = db.query(PipelineJob.id, PipelineJob.status, PipelineJob.attempts).filter(ready)
+            if stages:
+                query = query.filter(PipelineJob.stage.in_(stages))
+            # A few extra candidates in case other workers win some of them
+            candidates = query.order_by(PipelineJob.priority.desc(), PipelineJob.id).limit(limit * 2).all()
+
+            claimed = []
+            for job_id, status, attempts in candidates:
+                # Compare-and-set: only one worker moves the job out of the state it saw
+                updated = (
+                    db.query(PipelineJob)
+                    .filter(PipelineJob.id == job_id, PipelineJob.status == status,
+                            PipelineJob.attempts == attempts)
+                    .update({
+                        PipelineJob.status: "leased",
+                        PipelineJob.lease_owner: owner,
+                        PipelineJob.lease_expires_at: now + timedelta(seconds=self.lease_seconds),
+                        PipelineJob.attempts: attempts + 1
+                    }, synchronize_session=False)
+                )
+                db.commit()
+                if updated:
+                    claimed.append(job_id)
+                if len(claimed) >= limit:
+                    break
+
+            if not claimed:
+                return []
+            jobs = db.query(PipelineJob).filter(PipelineJob.id.in_(claimed)).all()
+            db.expunge_all()
+            return sorted(jobs, key=lambda job: claimed.index(job.id))
+
+        finally:
+            db.close()
+
+    def complete(self, job: PipelineJob, owner: str) -> bool:
+        """Mark a leased job as done; False if the lease was lost to another worker"""
+        return self._finish(job, owner, {
+            PipelineJob.status: "done",
+            PipelineJob.lease_expires_at: None,
+            PipelineJob.finished_at: datetime.now()
+        })
+
+    def fail(self, job: PipelineJob, owner: str, error: Exception) -> bool:
+        """Schedule a retry of a leased job, or fail it for good after its last attempt"""
+        message = f"{type(error).__name__}: {str(error)}"[:2000]
+        if job.attempts >= job.max_attempts:
+            logger.error(f"Job {job.job_key} failed after {job.attempts} attempts: {message}")
+            values = {PipelineJob.status: "failed", PipelineJob.finished_at: datetime.now()}
+        else:
+            delay = self.retry_backoff * 2 ** (job.attempts - 1)
+            logger.warning(f"Job {job.job_key} failed (attempt {job.attempts}), retrying in {delay:.0f}s: {message}")
+            values = {PipelineJob.status: "queued", PipelineJob.available_at: datetime.now() + timedelta(seconds=delay)}
+
+        return self._finish(job, owner, {**values, PipelineJob.lease_expires_at: None, PipelineJob.last_error: message})
+
+    def _finish(self, job: PipelineJob, owner: str, values: Dict) -> bool:
+        db = SessionLocal()
+        try:
+            updated = (
+                db.query(PipelineJob)
+                .filter(PipelineJob.id == job.id, PipelineJob.status == "leased",
+                        PipelineJob.lease_owner == owner, PipelineJob.attempts == job.attempts)
+                .update(values, synchronize_session=False)
+            )
+            db.commit()
+            if not updated:
+                logger.warning(f"Lease of job {job.job_key} was lost; result discarded")
+            return bool(updated)
+        finally:
+            db.close()
+
+    def counts(self) -> Dict[str, Dict[str, int]]:
+        """Number of jobs per stage and status"""
+        db = SessionLocal()
+        try:
+            counts: Dict[str, Dict[str, int]] = {}
+            rows = (
+                db.query(PipelineJob.stage, PipelineJob.status, func.count(PipelineJob.id))
+                .group_by(PipelineJob.stage, PipelineJob.status)
+                .all()
+            )
+            for stage, status, count in rows:
+                counts.setdefault(stage, {})[status] = count
+            return counts
+        finally:
+            db.close()
+
+    def outstanding(self) -> int:
+        """Jobs queued or leased, including those waiting for a retry"""
+        db = SessionLocal()
+        try:
+            return db.query(PipelineJob).filter(PipelineJob.status.in_(["queued", "leased"])).count()
+        finally:
+            db.close()
+
+    def purge(self, days: Optional[int] = None) -> int:
+        """Delete finished jobs older than ``days`` (default: JOB_RETENTION_DAYS or 7)"""
+        days = days or int(os.getenv("JOB_RETENTION_DAYS", "7"))
+        db = SessionLocal()
+        try:
+            deleted = (
+                db.query(PipelineJob)
+                .filter(PipelineJob.status.in_(["done", "failed"]),
+                        PipelineJob.finished_at < datetime.now() - timedelta(days=days))
+                .delete(synchronize_session=False)
+            )
+            db.commit()
+            return deleted
+        finally:
+            db.close()
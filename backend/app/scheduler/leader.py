@@ -0,0 +1,221 @@
+"""
+Leader election so only one process in a deployment runs the scheduler
+"""
+from typing import Callable, Optional
+import os
+import tempfile
+import threading
+import zlib
+import logging
+
+from sqlalchemy import text
+
+from ..database import engine
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+
+class PostgresLock:
+    """Session-level advisory lock, released by PostgreSQL when its connection closes"""
+
+    def __init__(self, key: int):
+        self.key = key
+        self.connection = None
+
+    def acquire(self) -> bool:
+        connection = engine.connect()
+        try:
+            acquired = connection.execute(
+                text("SELECT pg_try_advisory_lock(:key)"), {'key': self.key}
+            ).scalar()
+            # Don't leave the SELECT's transaction open for as long as the lock is held
+            connection.commit()
+        except Exception:
+            connection.close()
+            raise
+        if not acquired:
+            connection.close()
+            return False
+        self.connection = connection
+        return True
+
+    def renew(self) -> bool:
+        """The lock lives as long as its session, so a live connection still holds it"""
+        try:
+            self.connection.execute(text("SELECT 1"))
+            self.connection.commit()
+            return True
+        except Exception as e:
+            logger.error(f"Lost the leader lock connection: {str(e)}")
+            return False
+
+    def release(self):
+        if self.connection is None:
+            return
+        try:
+            self.connection.execute(text("SELECT pg_advisory_unlock(:key)"), {'key': self.key})
+            self.connection.commit()
+        except Exception as e:
+            logger.warning(f"Error releasing the leader lock: {str(e)}")
+        finally:
+            # Closing the connection releases the lock in any case
+            self.connection.invalidate()
+            self.connection.close()
+            self.connection = None
+
+
+class FileLock:
+    """Exclusive ``flock`` on a file, released by the OS when the process exits"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.fd: Optional[int] = None
+
+    def acquire(self) -> bool:
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(fd)
+            return False
+        os.ftruncate(fd, 0)
+        os.write(fd, str(os.getpid()).encode())
+        self.fd = fd
+        return True
+
+    def renew(self) -> bool:
+        """The lock is only exclusive while the file at the path is the one locked"""
+        try:
+            if os.fstat(self.fd).st_ino == os.stat(self.path).st_ino:
+                return True
+        except OSError:
+            pass
+        logger.error(f"Leader lock file {self.path} was removed or replaced")
+        return False
+
+    def release(self):
+        if self.fd is None:
+            return
+        try:
+            fcntl.flock(self.fd, fcntl.LOCK_UN)
+        finally:
+            os.close(self.fd)
+            self.fd = None
+
+
+def default_lock_path() -> str:
+    """Lock file next to the SQLite database, or in the temp directory"""
+    database = engine.url.database if engine.dialect.name == "sqlite" else None
+    if database and database != ":memory:":
+        return os.path.abspath(database) + ".scheduler.lock"
+    return os.path.join(tempfile.gettempdir(), "ai-news-scheduler.lock")
+
+
+class LeaderElection:
+    """
+    Elects one process among all workers and replicas to run scheduled jobs
+
+    With PostgreSQL the leader holds an advisory lock on a dedicated
+    connection; otherwise it holds an exclusive lock on a file next to the
+    SQLite database, which covers the workers of one host. Either lock is
+    released as soon as the leader process dies, and the other processes
+    retry every ``retry_seconds``, so one of them takes over within that
+    time. The leader renews its lock on the same interval by checking that
+    it still holds it, and steps down (``on_demoted``) when it does not.
+    """
+
+    def __init__(
+        self,
+        on_elected: Callable[[], None],
+        on_demoted: Callable[[], None],
+        name: str = "ai-news-scheduler",
+        retry_seconds: Optional[float] = None
+    ):
+        """
+        Initialize the election
+
+        Args:
+            on_elected: Called when this process becomes the leader
+            on_demoted: Called when this process stops being the leader
+            name: Name of the lock; processes with the same name compete
+            retry_seconds: Interval of lock attempts and renewals
+                (default: LEADER_RETRY_SECONDS or 5)
+        """
+        self.on_elected = on_elected
+        self.on_demoted = on_demoted
+        self.name = name
+        self.retry_seconds = retry_seconds or float(os.getenv("LEADER_RETRY_SECONDS", "5"))
+        self.is_leader = False
+
+        if engine.dialect.name == "postgresql":
+            key = int(os.getenv("LEADER_LOCK_KEY", str(zlib.crc32(name.encode()))))
+            self.lock = PostgresLock(key)
+        elif fcntl is not None:
+            self.lock = FileLock(os.getenv("LEADER_LOCK_PATH", default_lock_path()))
+        else:
+            logger.warning("No leader lock available on this platform; this process always leads")
+            self.lock = None
+
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        """Try to become the leader now, then keep trying (or renewing) in the background"""
+        self._step()
+        if not self.is_leader:
+            logger.info(f"Another process leads {self.name}; standing by")
+        self._thread = threading.Thread(target=self._run, name="leader-election", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop campaigning and give up the leadership"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        if self.is_leader:
+            self._demote(lost=False)
+
+    def _run(self):
+        while not self._stop.wait(self.retry_seconds):
+            self._step()
+
+    def _step(self):
+        if self.is_leader:
+            if not (self.lock is None or self.lock.renew()):
+                self._demote()
+            return
+
+        try:
+            acquired = self.lock is None or self.lock.acquire()
+        except Exception as e:
+            logger.error(f"Error acquiring the leader lock: {str(e)}")
+            return
+        if not acquired:
+            return
+
+        self.is_leader = True
+        logger.info(f"Elected leader of {self.name} (pid {os.getpid()})")
+        try:
+            self.on_elected()
+        except Exception as e:
+            logger.error(f"Error starting as leader, stepping down: {str(e)}")
+            self._demote()
+
+    def _demote(self, lost: bool = True):
+        self.is_leader = False
+        if lost:
+            logger.warning(f"No longer the leader of {self.name}")
+        else:
+            logger.info(f"Stepped down as leader of {self.name}")
+        try:
+            self.on_demoted()
+        except Exception as e:
+            logger.error(f"Error stepping down as leader: {str(e)}")
+        finally:
+            if self.lock is not None:
+                self.lock.release()
@@ -0,0 +1,281 @@
+"""
+Staged scraping pipeline driven by the durable job queue
+"""
+from datetime import datetime
+from typing import Dict, List, Optional, Set
+import argparse
+import asyncio
+import os
+import logging
+
+from ..ai.metrics import llm_run, llm_source, new_run_id
+from ..models import PipelineJob
+from ..scrapers.fetcher import AsyncFetcher, run_sync
+from .jobs import JobQueue, worker_id
+
+logger = logging.getLogger(__name__)
+
+# Stages in pipeline order; each one enqueues jobs for the next
+STAGES = ("fetch", "extract", "process", "store")
+
+
+def dump_article(article_data: Dict) -> Dict:
+    """JSON-serializable copy of scraped article data"""
+    published_at = article_data.get('published_at')
+    return {**article_data, 'published_at': published_at.isoformat() if published_at else None}
+
+
+def load_article(data: Dict) -> Dict:
+    """Article data from ``dump_article`` output"""
+    published_at = data.get('published_at')
+    return {**data, 'published_at': datetime.fromisoformat(published_at) if published_at else None}
+
+
+class StagedPipeline:
+    """
+    Scrape and process articles as jobs in four stages
+
+    - fetch: read a source's feed and enqueue an extract job per new entry
+    - extract: fetch and parse an entry's article page, enqueue a process job
+    - process: summarize and translate the article with the LLM
+    - store: save the processed article
+
+    Every stage hands over to the next through the ``pipeline_jobs`` table,
+    so a crash loses at most the jobs in flight, whose leases expire and
+    are picked up again. Handlers are idempotent: follow-up jobs are keyed
+    by canonical URL and the store stage upserts on the article URL, so
+    re-running a job never duplicates work downstream. Any number of
+    workers, in this process or others (see ``main``), can drain the queue.
+    """
+
+    def __init__(self, scheduler, queue: Optional[JobQueue] = None, concurrency: Optional[int] = None):
+        """
+        Initialize the pipeline
+
+        Args:
+            scheduler: NewsScraperScheduler providing the scrapers, the AI
+                processing and article storage
+            queue: Job queue (default: a new JobQueue)
+            concurrency: Jobs handled at once per worker
+                (default: JOB_WORKER_CONCURRENCY or PIPELINE_WORKERS)
+        """
+        self.scheduler = scheduler
+        self.queue = queue or JobQueue()
+        self.concurrency = concurrency or int(
+            os.getenv("JOB_WORKER_CONCURRENCY", str(scheduler.pipeline_workers))
+        )
+        self.poll_interval = float(os.getenv("JOB_POLL_SECONDS", "5"))
+        self.scrapers = {scraper.source_name: scraper for scraper in scheduler.scrapers}
+        self.handlers = {
+            "fetch": self.fetch,
+            "extract": self.extract,
+            "process": self.process,
+            "store": self.store,
+        }
+
+    def enqueue_run(self, run_id: Optional[str] = None, sources: Optional[List[str]] = None) -> str:
+        """
+        Start a pipeline run by enqueueing a fetch job per source
+
+        Args:
+            run_id: Run ID (default: a new one)
+            sources: Names of the sources to scrape (default: all)
+
+        Returns:
+            The run ID
+        """
+        run_id = run_id or new_run_id("jobs")
+        sources = sources or list(self.scrapers)
+        for source_name in sources:
+            self.queue.enqueue("fetch", f"{source_name}:{run_id}", {'source': source_name}, run_id=run_id)
+        logger.info(f"Enqueued fetch jobs for {len(sources)} sources (run {run_id})")
+        return run_id
+
+    async def fetch(self, job: PipelineJob, fetcher: AsyncFetcher):
+        """Read a source's feed and enqueue its new entries"""
+        scraper = self.scrapers[job.payload['source']]
+        # The feed state stays local to this job, so concurrent fetches of a source don't mix
+        try:
+            entries, feed_state = await scraper.afetch_feed(fetcher, self.scheduler.max_articles)
+        except Exception:
+            await asyncio.to_thread(self.scheduler.record_failed_poll, scraper.source_name)
+            raise
+        if entries:
+            known = await asyncio.to_thread(
+                self.scheduler.find_known_urls, [scraper.entry_canonical_url(e) for e in entries]
+            )
+            entries = scraper.exclude_known(entries, known)
+        await asyncio.to_thread(self.scheduler.record_poll, scraper.source_name, len(entries))
+
+        for entry in entries:
+            await asyncio.to_thread(
+                self.queue.enqueue,
+                "extract",
+                scraper.entry_canonical_url(entry),
+                {'source': scraper.source_name, 'entry': scraper.dump_entry(entry)},
+                0.0,
+                job.run_id
+            )
+
+        # The entries are queued now, so the feed can be marked as read
+        scraper.commit_feed_state(feed_state)
+        logger.info(f"Fetched {len(entries)} new entries from {scraper.source_name}")
+
+    async def extract(self, job: PipelineJob, fetcher: AsyncFetcher):
+        """Fetch and parse an entry's article page and enqueue its processing"""
+        scraper = self.scrapers[job.payload['source']]
+        article_data = await scraper.aextract_entry(fetcher, scraper.load_entry(job.payload['entry']))
+        if not article_data:
+            return
+
+        score = self.scheduler.score_article(scraper.source_name, article_data)
+        await asyncio.to_thread(
+            self.queue.enqueue,
+            "process",
+            article_data['canonical_url'],
+            {'source': scraper.source_name, 'article': dump_article(article_data)},
+            score,
+            job.run_id
+        )
+
+    async def process(self, job: PipelineJob, fetcher: AsyncFetcher):
+        """Summarize and translate an article and enqueue storing it"""
+        article_data = load_article(job.payload['article'])
+        with llm_source(job.payload['source']):
+            processed = await self.scheduler.aprocess_article(article_data)
+        if not processed:
+            raise RuntimeError(f"AI processing failed for {article_data['url']}")
+
+        await asyncio.to_thread(
+            self.queue.enqueue,
+            "store",
+            article_data['canonical_url'],
+            {**job.payload, 'processed': processed},
+            job.priority,
+            job.run_id
+        )
+
+    async def store(self, job: PipelineJob, fetcher: AsyncFetcher):
+        """Save a processed article; an article already stored is left as it is"""
+        article_data = load_article(job.payload['article'])
+        stored = await asyncio.to_thread(
+            self.scheduler.store_article,
+            job.payload['source'],
+            article_data,
+            job.payload['processed'],
+            job.priority,
+            flush=True
+        )
+        if not stored:
+            raise RuntimeError(f"Could not store {article_data['url']}")
+
+    async def _handle(self, job: PipelineJob, owner: str, fetcher: AsyncFetcher) -> bool:
+        """
+        Run a job's handler and record the outcome in the queue
+
+        If the outcome cannot be recorded, the job stays leased and is
+        handed out again once its lease expires.
+        """
+        try:
+            with llm_run(job.run_id):
+                await self.handlers[job.stage](job, fetcher)
+        except Exception as e:
+            try:
+                await asyncio.to_thread(self.queue.fail, job, owner, e)
+            except Exception as record_error:
+                logger.error(f"Error recording the failure of job {job.job_key}: {str(record_error)}")
+            return False
+
+        try:
+            await asyncio.to_thread(self.queue.complete, job, owner)
+        except Exception as e:
+            logger.error(f"Error recording the completion of job {job.job_key}: {str(e)}")
+            return False
+        return True
+
+    async def awork(self, stages: Optional[List[str]] = None, until_empty: bool = True) -> Dict[str, int]:
+        """
+        Lease and handle jobs, up to ``concurrency`` at a time
+
+        Args:
+            stages: Stages to work on (default: all)
+            until_empty: Return once no job is ready and none is running;
+                otherwise poll for new jobs every JOB_POLL_SECONDS forever
+
+        Returns:
+            Jobs completed and failed by this worker
+        """
+        owner = worker_id()
+        running: Set[asyncio.Task] = set()
+        totals = {'completed': 0, 'failed': 0}
+
+        async with AsyncFetcher() as fetcher:
+            while True:
+                free = self.concurrency - len(running)
+                if free:
+                    try:
+                        jobs = await asyncio.to_thread(self.queue.lease, owner, stages, free)
+                    except Exception as e:
+                        logger.error(f"Error leasing jobs: {str(e)}")
+                        jobs = []
+                    for job in jobs:
+                        running.add(asyncio.create_task(self._handle(job, owner, fetcher)))
+
+                if not running:
+                    if until_empty:
+                        break
+                    await asyncio.sleep(self.poll_interval)
+                    continue
+
+                done, running = await asyncio.wait(
+                    running, timeout=self.poll_interval, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    totals['completed' if task.result() else 'failed'] += 1
+
+        return totals
+
+    def work(self, stages: Optional[List[str]] = None, until_empty: bool = True) -> Dict[str, int]:
+        """Synchronous ``awork``"""
+        totals = run_sync(self.awork(stages, until_empty))
+        logger.info(f"Job worker finished: {totals['completed']} completed, {totals['failed']} failed")
+        return totals
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the staged scraping pipeline from the job queue")
+    parser.add_argument("command", choices=["enqueue", "work", "status", "purge"])
+    parser.add_argument("--stages", help=f"comma-separated stages to work on ({','.join(STAGES)})")
+    parser.add_argument("--concurrency", type=int, help="jobs handled at once")
+    parser.add_argument("--forever", action="store_true", help="keep polling instead of exiting when idle")
+    args = parser.parse_args()
+
+    from ..database import Base, engine
+    from ..models import upgrade_schema
+    from .tasks import NewsScraperScheduler
+    Base.metadata.create_all(bind=engine)
+    upgrade_schema(engine)
+
+    pipeline = StagedPipeline(NewsScraperScheduler(), concurrency=args.concurrency)
+    if args.command == "enqueue":
+        print(pipeline.enqueue_run())
+    elif args.command == "work":
+        stages = args.stages.split(",") if args.stages else list(STAGES)
+        if not pipeline.scheduler.processor:
+            # Without an LLM backend this worker only scrapes
+            stages = [stage for stage in stages if stage in ("fetch", "extract")]
+            logger.warning(f"LLM backend not configured; working on {', '.join(stages) or 'no'} stages only")
+        if stages:
+            pipeline.work(stages, until_empty=not args.forever)
+        if pipeline.scheduler.processor:
+            pipeline.scheduler.processor.metrics.flush()
+    elif args.command == "status":
+        for stage, counts in pipeline.queue.counts().items():
+            print(f"{stage:<8} " + " ".join(f"{status}={count}" for status, count in sorted(counts.items())))
+    else:
+        print(f"{pipeline.queue.purge()} finished jobs deleted")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    main()
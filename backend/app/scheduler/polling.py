@@ -0,0 +1,160 @@
+"""
+Adaptive per-source poll intervals learned from feed activity
+"""
+from datetime import datetime, timedelta
+from typing import List, Optional
+import os
+import logging
+
+from ..database import SessionLocal
+from ..models import SourcePoll
+
+logger = logging.getLogger(__name__)
+
+# Weight of the latest observation in the publish rate average
+RATE_SMOOTHING = 0.3
+
+
+class PollSchedule:
+    """
+    When each source is due to be scraped
+
+    After every poll the source's rate of new feed entries per hour is
+    updated as an exponential moving average, and the next poll is set
+    for when about ``target_entries`` new entries are expected. Polls
+    that find the feed window full (entries may have been missed) halve
+    the interval; idle feeds double it. Intervals stay between
+    ``min_minutes`` and ``max_minutes``. A failed poll is retried after
+    ``min_minutes``, doubled for each further consecutive failure up to
+    ``max_minutes``, so a source that is down is polled less, not more.
+    The state is kept in the ``source_polls`` table, so it survives
+    restarts.
+    """
+
+    def __init__(
+        self,
+        default_minutes: float,
+        min_minutes: Optional[float] = None,
+        max_minutes: Optional[float] = None,
+        target_entries: Optional[float] = None
+    ):
+        """
+        Initialize the schedule
+
+        Args:
+            default_minutes: Interval of sources polled for the first time
+            min_minutes: Shortest interval (default: POLL_MIN_MINUTES or 30)
+            max_minutes: Longest interval (default: POLL_MAX_MINUTES or 1440)
+            target_entries: New entries a poll should find (default: POLL_TARGET_ENTRIES or 3)
+        """
+        self.min_minutes = min_minutes or float(os.getenv("POLL_MIN_MINUTES", "30"))
+        self.max_minutes = max_minutes or float(os.getenv("POLL_MAX_MINUTES", "1440"))
+        self.target_entries = target_entries or float(os.getenv("POLL_TARGET_ENTRIES", "3"))
+        self.default_minutes = self._clamp(default_minutes)
+
+    def _clamp(self, minutes: float) -> float:
+        return min(max(minutes, self.min_minutes), self.max_minutes)
+
+    def due(self, sources: List[str], now: Optional[datetime] = None) -> List[str]:
+        """Sources whose next poll time has come (or that were never polled)"""
+        now = now or datetime.now()
+        db = SessionLocal()
+        try:
+            scheduled = {
+                poll.source: poll.next_poll_at
+                for poll in db.query(SourcePoll).filter(SourcePoll.source.in_(sources))
+            }
+            return [s for s in sources if scheduled.get(s) is None or scheduled[s] <= now]
+        except Exception as e:
+            logger.error(f"Error reading poll schedule, polling every source: {str(e)}")
+            return list(sources)
+        finally:
+            db.close()
+
+    def record(self, source: str, new_entries: int, window_full: bool = False, now: Optional[datetime] = None):
+        """
+        Learn from a successful poll and schedule the next one
+
+        Args:
+            source: Source name
+            new_entries: Feed entries not stored before
+            window_full: Every entry read was new, so more may have been missed
+            now: Time of the poll (default: now)
+        """
+        now = now or datetime.now()
+        db = SessionLocal()
+        try:
+            poll = db.query(SourcePoll).filter(SourcePoll.source == source).first()
+            if poll is None:
+                poll = SourcePoll(source=source, interval_minutes=self.default_minutes, polls=0)
+                db.add(poll)
+
+            if poll.last_polled_at is not None:
+                hours = max((now - poll.last_polled_at).total_seconds() / 3600, 1 / 60)
+                observed = new_entries / hours
+                if poll.rate_per_hour is None:
+                    poll.rate_per_hour = observed
+                else:
+                    poll.rate_per_hour = RATE_SMOOTHING * observed + (1 - RATE_SMOOTHING) * poll.rate_per_hour
+
+            if window_full:
+                interval = poll.interval_minutes / 2
+            elif poll.rate_per_hour:
+                interval = self.target_entries / poll.rate_per_hour * 60
+            elif poll.last_polled_at is not None:
+                interval = poll.interval_minutes * 2
+            else:
+                interval = poll.interval_minutes
+
+            poll.interval_minutes = self._clamp(interval)
+            poll.last_new_entries = new_entries
+            poll.polls = (poll.polls or 0) + 1
+            poll.failures = 0
+            poll.last_polled_at = now
+            poll.next_poll_at = now + timedelta(minutes=poll.interval_minutes)
+            db.commit()
+
+            rate = f"{poll.rate_per_hour:.2f}/h" if poll.rate_per_hour is not None else "unknown"
+            logger.info(
+                f"Next poll of {source} in {poll.interval_minutes:.0f} min "
+                f"({new_entries} new entries, rate {rate})"
+            )
+
+        except Exception as e:
+            logger.error(f"Error updating poll schedule of {source}: {str(e)}")
+            db.rollback()
+        finally:
+            db.close()
+
+    def record_failure(self, source: str, now: Optional[datetime] = None):
+        """
+        Schedule the retry of a poll that failed or timed out
+
+        The learned rate and interval are kept; only the next poll time
+        backs off.
+
+        Args:
+            source: Source name
+            now: Time of the poll (default: now)
+        """
+        now = now or datetime.now()
+        db = SessionLocal()
+        try:
+            poll = db.query(SourcePoll).filter(SourcePoll.source == source).first()
+            if poll is None:
+                poll = SourcePoll(source=source, interval_minutes=self.default_minutes, polls=0)
+                db.add(poll)
+
+            poll.failures = (poll.failures or 0) + 1
+            backoff = min(self.min_minutes * 2 ** (poll.failures - 1), self.max_minutes)
+            # last_polled_at stays at the last success, where the next rate measurement starts
+            poll.next_poll_at = now + timedelta(minutes=backoff)
+            db.commit()
+
+            logger.warning(f"Poll of {source} failed {poll.failures} times in a row; retrying in {backoff:.0f} min")
+
+        except Exception as e:
+            logger.error(f"Error updating poll schedule of {source}: {str(e)}")
+            db.rollback()
+        finally:
+            db.close()
@@ -0,0 +1,156 @@
+"""
+Ranking of scraped articles and per-run LLM budgets
+"""
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+import json
+import os
+import threading
+import logging
+
+from ..ai.metrics import LLMMetrics
+
+logger = logging.getLogger(__name__)
+
+# Share of the priority that comes from relevance; the rest comes from recency
+RELEVANCE_WEIGHT = 0.6
+
+
+def source_weights() -> Dict[str, float]:
+    """Priority multiplier per source (SOURCE_WEIGHTS, e.g. {"arXiv": 0.8}; others 1.0)"""
+    try:
+        return {name: float(weight) for name, weight in json.loads(os.getenv("SOURCE_WEIGHTS", "{}")).items()}
+    except Exception as e:
+        logger.error(f"Invalid SOURCE_WEIGHTS, weighting all sources equally: {str(e)}")
+        return {}
+
+
+def recency_score(published_at: Optional[datetime], now: Optional[datetime] = None) -> float:
+    """
+    Freshness of an article, from 0 to 1
+
+    Halves every FRESHNESS_HALF_LIFE_HOURS (default 24) after publication;
+    articles without a date count as half fresh.
+    """
+    if published_at is None:
+        return 0.5
+    now = now or datetime.now()
+    if published_at.tzinfo is not None:
+        published_at = published_at.astimezone().replace(tzinfo=None)
+
+    half_life = float(os.getenv("FRESHNESS_HALF_LIFE_HOURS", "24"))
+    age_hours = max((now - published_at).total_seconds() / 3600, 0.0)
+    return 0.5 ** (age_hours / half_life)
+
+
+def priority_score(
+    relevance: float,
+    published_at: Optional[datetime],
+    source_weight: float = 1.0,
+    now: Optional[datetime] = None
+) -> float:
+    """
+    Processing priority of an article
+
+    Args:
+        relevance: Relevance to AI, from 0 to 1
+        published_at: Publication time
+        source_weight: Multiplier of the article's source
+        now: Reference time (default: now)
+
+    Returns:
+        Priority; higher is processed first
+    """
+    score = RELEVANCE_WEIGHT * relevance + (1 - RELEVANCE_WEIGHT) * recency_score(published_at, now)
+    return round(score * source_weight, 4)
+
+
+@dataclass(order=True)
+class QueuedArticle:
+    """Article waiting for AI processing; sorts highest priority first"""
+    sort_key: Tuple[float, int]
+    source_name: str = field(compare=False)
+    article_data: Optional[dict] = field(compare=False, default=None)
+    score: float = field(compare=False, default=0.0)
+    # Set for articles deferred by an earlier run and already stored as pending
+    article_id: Optional[int] = field(compare=False, default=None)
+
+    @classmethod
+    def create(cls, sequence: int, source_name: str, article_data: dict, score: float,
+               article_id: Optional[int] = None) -> "QueuedArticle":
+        return cls((-score, sequence), source_name, article_data, score, article_id)
+
+    @classmethod
+    def stop(cls, sequence: int) -> "QueuedArticle":
+        """Marker that ends a worker once every article before it is taken"""
+        return cls((float("inf"), sequence), "")
+
+
+class RunBudget:
+    """
+    Token and cost budget of one pipeline run
+
+    Spending is read from the run's LLM call metrics. Articles being
+    processed reserve their estimated usage until they finish, so
+    concurrent workers cannot overshoot the budget together. A limit of
+    0 means unlimited. Thread-safe.
+    """
+
+    def __init__(
+        self,
+        run_id: Optional[str],
+        metrics: LLMMetrics,
+        max_tokens: Optional[int] = None,
+        max_cost: Optional[float] = None
+    ):
+        """
+        Initialize the budget
+
+        Args:
+            run_id: Run whose calls count against the budget
+            metrics: Recorder of the run's calls
+            max_tokens: Most tokens per run (default: RUN_TOKEN_BUDGET or 0)
+            max_cost: Most estimated USD per run (default: RUN_COST_BUDGET or 0)
+        """
+        self.run_id = run_id
+        self.metrics = metrics
+        self.max_tokens = max_tokens if max_tokens is not None else int(os.getenv("RUN_TOKEN_BUDGET", "0"))
+        self.max_cost = max_cost if max_cost is not None else float(os.getenv("RUN_COST_BUDGET", "0"))
+
+        self.reserved_tokens = 0
+        self.reserved_cost = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def limited(self) -> bool:
+        return bool(self.max_tokens or self.max_cost)
+
+    def spent(self) -> Tuple[int, float]:
+        """Tokens and cost of the run's calls so far"""
+        if not self.run_id:
+            return 0, 0.0
+        return self.metrics.run_usage(self.run_id)
+
+    def reserve(self, tokens: int, cost: float) -> bool:
+        """
+        Reserve the estimated usage of an article
+
+        Returns:
+            False if the article does not fit in what is left of the budget
+        """
+        with self._lock:
+            spent_tokens, spent_cost = self.spent()
+            if self.max_tokens and spent_tokens + self.reserved_tokens + tokens > self.max_tokens:
+                return False
+            if self.max_cost and spent_cost + self.reserved_cost + cost > self.max_cost:
+                return False
+            self.reserved_tokens += tokens
+            self.reserved_cost += cost
+            return True
+
+    def release(self, tokens: int, cost: float):
+        """Return a reservation once its article is processed"""
+        with self._lock:
+            self.reserved_tokens -= tokens
+            self.reserved_cost -= cost
@@ -0,0 +1,147 @@
+"""
+In-process index of already stored article URLs
+"""
+from typing import Iterable, List, Set
+import hashlib
+import math
+import os
+import threading
+import logging
+
+from ..database import SessionLocal
+from ..models import Article
+from ..scrapers.urls import canonicalize_url
+
+logger = logging.getLogger(__name__)
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings"""
+
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        """
+        Initialize the filter
+
+        Args:
+            capacity: Number of items the filter is sized for
+            error_rate: Target false-positive rate at capacity
+        """
+        self.capacity = capacity = max(capacity, 1)
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item: str) -> Iterable[int]:
+        # Double hashing: derive k positions from two 64-bit halves of one digest
+        digest = hashlib.blake2b(item.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hash_count))
+
+    def add(self, item: str):
+        """Add an item"""
+        for position in self._positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        """True if the item may have been added, False if it certainly was not"""
+        return all(
+            self.bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(item)
+        )
+
+
+class SeenUrlIndex:
+    """
+    Canonical URLs of stored articles, backed by a Bloom filter
+
+    A miss in the filter proves a URL is new without touching the database.
+    Hits are confirmed with one batched query, so false positives never
+    cause a new article to be skipped.
+    """
+
+    def __init__(self, capacity: int = None, error_rate: float = 0.001):
+        self.capacity = capacity or int(os.getenv("SEEN_URL_INDEX_CAPACITY", "100000"))
+        self.error_rate = error_rate
+        self.bloom = BloomFilter(self.capacity, self.error_rate)
+        self.loaded = False
+        self._lock = threading.Lock()
+
+    def load(self):
+        """Build the filter from the stored articles, backfilling canonical URLs"""
+        db = SessionLocal()
+        try:
+            rows = db.query(Article.id, Article.source_url, Article.canonical_url).all()
+
+            # Articles stored before canonical URLs existed
+            missing = [
+                {'id': row.id, 'canonical_url': canonicalize_url(row.source_url)}
+                for row in rows if not row.canonical_url
+            ]
+            if missing:
+                db.bulk_update_mappings(Article, missing)
+                db.commit()
+                logger.info(f"Backfilled canonical URLs for {len(missing)} articles")
+
+            canonical = [row.canonical_url or canonicalize_url(row.source_url) for row in rows]
+
+            bloom = BloomFilter(max(self.capacity, 2 * len(canonical)), self.error_rate)
+            for url in canonical:
+                bloom.add(url)
+
+            with self._lock:
+                self.bloom = bloom
+                self.loaded = True
+
+            logger.info(f"Seen-URL index loaded with {len(canonical)} URLs")
+
+        except Exception as e:
+            logger.error(f"Error loading seen-URL index: {str(e)}")
+            db.rollback()
+        finally:
+            db.close()
+
+    def add(self, canonical_url: str):
+        """Record a newly stored article"""
+        with self._lock:
+            self.bloom.add(canonical_url)
+            # Rebuild larger once the filter is past its sized capacity
+            over_capacity = self.bloom.count > self.bloom.capacity
+        if over_capacity:
+            self.capacity = 2 * self.bloom.capacity
+            self.load()
+
+    def find_known(self, canonical_urls: List[str]) -> Set[str]:
+        """
+        Find which canonical URLs are already stored
+
+        Args:
+            canonical_urls: Candidate canonical URLs
+
+        Returns:
+            Set of the given URLs that belong to a stored article
+        """
+        if not self.loaded:
+            self.load()
+
+        if self.loaded:
+            with self._lock:
+                maybe_known = [url for url in set(canonical_urls) if url in self.bloom]
+        else:
+            maybe_known = list(set(canonical_urls))
+
+        if not maybe_known:
+            return set()
+
+        db = SessionLocal()
+        try:
+            rows = (
+                db.query(Article.canonical_url)
+                .filter(Article.canonical_url.in_(maybe_known))
+                .all()
+            )
+            return {row[0] for row in rows}
+        finally:
+            db.close()
@@ -2,10 +2,15 @@
 Scheduled tasks for news scraping and processing
 """
 from apscheduler.schedulers.background import BackgroundScheduler
+from collections import Counter
 from datetime import datetime
-from sqlalchemy.orm import Session
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from sqlalchemy import func
+import asyncio
+import itertools
 import logging
 import os
+import threading
 
 from ..database import SessionLocal
 from ..models import Article
@@ -15,7 +20,15 @@ from ..scrapers import (
     MITTechReviewScraper,
     ArxivScraper
 )
-from ..ai import ArticleSummarizer, ArticleTranslator
+from ..scrapers.fetcher import AsyncFetcher, SourceTiming, stream_sources, run_sync
+from ..ai import ArticleSummarizer, ArticleTranslator, ArticleProcessor, get_backend
+from ..ai.batch import BatchProcessor
+from ..ai.metrics import current_run, llm_run, llm_source, new_run_id
+from .pipeline import StagedPipeline
+from .polling import PollSchedule
+from .priority import QueuedArticle, RunBudget, priority_score, source_weights
+from .seen_urls import SeenUrlIndex
+from .writer import ArticleWriter
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -32,154 +45,639 @@ class NewsScraperScheduler:
             MITTechReviewScraper(),
             ArxivScraper()
         ]
+        self.seen_urls = SeenUrlIndex()
+        self.writer = ArticleWriter(on_write=self.on_articles_written)
+        # Per-source outcome and duration of the last scrape
+        self.source_timings: Dict[str, SourceTiming] = {}
+        # Sources of the last scrape with new entries that could not be saved
+        self.unsaved_sources: Set[str] = set()
+        # Rows the writer actually inserted or updated, per (source, is_processed)
+        self.written_rows: Counter = Counter()
+        self._written_lock = threading.Lock()
 
         # Load article limits from environment variables
         self.min_articles = int(os.getenv("MIN_ARTICLES_PER_SOURCE", "3"))
         self.max_articles = int(os.getenv("MAX_ARTICLES_PER_SOURCE", "5"))
         logger.info(f"Article limits configured: min={self.min_articles}, max={self.max_articles}")
 
-        # Initialize AI components only if OpenAI API key is available
-        api_key = os.getenv("OPENAI_API_KEY")
-        if api_key:
-            self.summarizer = ArticleSummarizer()
-            self.translator = ArticleTranslator()
-        else:
-            logger.warning("OPENAI_API_KEY not found. AI features will be disabled.")
+        # Articles processed concurrently, and scraped articles queued ahead of them
+        # (the queue is ranked by priority, so it also bounds the ranking window)
+        self.pipeline_workers = int(os.getenv("PIPELINE_WORKERS", "4"))
+        self.pipeline_queue_size = int(os.getenv("PIPELINE_QUEUE_SIZE", "64"))
+
+        # Priority multiplier per source, and articles deferred by earlier runs to retry
+        self.source_weights = source_weights()
+        self.deferred_limit = int(os.getenv("DEFERRED_LOAD_LIMIT", "100"))
+
+        # "inline" streams each run through in-process workers; "jobs" runs it
+        # through the durable job queue, which other worker processes can drain too
+        self.pipeline_mode = os.getenv("PIPELINE_MODE", "inline")
+
+        # Process harvested arXiv papers with offline batch jobs instead of interactively
+        self.batch_harvest = os.getenv("ARXIV_HARVEST_BATCH", "False") == "True"
+
+        # Initialize AI components only if the LLM backend is configured
+        # (LLM_BACKEND=fake runs the whole pipeline without an API key)
+        try:
+            backend = get_backend()
+            self.summarizer = ArticleSummarizer(backend=backend)
+            self.translator = ArticleTranslator(backend=backend)
+            self.processor = ArticleProcessor(self.summarizer, self.translator, backend=backend)
+        except ValueError as e:
+            logger.warning(f"{str(e)}. AI features will be disabled.")
             self.summarizer = None
             self.translator = None
+            self.processor = None
+
+        self.staged = StagedPipeline(self) if self.pipeline_mode == "jobs" else None
+
+        # Poll each source on its own learned interval instead of all at once (see start)
+        self.adaptive_polling = os.getenv("ADAPTIVE_POLLING_ENABLED", "False") == "True"
+        self.poll_schedule: Optional[PollSchedule] = None
+
+    def scrape_and_process(self, scrapers: Optional[List] = None):
+        """
+        Main task: scrape articles and process them with AI
 
-    def scrape_and_process(self):
-        """Main task: scrape articles and process them with AI"""
-        # Skip if AI components are not available
+        Args:
+            scrapers: Sources to scrape (default: all)
+        """
+        scrapers = scrapers or self.scrapers
         if not self.summarizer or not self.translator:
-            logger.warning("Skipping scraping task: AI components not initialized (missing OpenAI API key)")
+            logger.warning("Skipping scraping task: AI components not initialized (LLM backend not configured)")
             return
 
         logger.info("Starting scheduled scraping task...")
 
-        db = SessionLocal()
+        if self.staged:
+            self.run_staged(scrapers)
+            return
+
         try:
-            new_articles_count = 0
+            # Fetch every source concurrently while articles are processed
+            logger.info(f"Scraping {len(scrapers)} sources concurrently...")
+            with llm_run(new_run_id("scrape")) as run_id:
+                fetched, new_articles_count = run_sync(self._ascrape_and_process(scrapers))
+
+            for scraper in scrapers:
+                articles_count = fetched[scraper.source_name]
+                timing = self.source_timings.get(scraper.source_name)
+                if timing:
+                    logger.info(
+                        f"Fetched {articles_count} articles from {scraper.source_name}: {timing.status} "
+                        f"in {timing.seconds:.1f}s (feed {timing.feed_seconds:.1f}s, {timing.candidates} entries)"
+                    )
+                else:
+                    logger.info(f"Fetched {articles_count} articles from {scraper.source_name}")
 
-            for scraper in self.scrapers:
-                logger.info(f"Scraping {scraper.source_name}...")
+                if articles_count < self.min_articles:
+                    logger.warning(
+                        f"Only {articles_count} articles fetched from {scraper.source_name}, "
+                        f"which is below the minimum of {self.min_articles}"
+                    )
+
+                # Remember the feed's validators now that its entries are stored or deferred;
+                # a source cut short, or with entries not saved, keeps its old state so the
+                # entries come again
+                if timing and timing.status == "ok" and scraper.source_name not in self.unsaved_sources:
+                    scraper.commit_feed_state(timing.feed_state)
+                if timing and timing.status == "ok":
+                    self.record_poll(scraper.source_name, timing.new_entries)
+                elif timing:
+                    self.record_failed_poll(scraper.source_name)
 
-                try:
-                    # Fetch articles with configured limits
-                    articles = scraper.scrape_articles(max_articles=self.max_articles)
+            logger.info(f"Scraping task completed. Added {new_articles_count} new articles.")
+            if self.processor.cache is not None:
+                cache = self.processor.cache
+                logger.info(f"LLM cache: {cache.hits} hits, {cache.misses} misses")
+            self.processor.stats.log_summary()
+            self.log_writer_stats()
+            logger.info(f"LLM calls of this run: /metrics/llm/runs/{run_id}")
 
-                    # Log article count
-                    articles_count = len(articles)
-                    logger.info(f"Fetched {articles_count} articles from {scraper.source_name}")
+        except Exception as e:
+            logger.error(f"Error in scraping task: {str(e)}")
+        finally:
+            self.processor.metrics.flush()
+            self.processor.metrics.end_run(run_id)
+
+    def log_writer_stats(self):
+        """Log the article writer's totals"""
+        stats = self.writer.stats()
+        logger.info(
+            f"Article writes: {stats['rows']} rows in {stats['writes']} writes, "
+            f"{stats['seconds']}s ({stats['rows_per_second']} rows/s), {stats['errors']} errors"
+        )
 
-                    if articles_count < self.min_articles:
-                        logger.warning(
-                            f"Only {articles_count} articles fetched from {scraper.source_name}, "
-                            f"which is below the minimum of {self.min_articles}"
-                        )
+    def poll_due_sources(self):
+        """Scrape the sources whose adaptive poll interval has elapsed"""
+        due = set(self.poll_schedule.due([scraper.source_name for scraper in self.scrapers]))
+        if not due:
+            logger.info("No source is due for polling")
+            return
+        self.scrape_and_process([scraper for scraper in self.scrapers if scraper.source_name in due])
+
+    def record_poll(self, source_name: str, new_entries: int):
+        """Feed a successful poll of a source into the adaptive schedule"""
+        if self.poll_schedule:
+            self.poll_schedule.record(source_name, new_entries, window_full=new_entries >= self.max_articles)
+
+    def record_failed_poll(self, source_name: str):
+        """Back off the adaptive schedule of a source whose poll failed or timed out"""
+        if self.poll_schedule:
+            self.poll_schedule.record_failure(source_name)
+
+    def run_staged(self, scrapers: Optional[List] = None):
+        """Enqueue a run in the job queue and work until it is drained (PIPELINE_MODE=jobs)"""
+        try:
+            run_id = self.staged.enqueue_run(
+                new_run_id("scrape"), [scraper.source_name for scraper in scrapers or self.scrapers]
+            )
+            self.drain_jobs()
+            self.staged.queue.purge()
+            logger.info(f"LLM calls of this run: /metrics/llm/runs/{run_id}")
+        except Exception as e:
+            logger.error(f"Error in staged scraping task: {str(e)}")
+
+    def drain_jobs(self):
+        """Handle every ready job, including retries and jobs left over by a crashed worker"""
+        if not self.processor:
+            return
+        try:
+            self.staged.work()
+            for stage, counts in self.staged.queue.counts().items():
+                logger.info(f"Jobs {stage}: " + ", ".join(f"{count} {status}" for status, count in sorted(counts.items())))
+            self.processor.stats.log_summary()
+        except Exception as e:
+            logger.error(f"Error draining pipeline jobs: {str(e)}")
+        finally:
+            self.processor.metrics.flush()
+
+    async def _ascrape_and_process(self, scrapers: Optional[List] = None) -> Tuple[Dict[str, int], int]:
+        """
+        Stream scraped articles into AI processing workers, best first
+
+        Articles go through a bounded priority queue to ``pipeline_workers``
+        async workers as soon as they are extracted, so LLM calls start
+        while other pages are still being fetched and several articles are
+        processed at once within the OpenAI rate limits. Workers always
+        take the queued article with the highest priority (relevance,
+        freshness and source weight, see ``priority``); articles deferred
+        by earlier runs are queued again with a fresh score. When the
+        queue is full, scraping waits.
+
+        With a run budget (RUN_TOKEN_BUDGET / RUN_COST_BUDGET), articles
+        whose estimated usage no longer fits are saved as pending with
+        ``deferred_at`` set instead of processed, and retried next run.
+        Articles whose processing fails are deferred the same way; sources
+        with articles that could not be saved at all are recorded in
+        ``unsaved_sources``.
 
-                    for article_data in articles:
-                        # Check if article already exists
-                        existing = db.query(Article).filter(
-                            Article.source_url == article_data['url']
-                        ).first()
-
-                        if existing:
-                            logger.info(f"Article already exists: {article_data['url']}")
-                            continue
-
-                        # Process with AI
-                        processed = self.process_article(article_data)
-
-                        if processed:
-                            # Create article record
-                            article = Article(
-                                source=scraper.source_name,
-                                source_url=article_data['url'],
-                                title_en=article_data['title'],
-                                content_en=article_data['content'],
-                                summary_en=processed['summary_en'],
-                                title_ja=processed['title_ja'],
-                                summary_ja=processed['summary_ja'],
-                                key_points_ja=processed['key_points_ja'],
-                                published_at=article_data['published_at'],
-                                author=article_data.get('author'),
-                                image_url=article_data.get('image_url'),
-                                tags=article_data.get('tags', []),
-                                category='AI',
-                                is_processed=True,
-                                is_published=True,
-                                translated_at=datetime.now()
-                            )
-
-                            db.add(article)
-                            db.commit()
-                            new_articles_count += 1
-                            logger.info(f"Saved article: {processed['title_ja'][:50]}...")
+        Args:
+            scrapers: Sources to scrape (default: all)
 
+        Returns:
+            Articles fetched per source, and the number of articles saved
+        """
+        scrapers = scrapers or self.scrapers
+        fetched = {scraper.source_name: 0 for scraper in scrapers}
+        self.source_timings = {}
+        self.unsaved_sources = set()
+        saved_urls = set()
+        deferred_count = 0
+        failed_count = 0
+        writer_errors = self.writer.errors
+        written_before = self.count_written(fetched, processed_only=True)
+        pending: asyncio.PriorityQueue = asyncio.PriorityQueue(self.pipeline_queue_size)
+        sequence = itertools.count()
+        budget = RunBudget(current_run.get(), self.processor.metrics)
+
+        async def handle(item: QueuedArticle):
+            nonlocal deferred_count, failed_count
+            usage = (0, 0.0)
+            if budget.limited:
+                usage = await asyncio.to_thread(
+                    self.processor.estimate_usage, item.article_data['title'], item.article_data['content']
+                )
+                if not budget.reserve(*usage):
+                    if await asyncio.to_thread(self.defer_article, item):
+                        deferred_count += 1
+                    else:
+                        self.unsaved_sources.add(item.source_name)
+                    return
+
+            try:
+                if await self.aprocess_and_store(item.source_name, item.article_data, item.score):
+                    return
+                if await asyncio.to_thread(self.defer_article, item):
+                    failed_count += 1
+                else:
+                    self.unsaved_sources.add(item.source_name)
+            finally:
+                budget.release(*usage)
+
+        async def worker():
+            while True:
+                item = await pending.get()
+                if item.article_data is None:
+                    return
+                # A failing article must not end the worker: the producer would block on a full queue
+                try:
+                    await handle(item)
                 except Exception as e:
-                    logger.error(f"Error scraping {scraper.source_name}: {str(e)}")
+                    logger.error(f"Error handling {item.article_data.get('url')}: {str(e)}")
+                    self.unsaved_sources.add(item.source_name)
+
+        workers = [asyncio.create_task(worker()) for _ in range(self.pipeline_workers)]
+        try:
+            for source_name, article_id, article_data in await asyncio.to_thread(self.load_deferred):
+                saved_urls.add(article_data['canonical_url'])
+                score = self.score_article(source_name, article_data)
+                await pending.put(QueuedArticle.create(next(sequence), source_name, article_data, score, article_id))
+
+            # Entries already stored are dropped before any article page is fetched
+            async for scraper, article_data in stream_sources(
+                scrapers,
+                max_articles=self.max_articles,
+                known_urls=self.find_known_urls,
+                timings=self.source_timings
+            ):
+                fetched[scraper.source_name] += 1
+
+                # Same article listed by more than one feed in this run
+                if article_data['canonical_url'] in saved_urls:
+                    logger.info(f"Article already exists: {article_data['url']}")
                     continue
+                saved_urls.add(article_data['canonical_url'])
 
-            logger.info(f"Scraping task completed. Added {new_articles_count} new articles.")
+                score = self.score_article(scraper.source_name, article_data)
+                await pending.put(QueuedArticle.create(next(sequence), scraper.source_name, article_data, score))
+        finally:
+            for _ in workers:
+                await pending.put(QueuedArticle.stop(next(sequence)))
+            await asyncio.gather(*workers)
+            await asyncio.to_thread(self.writer.flush)
+
+        # Rows that turned out to be stored already are not counted
+        new_articles_count = self.count_written(fetched, processed_only=True) - written_before
+        if self.writer.errors > writer_errors:
+            # The writer does not tell which rows were lost, so no feed state is trusted
+            self.unsaved_sources.update(fetched)
+        if failed_count:
+            logger.warning(f"AI processing failed for {failed_count} articles; deferred them to the next run")
+        if deferred_count:
+            spent_tokens, spent_cost = budget.spent()
+            logger.info(
+                f"Run budget spent ({spent_tokens} tokens, ${spent_cost:.4f}); "
+                f"deferred {deferred_count} articles to the next run"
+            )
+        return fetched, new_articles_count
 
+    def score_article(self, source_name: str, article_data: dict) -> float:
+        """Processing priority of an article (see ``priority.priority_score``)"""
+        scraper = next((s for s in self.scrapers if s.source_name == source_name), self.scrapers[0])
+        relevance = scraper.relevance_score(article_data['title'], article_data['content'])
+        return priority_score(relevance, article_data['published_at'], self.source_weights.get(source_name, 1.0))
+
+    def load_deferred(self) -> List[Tuple[str, int, dict]]:
+        """
+        Articles deferred by earlier runs, highest priority first
+
+        Returns:
+            Source name, article ID and article data of at most
+            ``deferred_limit`` articles
+        """
+        db = SessionLocal()
+        try:
+            articles = (
+                db.query(Article)
+                .filter(Article.is_processed == False, Article.deferred_at.isnot(None))  # noqa: E712
+                .order_by(Article.priority_score.desc())
+                .limit(self.deferred_limit)
+                .all()
+            )
+            return [
+                (article.source, article.id, {
+                    'title': article.title_en,
+                    'url': article.source_url,
+                    'canonical_url': article.canonical_url or article.source_url,
+                    'content': article.content_en,
+                    'published_at': article.published_at,
+                    'author': article.author,
+                    'image_url': article.image_url,
+                    'tags': article.tags or [],
+                })
+                for article in articles
+            ]
         except Exception as e:
-            logger.error(f"Error in scraping task: {str(e)}")
+            logger.error(f"Error loading deferred articles: {str(e)}")
+            return []
+        finally:
+            db.close()
+
+    def defer_article(self, item: QueuedArticle) -> bool:
+        """Keep an article for the next run: save it as pending, or update its priority if already saved"""
+        if item.article_id is None:
+            return self.store_article(item.source_name, item.article_data, None, item.score, deferred=True)
+
+        db = SessionLocal()
+        try:
+            db.query(Article).filter(Article.id == item.article_id).update({'priority_score': item.score})
+            db.commit()
+            return True
+        except Exception as e:
+            logger.error(f"Error deferring {item.article_data['url']}: {str(e)}")
             db.rollback()
+            return False
         finally:
             db.close()
 
-    def process_article(self, article_data: dict) -> dict:
+    async def aprocess_and_store(self, source_name: str, article_data: dict, priority: Optional[float] = None) -> bool:
         """
-        Process article with AI: summarize and translate
+        Process an article with AI and save it
 
         Args:
+            source_name: Name of the article's source
             article_data: Raw article data from scraper
+            priority: Processing priority to store with the article
 
         Returns:
-            Processed article data with translations
+            True if the article was saved
+        """
+        with llm_source(source_name):
+            processed = await self.aprocess_article(article_data)
+        if not processed:
+            return False
+        return await asyncio.to_thread(self.store_article, source_name, article_data, processed, priority)
+
+    def store_article(
+        self,
+        source_name: str,
+        article_data: dict,
+        processed: Optional[dict],
+        priority: Optional[float] = None,
+        deferred: bool = False,
+        flush: bool = False
+    ) -> bool:
+        """
+        Save an article through the batched writer
+
+        Args:
+            source_name: Name of the article's source
+            article_data: Raw article data from scraper
+            processed: Result of ``process_article``, or None to save the
+                raw article as pending (unprocessed, unpublished) for a batch job
+            priority: Processing priority of the article
+            deferred: Mark a pending article as deferred to the next run
+                rather than left for a batch job
+            flush: Write the article now instead of buffering it
+
+        Returns:
+            True if the article was buffered, or written when ``flush`` is set
         """
         try:
-            # 1. Summarize in English
-            logger.info("Summarizing article...")
-            summary_en = self.summarizer.summarize(
-                article_data['title'],
-                article_data['content']
-            )
+            row = self.article_row(source_name, article_data, processed, priority, deferred)
+            if flush:
+                self.writer.write([row])
+            else:
+                self.writer.add(row)
+            return True
+        except Exception as e:
+            logger.error(f"Error storing {article_data['url']}: {str(e)}")
+            return False
+
+    def article_row(
+        self,
+        source_name: str,
+        article_data: dict,
+        processed: Optional[dict],
+        priority: Optional[float] = None,
+        deferred: bool = False
+    ) -> dict:
+        """Column values of an article record (see ``store_article``)"""
+        if processed:
+            ai_fields = {
+                'summary_en': processed['summary_en'],
+                'title_ja': processed['title_ja'],
+                'summary_ja': processed['summary_ja'],
+                'key_points_ja': processed['key_points_ja'],
+                'is_processed': True,
+                'is_published': True,
+                'translated_at': datetime.now(),
+                'deferred_at': None
+            }
+        else:
+            ai_fields = {
+                'summary_en': None,
+                'title_ja': '',
+                'summary_ja': '',
+                'key_points_ja': None,
+                'is_processed': False,
+                'is_published': False,
+                'translated_at': None,
+                'deferred_at': datetime.now() if deferred else None
+            }
 
-            if not summary_en:
-                logger.error("Failed to generate summary")
-                return None
+        return {
+            'source': source_name,
+            'source_url': article_data['url'],
+            'canonical_url': article_data['canonical_url'],
+            'title_en': article_data['title'],
+            'content_en': article_data['content'],
+            'published_at': article_data['published_at'],
+            'author': article_data.get('author'),
+            'image_url': article_data.get('image_url'),
+            'tags': article_data.get('tags', []),
+            'category': 'AI',
+            'priority_score': priority,
+            **ai_fields
+        }
+
+    def on_articles_written(self, rows: List[dict]):
+        """Record the articles a finished write inserted or updated in the seen-URL index and counts"""
+        with self._written_lock:
+            self.written_rows.update((row['source'], row['is_processed']) for row in rows)
+        for row in rows:
+            self.seen_urls.add(row['canonical_url'])
+            if row['is_processed']:
+                logger.info(f"Saved article: {row['title_ja'][:50]}...")
+            elif row['deferred_at']:
+                logger.info(f"Deferred article: {row['title_en'][:50]}...")
+            else:
+                logger.info(f"Saved pending article: {row['title_en'][:50]}...")
+
+    def count_written(self, sources: Iterable[str], processed_only: bool = False) -> int:
+        """
+        Articles of the given sources inserted or updated by the writer so far
 
-            # 2. Extract key points in English
-            logger.info("Extracting key points...")
-            key_points_en = self.summarizer.extract_key_points(
-                article_data['title'],
-                article_data['content']
+        Args:
+            sources: Source names
+            processed_only: Count only processed articles, not pending ones
+        """
+        sources = set(sources)
+        with self._written_lock:
+            return sum(
+                count for (source, processed), count in self.written_rows.items()
+                if source in sources and (processed or not processed_only)
             )
 
-            if not key_points_en:
-                logger.error("Failed to extract key points")
-                return None
+    def harvest_arxiv(self):
+        """
+        Harvest every arXiv paper submitted since the last harvest
 
-            # 3. Translate to Japanese
-            logger.info("Translating to Japanese...")
-            translation = self.translator.translate_article(
-                article_data['title'],
-                summary_en,
-                key_points_en
+        Pages stream through AI processing as they arrive, best papers
+        first and within the run budget like a scraping run; see
+        ArxivScraper.aharvest for paging and checkpointing. With
+        ARXIV_HARVEST_BATCH=True the papers are saved as pending instead
+        and processed offline by a batch job.
+        """
+        if not self.summarizer or not self.translator:
+            logger.warning("Skipping arXiv harvest: AI components not initialized (LLM backend not configured)")
+            return
+
+        logger.info("Starting arXiv harvest...")
+        with llm_run(new_run_id("harvest")) as run_id:
+            try:
+                run_sync(self._aharvest_arxiv())
+            finally:
+                self.processor.stats.log_summary()
+                self.processor.metrics.flush()
+                self.processor.metrics.end_run(run_id)
+
+        if self.batch_harvest:
+            batch = BatchProcessor(self.processor)
+            try:
+                batch.submit()
+            finally:
+                batch.client.close()
+
+    async def _aharvest_arxiv(self):
+        scraper = next(s for s in self.scrapers if isinstance(s, ArxivScraper))
+
+        db = SessionLocal()
+        try:
+            # First harvest stops at the newest paper already stored
+            latest = (
+                db.query(func.max(Article.published_at))
+                .filter(Article.source == scraper.source_name)
+                .scalar()
             )
+        finally:
+            db.close()
 
-            if not translation:
-                logger.error("Failed to translate article")
-                return None
+        limit = asyncio.Semaphore(self.pipeline_workers)
+        budget = RunBudget(current_run.get(), self.processor.metrics)
+        deferred_count = 0
+
+        async def process(article_data: dict, score: float) -> bool:
+            nonlocal deferred_count
+            if self.batch_harvest:
+                return await asyncio.to_thread(self.store_article, scraper.source_name, article_data, None, score)
+
+            async with limit:
+                usage = (0, 0.0)
+                if budget.limited:
+                    usage = await asyncio.to_thread(
+                        self.processor.estimate_usage, article_data['title'], article_data['content']
+                    )
+                if budget.reserve(*usage):
+                    try:
+                        if await self.aprocess_and_store(scraper.source_name, article_data, score):
+                            return True
+                    finally:
+                        budget.release(*usage)
+                else:
+                    deferred_count += 1
+
+            # Over budget or failed: the checkpoint moves past this paper, so keep it
+            # as deferred for the next scraping run
+            return await asyncio.to_thread(
+                self.store_article, scraper.source_name, article_data, None, score, True
+            )
 
-            return {
-                'summary_en': summary_en,
-                'title_ja': translation['title_ja'],
-                'summary_ja': translation['summary_ja'],
-                'key_points_ja': translation['key_points_ja']
-            }
+        try:
+            written_before = self.count_written([scraper.source_name])
+            async with AsyncFetcher() as fetcher:
+                async for articles in scraper.aharvest(fetcher, stop_at=latest):
+                    known = await asyncio.to_thread(
+                        self.find_known_urls, [a['canonical_url'] for a in articles]
+                    )
+                    fresh = {
+                        a['canonical_url']: a for a in articles if a['canonical_url'] not in known
+                    }
+                    # Papers take the processing slots best first
+                    scored = sorted(
+                        ((self.score_article(scraper.source_name, a), a) for a in fresh.values()),
+                        key=lambda pair: -pair[0]
+                    )
+                    stored = await asyncio.gather(*(process(a, score) for score, a in scored))
+
+                    # The page's checkpoint is saved when the loop resumes the harvest,
+                    # so every paper of the page must be written by then
+                    errors = self.writer.errors
+                    await asyncio.to_thread(self.writer.flush)
+                    if not all(stored) or self.writer.errors > errors:
+                        raise RuntimeError(
+                            "Papers of a harvested page could not be stored; "
+                            "stopping before its checkpoint so the page is harvested again"
+                        )
+
+            new_articles_count = self.count_written([scraper.source_name]) - written_before
+            logger.info(f"arXiv harvest finished. Added {new_articles_count} new articles.")
+            if deferred_count:
+                spent_tokens, spent_cost = budget.spent()
+                logger.info(
+                    f"Run budget spent ({spent_tokens} tokens, ${spent_cost:.4f}); "
+                    f"deferred {deferred_count} papers to the next run"
+                )
+
+        except Exception as e:
+            logger.error(f"Error in arXiv harvest: {str(e)}")
+
+    def poll_batches(self):
+        """Ingest the results of finished batch jobs"""
+        if not self.processor:
+            return
+
+        batch = BatchProcessor(self.processor)
+        try:
+            running = batch.poll()
+            logger.info(f"Batch poll finished; {running} batches still running")
+        finally:
+            batch.client.close()
+
+    def find_known_urls(self, canonical_urls: List[str]) -> Set[str]:
+        """
+        Find which canonical URLs are already stored
+
+        Args:
+            canonical_urls: Candidate canonical article URLs
+
+        Returns:
+            Set of URLs that already have an article record
+        """
+        return self.seen_urls.find_known(canonical_urls)
+
+    def process_article(self, article_data: dict) -> dict:
+        """
+        Process article with AI: summarize and translate
+
+        Args:
+            article_data: Raw article data from scraper
+
+        Returns:
+            Processed article data with translations
+        """
+        try:
+            return self.processor.process(article_data['title'], article_data['content'])
+
+        except Exception as e:
+            logger.error(f"Error processing article: {str(e)}")
+            return None
+
+    async def aprocess_article(self, article_data: dict) -> dict:
+        """Asynchronous ``process_article``"""
+        try:
+            return await self.processor.aprocess(article_data['title'], article_data['content'])
 
         except Exception as e:
             logger.error(f"Error processing article: {str(e)}")
@@ -192,29 +690,94 @@ class NewsScraperScheduler:
         Args:
             interval_hours: Hours between scraping runs (default: 24)
         """
+        # Build the seen-URL index before the first run
+        self.seen_urls.load()
+
         # Schedule the scraping task
-        self.scheduler.add_job(
-            self.scrape_and_process,
-            'interval',
-            hours=interval_hours,
-            id='scrape_news',
-            name='Scrape and process AI news',
-            replace_existing=True
-        )
+        if self.adaptive_polling:
+            # Check often; each source is scraped only once its own interval has elapsed
+            self.poll_schedule = PollSchedule(default_minutes=interval_hours * 60)
+            self.scheduler.add_job(
+                self.poll_due_sources,
+                'interval',
+                minutes=int(os.getenv("POLL_TICK_MINUTES", "5")),
+                id='scrape_news',
+                name='Scrape AI news sources that are due',
+                replace_existing=True,
+                max_instances=1
+            )
+        else:
+            self.scheduler.add_job(
+                self.scrape_and_process,
+                'interval',
+                hours=interval_hours,
+                id='scrape_news',
+                name='Scrape and process AI news',
+                replace_existing=True
+            )
+
+        # Incremental arXiv backfill, paging until the last harvested paper
+        if os.getenv("ARXIV_HARVEST_ENABLED", "False") == "True":
+            harvest_hours = int(os.getenv("ARXIV_HARVEST_INTERVAL_HOURS", "6"))
+            self.scheduler.add_job(
+                self.harvest_arxiv,
+                'interval',
+                hours=harvest_hours,
+                id='harvest_arxiv',
+                name='Harvest arXiv papers',
+                replace_existing=True,
+                max_instances=1
+            )
+
+            if self.batch_harvest:
+                self.scheduler.add_job(
+                    self.poll_batches,
+                    'interval',
+                    minutes=int(os.getenv("BATCH_POLL_MINUTES", "30")),
+                    id='poll_batches',
+                    name='Ingest finished batch jobs',
+                    replace_existing=True,
+                    max_instances=1
+                )
+
+        # Retries and work left by crashed or restarted workers
+        if self.staged:
+            self.scheduler.add_job(
+                self.drain_jobs,
+                'interval',
+                minutes=int(os.getenv("JOB_DRAIN_MINUTES", "5")),
+                id='drain_jobs',
+                name='Work through pending pipeline jobs',
+                replace_existing=True,
+                max_instances=1
+            )
 
         # Run once immediately on startup
         self.scheduler.add_job(
-            self.scrape_and_process,
+            self.poll_due_sources if self.adaptive_polling else self.scrape_and_process,
             'date',
             run_date=datetime.now(),
             id='initial_scrape',
-            name='Initial scraping run'
+            name='Initial scraping run',
+            replace_existing=True
         )
 
         self.scheduler.start()
-        logger.info(f"Scheduler started. Will run every {interval_hours} hours.")
+        if self.adaptive_polling:
+            logger.info("Scheduler started. Sources are polled on adaptive intervals.")
+        else:
+            logger.info(f"Scheduler started. Will run every {interval_hours} hours.")
+
+    def stop(self, wait: bool = True):
+        """
+        Stop the scheduler
 
-    def stop(self):
-        """Stop the scheduler"""
-        self.scheduler.shutdown()
+        Args:
+            wait: Wait for running jobs to finish
+        """
+        if not self.scheduler.running:
+            return
+        self.scheduler.shutdown(wait=wait)
+        # A shut down scheduler cannot be started again (e.g. after a new leader election)
+        self.scheduler = BackgroundScheduler()
         logger.info("Scheduler stopped.")
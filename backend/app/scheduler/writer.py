@@ -0,0 +1,209 @@
+"""
+Batched article persistence with multi-row upserts
+"""
+from typing import Callable, Dict, List, Optional
+import os
+import threading
+import time
+import logging
+
+from sqlalchemy import false, true
+
+from ..database import engine
+from ..models import Article
+
+logger = logging.getLogger(__name__)
+
+# Columns a processed article fills in on an existing pending row
+UPSERT_COLUMNS = (
+    'summary_en', 'title_ja', 'summary_ja', 'key_points_ja', 'is_processed',
+    'is_published', 'translated_at', 'deferred_at', 'priority_score',
+)
+
+# SQLite allows 999 bound parameters per statement in older versions
+SQLITE_MAX_PARAMS = 999
+
+
+def _insert(dialect: str):
+    """Dialect insert construct supporting ON CONFLICT, or None"""
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+        return insert
+    if dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+        return insert
+    return None
+
+
+class ArticleWriter:
+    """
+    Buffer of article rows written in batches
+
+    Rows are written with one multi-row ``INSERT ... ON CONFLICT
+    (source_url)`` per batch, in a single transaction, instead of a
+    SELECT, INSERT and commit per article. A conflicting pending row is
+    completed when the new row is processed and left alone otherwise, so
+    writing the same article twice changes nothing; only the rows a write
+    actually inserted or updated are counted and reported to ``on_write``
+    (``RETURNING``). The buffer is flushed
+    once it holds ``batch_size`` rows or its oldest row is
+    ``flush_seconds`` old. Thread-safe.
+    """
+
+    def __init__(
+        self,
+        batch_size: Optional[int] = None,
+        flush_seconds: Optional[float] = None,
+        on_write: Optional[Callable[[List[Dict]], None]] = None
+    ):
+        """
+        Initialize the writer
+
+        Args:
+            batch_size: Rows per write (default: WRITE_BATCH_SIZE or 50)
+            flush_seconds: Longest a row waits in the buffer (default: WRITE_FLUSH_SECONDS or 2)
+            on_write: Called with the rows each successful write inserted or updated
+        """
+        self.batch_size = batch_size or int(os.getenv("WRITE_BATCH_SIZE", "50"))
+        self.flush_seconds = flush_seconds or float(os.getenv("WRITE_FLUSH_SECONDS", "2"))
+        self.on_write = on_write
+        self.insert = _insert(engine.dialect.name)
+
+        self.buffer: List[Dict] = []
+        self.rows = 0
+        self.writes = 0
+        self.errors = 0
+        self.seconds = 0.0
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._timer: Optional[threading.Timer] = None
+
+    def add(self, row: Dict):
+        """Buffer an article row (all Article columns except the generated ones)"""
+        with self._lock:
+            self.buffer.append(row)
+            full = len(self.buffer) >= self.batch_size
+            if len(self.buffer) == 1 and not full:
+                self._timer = threading.Timer(self.flush_seconds, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+        if full:
+            self.flush()
+
+    def flush(self) -> int:
+        """
+        Write the buffered rows
+
+        If the batch fails, its rows are written one at a time so a bad
+        row does not lose the others.
+
+        Returns:
+            Rows inserted or updated
+        """
+        with self._lock:
+            rows, self.buffer = self.buffer, []
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        if not rows:
+            return 0
+
+        try:
+            return len(self.write(rows))
+        except Exception as e:
+            logger.error(f"Error writing {len(rows)} articles, retrying one by one: {str(e)}")
+
+        written = 0
+        for row in rows:
+            try:
+                written += len(self.write([row]))
+            except Exception as e:
+                with self._lock:
+                    self.errors += 1
+                logger.error(f"Error storing {row['source_url']}: {str(e)}")
+        return written
+
+    def write(self, rows: List[Dict]) -> List[Dict]:
+        """
+        Upsert rows in one transaction now, bypassing the buffer; raises on failure
+
+        Returns:
+            The rows inserted or updated, without those that changed nothing
+        """
+        # PostgreSQL rejects a statement that updates the same row twice
+        unique: Dict[str, Dict] = {}
+        for row in rows:
+            if row['source_url'] not in unique or row['is_processed']:
+                unique[row['source_url']] = row
+        rows = list(unique.values())
+
+        start = time.perf_counter()
+        with self._write_lock, engine.begin() as conn:
+            if self.insert is None:
+                written = self._write_rows(conn, rows)
+            else:
+                written = []
+                per_statement = len(rows)
+                if engine.dialect.name == "sqlite":
+                    per_statement = max(SQLITE_MAX_PARAMS // len(rows[0]), 1)
+                for first in range(0, len(rows), per_statement):
+                    chunk = rows[first:first + per_statement]
+                    # A conflict the WHERE clause turns into a no-op returns no row
+                    changed = set(conn.execute(self._upsert(chunk)).scalars())
+                    written.extend(row for row in chunk if row['source_url'] in changed)
+
+        seconds = time.perf_counter() - start
+        with self._lock:
+            self.rows += len(written)
+            self.writes += 1
+            self.seconds += seconds
+        logger.info(
+            f"Wrote {len(written)} of {len(rows)} articles in {seconds * 1000:.1f} ms "
+            f"({len(rows) / seconds if seconds else 0:.0f} rows/s)"
+        )
+        if self.on_write and written:
+            self.on_write(written)
+        return written
+
+    def _upsert(self, rows: List[Dict]):
+        table = Article.__table__
+        statement = self.insert(table).values(rows)
+        return statement.on_conflict_do_update(
+            index_elements=[table.c.source_url],
+            set_={column: statement.excluded[column] for column in UPSERT_COLUMNS},
+            # Only a processed row completes a pending one; anything else is a no-op
+            where=(table.c.is_processed == false()) & (statement.excluded.is_processed == true())
+        ).returning(table.c.source_url)
+
+    def _write_rows(self, conn, rows: List[Dict]) -> List[Dict]:
+        """Portable fallback for databases without ON CONFLICT; returns the rows written"""
+        table = Article.__table__
+        written = []
+        for row in rows:
+            existing = conn.execute(
+                table.select().with_only_columns(table.c.is_processed)
+                .where(table.c.source_url == row['source_url'])
+            ).first()
+            if existing is None:
+                conn.execute(table.insert().values(row))
+            elif row['is_processed'] and not existing.is_processed:
+                conn.execute(
+                    table.update().where(table.c.source_url == row['source_url'])
+                    .values({column: row[column] for column in UPSERT_COLUMNS})
+                )
+            else:
+                continue
+            written.append(row)
+        return written
+
+    def stats(self) -> Dict:
+        """Rows, writes and throughput so far"""
+        with self._lock:
+            return {
+                'rows': self.rows,
+                'writes': self.writes,
+                'errors': self.errors,
+                'buffered': len(self.buffer),
+                'seconds': round(self.seconds, 3),
+                'rows_per_second': round(self.rows / self.seconds, 1) if self.seconds else 0.0,
+            }
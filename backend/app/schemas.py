@@ -69,3 +69,27 @@ class SearchQuery(BaseModel):
     date_to: Optional[datetime] = None
     page: int = 1
     page_size: int = 20
+
+
+class LLMUsage(BaseModel):
+    """Aggregated LLM calls of a run, source, task or model"""
+    key: Optional[str] = None
+    calls: int
+    cached: int
+    errors: int
+    retries: int
+    prompt_tokens: int
+    completion_tokens: int
+    cost: float
+    avg_latency_ms: float
+    max_latency_ms: float
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+
+class LLMRunBreakdown(BaseModel):
+    """LLM calls of one pipeline run, in total and per source and task"""
+    run_id: str
+    total: LLMUsage
+    by_source: List[LLMUsage]
+    by_task: List[LLMUsage]
@@ -2,6 +2,8 @@
 News scrapers for various sources
 """
 from .base import BaseScraper
+from .fetcher import AsyncFetcher, scrape_sources
+from .urls import canonicalize_url
 from .techcrunch import TechCrunchScraper
 from .venturebeat import VentureBeatScraper
 from .mit_tech_review import MITTechReviewScraper
@@ -9,6 +11,9 @@ from .arxiv import ArxivScraper
 
 __all__ = [
     "BaseScraper",
+    "AsyncFetcher",
+    "scrape_sources",
+    "canonicalize_url",
     "TechCrunchScraper",
     "VentureBeatScraper",
     "MITTechReviewScraper",
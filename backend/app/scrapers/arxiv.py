@@ -1,10 +1,14 @@
 """
 arXiv scraper for AI/ML papers
 """
-from typing import List, Dict, Optional
-from datetime import datetime
+from typing import AsyncIterator, List, Dict, Optional
+from datetime import datetime, timedelta
 from .base import BaseScraper
+from .feed_state import FeedStateStore
+from .fetcher import AsyncFetcher
+import asyncio
 import feedparser
+import os
 import logging
 
 logger = logging.getLogger(__name__)
@@ -13,6 +17,9 @@ logger = logging.getLogger(__name__)
 class ArxivScraper(BaseScraper):
     """Scraper for arXiv AI/ML papers"""
 
+    # The abstract is sufficient for our purposes
+    fetch_article_pages = False
+
     def __init__(self):
         super().__init__(
             source_name="arXiv",
@@ -22,44 +29,140 @@ class ArxivScraper(BaseScraper):
         self.search_query = "cat:cs.AI+OR+cat:cs.LG+OR+cat:cs.CL+OR+cat:cs.CV"
         self.api_url = f"http://export.arxiv.org/api/query?search_query={self.search_query}&sortBy=submittedDate&sortOrder=descending"
 
-    def scrape_articles(self, max_articles: int = 10) -> List[Dict]:
-        """Scrape papers from arXiv API"""
-        articles = []
+        # Harvest mode settings
+        self.harvest_page_size = int(os.getenv("ARXIV_HARVEST_PAGE_SIZE", "100"))
+        self.harvest_max_pages = int(os.getenv("ARXIV_HARVEST_MAX_PAGES", "20"))
+        # arXiv asks API clients to wait 3 seconds between requests
+        self.harvest_page_delay = float(os.getenv("ARXIV_HARVEST_PAGE_DELAY", "3"))
+        # How far back a first harvest goes when nothing is stored yet
+        self.harvest_lookback_days = int(os.getenv("ARXIV_HARVEST_LOOKBACK_DAYS", "7"))
+
+    def feed_url(self, max_articles: int = 10) -> str:
+        """arXiv API query for the newest papers"""
+        return f"{self.api_url}&max_results={max_articles}"
 
-        try:
-            feed = feedparser.parse(f"{self.api_url}&max_results={max_articles}")
+    def build_article(self, entry, article_data: Optional[Dict]) -> Optional[Dict]:
+        """
+        Build an article from an arXiv API entry
 
+        The abstract is already in the feed, so no article page is fetched.
+        If you want to extract text from PDFs, you'd need additional libraries.
+        """
+        return {
+            'title': self.clean_text(entry.title),
+            'url': entry.link,
+            'content': self.clean_text(entry.summary),
+            'published_at': datetime(*entry.published_parsed[:6]),
+            'author': self._extract_authors(entry),
+            'image_url': None,  # arXiv doesn't provide images in feed
+            'tags': self._extract_categories(entry)
+        }
+
+    async def aharvest(
+        self,
+        fetcher: AsyncFetcher,
+        stop_at: Optional[datetime] = None,
+        page_size: Optional[int] = None,
+        max_pages: Optional[int] = None
+    ) -> AsyncIterator[List[Dict]]:
+        """
+        Page through all papers newer than the last harvest
+
+        Pages are requested with ``start`` offsets, newest first, and each
+        page's articles are yielded as soon as it arrives. Paging stops at
+        the first paper submitted before the stop timestamp. Progress is
+        checkpointed after each page has been consumed, so an interrupted
+        backfill resumes from the same offset next time.
+
+        Args:
+            fetcher: Shared fetcher
+            stop_at: Stop timestamp for a fresh harvest when no previous
+                harvest has completed (e.g. newest stored submission);
+                without one, ARXIV_HARVEST_LOOKBACK_DAYS before now
+            page_size: Papers per API request (default: ARXIV_HARVEST_PAGE_SIZE)
+            max_pages: Pages per call (default: ARXIV_HARVEST_MAX_PAGES);
+                an unfinished harvest continues on the next call
+
+        Yields:
+            Lists of article dictionaries, one list per page
+        """
+        page_size = page_size or self.harvest_page_size
+        max_pages = max_pages or self.harvest_max_pages
+        store = self.feed_state or FeedStateStore()
+
+        checkpoint = store.load_checkpoint(self.api_url)
+        run = checkpoint.get('run')
+        if run:
+            logger.info(f"Resuming arXiv harvest at offset {run['start']}")
+        else:
+            high_water = checkpoint.get('high_water')
+            if high_water:
+                stop_at = datetime.fromisoformat(high_water)
+            run = {
+                'start': 0,
+                'stop_at': stop_at.isoformat() if stop_at else None,
+                'newest': None
+            }
+        if not run['stop_at']:
+            # Without a lower bound the backfill would page through all of arXiv;
+            # submission dates are UTC
+            lookback = datetime.utcnow() - timedelta(days=self.harvest_lookback_days)
+            run['stop_at'] = lookback.isoformat()
+
+        stop = datetime.fromisoformat(run['stop_at'])
+        finished = False
+
+        for page in range(max_pages):
+            if page:
+                await asyncio.sleep(self.harvest_page_delay)
+
+            url = f"{self.api_url}&start={run['start']}&max_results={page_size}"
+            response = await fetcher.request(url)
+            response.raise_for_status()
+            feed = await asyncio.to_thread(feedparser.parse, response.content)
+
+            articles = []
             for entry in feed.entries:
                 try:
-                    article = {
-                        'title': self.clean_text(entry.title),
-                        'url': entry.link,
-                        'content': self.clean_text(entry.summary),
-                        'published_at': datetime(*entry.published_parsed[:6]),
-                        'author': self._extract_authors(entry),
-                        'image_url': None,  # arXiv doesn't provide images in feed
-                        'tags': self._extract_categories(entry)
-                    }
-                    articles.append(article)
-                    logger.info(f"Scraped: {article['title']}")
-
+                    article = self.build_article(entry, None)
                 except Exception as e:
                     logger.error(f"Error processing entry: {str(e)}")
                     continue
 
-        except Exception as e:
-            logger.error(f"Error scraping arXiv: {str(e)}")
-
-        return articles
-
-    def extract_article_content(self, url: str) -> Optional[Dict]:
-        """
-        For arXiv, the abstract is already in the feed
-        This method would be used to fetch the full PDF content if needed
-        """
-        # The abstract is sufficient for our purposes
-        # If you want to extract text from PDFs, you'd need additional libraries
-        return None
+                if article['published_at'] < stop:
+                    finished = True
+                    break
+
+                article['canonical_url'] = self.entry_canonical_url(entry)
+                articles.append(article)
+                if not run['newest'] or article['published_at'].isoformat() > run['newest']:
+                    run['newest'] = article['published_at'].isoformat()
+
+            if len(feed.entries) < page_size:
+                total = int(feed.feed.get('opensearch_totalresults', 0) or 0)
+                if not feed.entries and total > run['start']:
+                    # The API occasionally returns empty pages mid-listing; retry next run
+                    logger.warning(f"Empty arXiv page at offset {run['start']} of {total}")
+                    store.save_checkpoint(self.api_url, {**checkpoint, 'run': run})
+                    return
+                finished = True
+
+            logger.info(f"arXiv harvest page at offset {run['start']}: {len(articles)} papers")
+            if articles:
+                yield articles
+
+            # The page has been consumed; record progress
+            run['start'] += page_size
+            if finished:
+                break
+            store.save_checkpoint(self.api_url, {**checkpoint, 'run': run})
+
+        if finished:
+            newest = max(filter(None, [run['newest'], checkpoint.get('high_water')]), default=None)
+            store.save_checkpoint(self.api_url, {'high_water': newest})
+            logger.info(f"arXiv harvest complete; newest submission {newest}")
+        else:
+            logger.info(f"arXiv harvest paused at offset {run['start']}; will resume next run")
 
     def _extract_authors(self, entry) -> str:
         """Extract author names from entry"""
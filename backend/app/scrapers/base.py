@@ -1,39 +1,188 @@
 """
 Base scraper class for news sources
 """
-from abc import ABC, abstractmethod
-from typing import List, Dict, Optional
+from abc import ABC
+from typing import AsyncIterator, Callable, Iterator, List, Dict, Optional, Set, Tuple
 from datetime import datetime
-import requests
 from bs4 import BeautifulSoup
+import asyncio
+import feedparser
+import os
+import requests
 import logging
 
+from .fetcher import DEFAULT_HEADERS, AsyncFetcher, SyncFetcher, iterate_sync
+from .feed_state import FeedStateStore
+from .urls import canonicalize_url
+from .parsing import parse_html
+from .relevance import relevance_score
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
 class BaseScraper(ABC):
-    """Abstract base class for news scrapers"""
+    """
+    Abstract base class for news scrapers
+
+    Sources implement ``build_article`` (and ``parse_article_content`` when
+    they fetch article pages); the base class fetches the feed and pages
+    concurrently. Subclasses written for the original synchronous API,
+    which implement ``scrape_articles`` instead, keep working: their
+    ``scrape_articles`` runs in a worker thread and its articles are
+    streamed like any other source's (see ``legacy_api``).
+    """
+
+    # Set to False for sources whose feed already carries the full content
+    fetch_article_pages = True
+
+    # Limits page parsing to the article containers (see parsing.container_strainer)
+    content_strainer = None
 
     def __init__(self, source_name: str, base_url: str):
         self.source_name = source_name
         self.base_url = base_url
+        self.rss_url: Optional[str] = None
+
+        # Conditional-GET state; disable with FEED_CACHE_ENABLED=False
+        if os.getenv("FEED_CACHE_ENABLED", "True") == "True":
+            self.feed_state: Optional[FeedStateStore] = FeedStateStore()
+        else:
+            self.feed_state = None
+
+        # Article pages fetched and extracted at once while streaming
+        self.stream_window = int(os.getenv("SCRAPER_STREAM_WINDOW", "8"))
+
+        # Deprecated: HTTP session of the original synchronous API, kept for
+        # subclasses that still use it; the base class fetches with AsyncFetcher
         self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        })
+        self.session.headers.update({'User-Agent': DEFAULT_HEADERS['User-Agent']})
 
-    def fetch_page(self, url: str, timeout: int = 30) -> Optional[BeautifulSoup]:
-        """Fetch a webpage and return BeautifulSoup object"""
-        try:
-            response = self.session.get(url, timeout=timeout)
-            response.raise_for_status()
-            return BeautifulSoup(response.content, 'html.parser')
-        except Exception as e:
-            logger.error(f"Error fetching {url}: {str(e)}")
+        # One fetcher shared by the synchronous methods, so their politeness state persists
+        self.sync_fetcher = SyncFetcher()
+
+    @property
+    def legacy_api(self) -> bool:
+        """Whether the subclass implements ``scrape_articles`` rather than ``build_article``"""
+        cls = type(self)
+        return cls.scrape_articles is not BaseScraper.scrape_articles and cls.build_article is BaseScraper.build_article
+
+    def fetch_page(self, url: str, timeout: Optional[int] = None) -> Optional[BeautifulSoup]:
+        """
+        Fetch a webpage and return BeautifulSoup object
+
+        Only the elements matched by ``content_strainer`` are parsed. Without
+        an explicit timeout the host's adaptive timeout (at most 30s) is used.
+        """
+        return self.sync_fetcher.run(lambda fetcher: self.afetch_page(url, timeout=timeout, fetcher=fetcher))
+
+    async def afetch_page(
+        self,
+        url: str,
+        timeout: Optional[int] = None,
+        fetcher: Optional[AsyncFetcher] = None
+    ) -> Optional[BeautifulSoup]:
+        """Fetch a webpage asynchronously and return BeautifulSoup object"""
+        if fetcher is None:
+            async with AsyncFetcher() as own_fetcher:
+                return await self.afetch_page(url, timeout=timeout, fetcher=own_fetcher)
+
+        body = await fetcher.fetch(url, timeout=timeout)
+        if body is None:
             return None
+        return self.parse_html(body)
+
+    def parse_html(self, body: bytes) -> BeautifulSoup:
+        """Parse a raw page body, keeping only the article containers"""
+        return parse_html(body, strainer=self.content_strainer)
+
+    def feed_url(self, max_articles: int = 10) -> str:
+        """URL of the source's feed"""
+        return self.rss_url
+
+    def fetch_feed_entries(self, max_articles: int = 10) -> List:
+        """Fetch the source's feed and return its newest entries"""
+        return self.sync_fetcher.run(lambda fetcher: self.afetch_feed_entries(fetcher, max_articles))
+
+    async def afetch_feed_entries(self, fetcher: AsyncFetcher, max_articles: int = 10) -> List:
+        """Fetch the source's new feed entries (see ``afetch_feed``)"""
+        entries, _ = await self.afetch_feed(fetcher, max_articles)
+        return entries
+
+    async def afetch_feed(self, fetcher: AsyncFetcher, max_articles: int = 10) -> Tuple[List, Optional[Dict]]:
+        """
+        Fetch the source's feed with a conditional GET
+
+        The entries are empty when the server answers 304 Not Modified or
+        when every entry was already seen on a previous run. The new feed
+        state is returned rather than saved; pass it to ``commit_feed_state``
+        once the entries are stored. Legacy subclasses (see ``legacy_api``)
+        return the articles of their ``scrape_articles`` wrapped as entries
+        instead, and no feed state.
+
+        Returns:
+            New entries, and the feed state to commit (None if unchanged)
+        """
+        if self.legacy_api:
+            return await self._afetch_legacy_entries(max_articles), None
+
+        url = self.feed_url(max_articles)
+        state = self.feed_state.load(url) if self.feed_state else None
+
+        headers = {}
+        if state and state['etag']:
+            headers['If-None-Match'] = state['etag']
+        if state and state['last_modified']:
+            headers['If-Modified-Since'] = state['last_modified']
+
+        response = await fetcher.request(url, headers=headers)
+        if response.status_code == 304:
+            logger.info(f"Feed not modified: {self.source_name}")
+            return [], None
+        response.raise_for_status()
+
+        feed = await asyncio.to_thread(feedparser.parse, response.content)
+        entries = feed.entries[:max_articles]
+        entry_ids = [self.entry_id(entry) for entry in entries]
+
+        new_state = {
+            'feed_url': url,
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'entry_ids': entry_ids
+        }
+
+        if state and set(entry_ids) <= set(state['seen_entry_ids']):
+            logger.info(f"No new feed entries: {self.source_name}")
+            return [], new_state
+
+        return entries, new_state
+
+    async def _afetch_legacy_entries(self, max_articles: int) -> List:
+        """Articles of a legacy subclass's ``scrape_articles`` as feed entries carrying the article"""
+        articles = await asyncio.to_thread(self.scrape_articles, max_articles)
+        return [
+            feedparser.FeedParserDict(id=article['url'], link=article['url'], article=article)
+            for article in articles[:max_articles]
+        ]
+
+    def commit_feed_state(self, state: Optional[Dict]):
+        """Persist the feed state returned by ``afetch_feed`` once its entries are stored"""
+        if self.feed_state and state:
+            self.feed_state.save(**state)
+
+    def entry_id(self, entry) -> str:
+        """Stable identifier of a feed entry"""
+        return entry.get('id') or entry.get('link')
+
+    def entry_url(self, entry) -> str:
+        """Article URL of a feed entry"""
+        return entry.link
+
+    def entry_canonical_url(self, entry) -> str:
+        """Canonical article URL of a feed entry, used for deduplication"""
+        return canonicalize_url(self.entry_url(entry))
 
-    @abstractmethod
     def scrape_articles(self, max_articles: int = 10) -> List[Dict]:
         """
         Scrape articles from the source
@@ -42,30 +191,225 @@ class BaseScraper(ABC):
             List of dictionaries with keys:
             - title: Article title
             - url: Article URL
+            - canonical_url: Canonical article URL (filled in by the base class)
             - content: Article content
             - published_at: Publication datetime
             - author: Author name (optional)
             - image_url: Image URL (optional)
             - tags: List of tags (optional)
         """
-        pass
+        return self.sync_fetcher.run(lambda fetcher: self.ascrape_articles(fetcher, max_articles))
+
+    async def ascrape_articles(
+        self,
+        fetcher: AsyncFetcher,
+        max_articles: int = 10,
+        known_urls: Optional[Callable[[List[str]], Set[str]]] = None
+    ) -> List[Dict]:
+        """
+        Scrape articles, fetching all article pages concurrently
+
+        Collects ``aiter_articles``; see there for the arguments.
+        """
+        return [
+            article
+            async for article in self.aiter_articles(fetcher, max_articles, known_urls)
+        ]
+
+    def iter_articles(self, max_articles: int = 10) -> Iterator[Dict]:
+        """
+        Scrape articles from the source, yielding each one as it is extracted
+
+        Fetching runs in a background thread and stays at most a few
+        articles ahead of the caller.
+
+        Yields:
+            Article dictionaries (see ``scrape_articles``)
+        """
+        return iterate_sync(lambda: self._aiter_with_own_fetcher(max_articles))
+
+    async def _aiter_with_own_fetcher(self, max_articles: int) -> AsyncIterator[Dict]:
+        async with AsyncFetcher() as fetcher:
+            async for article in self.aiter_articles(fetcher, max_articles):
+                yield article
+
+    async def aiter_articles(
+        self,
+        fetcher: AsyncFetcher,
+        max_articles: int = 10,
+        known_urls: Optional[Callable[[List[str]], Set[str]]] = None
+    ) -> AsyncIterator[Dict]:
+        """
+        Scrape articles, yielding each one as soon as it is extracted
+
+        Args:
+            fetcher: Shared fetcher
+            max_articles: Maximum number of feed entries to consider
+            known_urls: Optional callable returning which of the given
+                canonical URLs are already stored; those entries are skipped
+                before fetching
+
+        Yields:
+            Article dictionaries in completion order
+        """
+        entries = await self.afetch_candidates(fetcher, max_articles)
+        if known_urls and entries:
+            known = await asyncio.to_thread(known_urls, [self.entry_canonical_url(e) for e in entries])
+            entries = self.exclude_known(entries, known)
+
+        async for article in self.aiter_entries(fetcher, entries):
+            yield article
+
+    async def afetch_candidates(self, fetcher: AsyncFetcher, max_articles: int = 10) -> List:
+        """
+        Fetch lightweight candidates (feed entries) without their article pages
+
+        Errors are logged and yield no candidates.
+        """
+        try:
+            return await self.afetch_feed_entries(fetcher, max_articles)
+        except Exception as e:
+            logger.error(f"Error scraping {self.source_name}: {str(e)}")
+            return []
+
+    def exclude_known(self, entries: List, known: Set[str]) -> List:
+        """Drop candidates whose canonical URL is already stored"""
+        fresh = [entry for entry in entries if self.entry_canonical_url(entry) not in known]
+        skipped = len(entries) - len(fresh)
+        if skipped:
+            logger.info(f"Skipping {skipped} already stored entries from {self.source_name}")
+        return fresh
+
+    async def ascrape_entries(self, fetcher: AsyncFetcher, entries: List) -> List[Dict]:
+        """Fetch and extract the given candidates concurrently"""
+        return [article async for article in self.aiter_entries(fetcher, entries)]
+
+    async def aiter_entries(self, fetcher: AsyncFetcher, entries: List) -> AsyncIterator[Dict]:
+        """
+        Fetch and extract the given candidates, yielding articles as they complete
+
+        At most ``stream_window`` entries are in flight at once, so a slow
+        consumer holds back fetching instead of piling up finished pages.
+        """
+        remaining = iter(entries)
+        pending = set()
+        try:
+            while True:
+                for entry in remaining:
+                    pending.add(asyncio.ensure_future(self._ascrape_entry(fetcher, entry)))
+                    if len(pending) >= self.stream_window:
+                        break
+                if not pending:
+                    return
+
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    article = task.result()
+                    if article:
+                        yield article
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _ascrape_entry(self, fetcher: AsyncFetcher, entry) -> Optional[Dict]:
+        """Fetch, extract and build a single feed entry"""
+        try:
+            return await self.aextract_entry(fetcher, entry)
+        except Exception as e:
+            logger.error(f"Error processing entry: {str(e)}")
+            return None
+
+    async def aextract_entry(self, fetcher: AsyncFetcher, entry) -> Optional[Dict]:
+        """
+        Fetch, extract and build a single feed entry, raising fetch errors
+
+        Returns:
+            Article dictionary, or None if the page has no article or the
+            entry is skipped
+
+        Raises:
+            IOError: If the article page could not be fetched
+        """
+        article_data = None
+        if self.fetch_article_pages and not self.legacy_api:
+            url = self.entry_url(entry)
+            soup = await self.afetch_page(url, fetcher=fetcher)
+            if not soup:
+                raise IOError(f"Could not fetch {url}")
+            article_data = self.parse_article_content(soup, url)
+            if not article_data:
+                return None
+
+        article = self.build_article(entry, article_data)
+        if article:
+            article.setdefault('canonical_url', canonicalize_url(article['url']))
+            logger.info(f"Scraped: {article['title']}")
+        return article
+
+    def dump_entry(self, entry) -> Dict:
+        """JSON-serializable copy of a feed entry (time tuples become lists)"""
+        if isinstance(entry, dict):
+            return {key: self.dump_entry(value) for key, value in entry.items()}
+        if isinstance(entry, (list, tuple)):
+            return [self.dump_entry(value) for value in entry]
+        if entry is None or isinstance(entry, (str, int, float, bool)):
+            return entry
+        return str(entry)
+
+    def load_entry(self, data):
+        """Feed entry from ``dump_entry`` output, with attribute access restored"""
+        if isinstance(data, dict):
+            return feedparser.FeedParserDict({key: self.load_entry(value) for key, value in data.items()})
+        if isinstance(data, list):
+            return [self.load_entry(value) for value in data]
+        return data
+
+    def build_article(self, entry, article_data: Optional[Dict]) -> Optional[Dict]:
+        """
+        Build an article dictionary from a feed entry
+
+        Sources override this. The default passes on the article that a
+        legacy subclass's ``scrape_articles`` already built.
+
+        Args:
+            entry: Feed entry
+            article_data: Result of ``parse_article_content`` for the entry's
+                page, or None when the source does not fetch article pages
+
+        Returns:
+            Article dictionary (see ``scrape_articles``), or None to skip
+        """
+        if 'article' not in entry:
+            raise NotImplementedError(f"{type(self).__name__} must implement build_article or scrape_articles")
+
+        article = dict(entry['article'])
+        # Job payloads carry the entry as JSON (see dump_entry), with the date as a string
+        if isinstance(article.get('published_at'), str):
+            article['published_at'] = datetime.fromisoformat(article['published_at'])
+        return article
+
+    def parse_article_content(self, soup: BeautifulSoup, url: str) -> Optional[Dict]:
+        """Extract article content from a parsed page"""
+        return None
 
-    @abstractmethod
     def extract_article_content(self, url: str) -> Optional[Dict]:
         """Extract full article content from URL"""
-        pass
+        if not self.fetch_article_pages:
+            return None
 
-    def filter_ai_related(self, title: str, content: str) -> bool:
-        """Check if article is AI-related"""
-        ai_keywords = [
-            'ai', 'artificial intelligence', 'machine learning', 'deep learning',
-            'neural network', 'gpt', 'llm', 'generative', 'chatbot',
-            'computer vision', 'nlp', 'natural language', 'robotics',
-            'automation', 'algorithm', 'model', 'training', 'inference'
-        ]
+        soup = self.fetch_page(url)
+        if not soup:
+            return None
+        return self.parse_article_content(soup, url)
+
+    def relevance_score(self, title: str, content: str) -> float:
+        """Relevance of an article to AI, from 0 to 1 (see relevance.relevance_score)"""
+        return relevance_score(title, content)
 
-        text = (title + ' ' + content).lower()
-        return any(keyword in text for keyword in ai_keywords)
+    def filter_ai_related(self, title: str, content: str) -> bool:
+        """Check if article is AI-related (relevance of at least AI_RELEVANCE_THRESHOLD, default 0.3)"""
+        threshold = float(os.getenv("AI_RELEVANCE_THRESHOLD", "0.3"))
+        return self.relevance_score(title, content) >= threshold
 
     def clean_text(self, text: str) -> str:
         """Clean and normalize text"""
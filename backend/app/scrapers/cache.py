@@ -0,0 +1,210 @@
+"""
+On-disk cache of raw article pages
+"""
+from typing import Optional
+from pathlib import Path
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import zlib
+import logging
+
+from .urls import canonicalize_url
+
+logger = logging.getLogger(__name__)
+
+# Seconds between expiry sweeps
+SWEEP_INTERVAL = 300
+
+
+class PageCache:
+    """
+    Compressed, content-addressed cache of page bodies
+
+    Bodies are stored once per content hash under ``objects/`` as
+    zlib-compressed files; a small SQLite index maps each canonical URL
+    to the hash of its latest body. Entries expire after ``ttl_hours``
+    and the least recently used ones are evicted once the compressed
+    size exceeds ``max_mb``.
+    """
+
+    def __init__(
+        self,
+        directory: Optional[str] = None,
+        ttl_hours: Optional[float] = None,
+        max_mb: Optional[float] = None,
+        offline: Optional[bool] = None
+    ):
+        """
+        Initialize the cache
+
+        Args:
+            directory: Cache directory (default: SCRAPER_CACHE_DIR or ./cache/pages)
+            ttl_hours: Entry lifetime (default: SCRAPER_CACHE_TTL_HOURS or 168)
+            max_mb: Maximum compressed size (default: SCRAPER_CACHE_MAX_MB or 500)
+            offline: Serve every cached entry regardless of age and never
+                fall back to the network (default: SCRAPER_CACHE_OFFLINE)
+        """
+        self.directory = Path(directory or os.getenv("SCRAPER_CACHE_DIR", "./cache/pages"))
+        self.ttl = 3600 * (ttl_hours if ttl_hours is not None
+                           else float(os.getenv("SCRAPER_CACHE_TTL_HOURS", "168")))
+        self.max_bytes = int(1024 * 1024 * (max_mb if max_mb is not None
+                                            else float(os.getenv("SCRAPER_CACHE_MAX_MB", "500"))))
+        self.offline = offline if offline is not None else os.getenv("SCRAPER_CACHE_OFFLINE", "False") == "True"
+
+        self.hits = 0
+        self.misses = 0
+
+        (self.directory / "objects").mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(self.directory / "index.sqlite"), check_same_thread=False)
+        self._db.executescript("""
+            PRAGMA journal_mode = WAL;
+            PRAGMA synchronous = NORMAL;
+            CREATE TABLE IF NOT EXISTS pages (
+                url TEXT PRIMARY KEY,
+                content_hash TEXT NOT NULL,
+                fetched_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS blobs (
+                content_hash TEXT PRIMARY KEY,
+                size INTEGER NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS ix_pages_accessed_at ON pages (accessed_at);
+            CREATE INDEX IF NOT EXISTS ix_pages_content_hash ON pages (content_hash);
+        """)
+        self._total_bytes = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM blobs").fetchone()[0]
+        self._last_sweep = 0.0
+
+    def _blob_path(self, content_hash: str) -> Path:
+        return self.directory / "objects" / content_hash[:2] / f"{content_hash}.z"
+
+    def get(self, url: str) -> Optional[bytes]:
+        """
+        Get the cached body of a page
+
+        Returns:
+            Page body, or None if missing or expired
+        """
+        key = canonicalize_url(url)
+        now = time.time()
+
+        with self._lock:
+            row = self._db.execute(
+                "SELECT content_hash, fetched_at FROM pages WHERE url = ?", (key,)
+            ).fetchone()
+
+            if not row or (not self.offline and now - row[1] > self.ttl):
+                self.misses += 1
+                return None
+
+            try:
+                body = zlib.decompress(self._blob_path(row[0]).read_bytes())
+            except (OSError, zlib.error) as e:
+                logger.warning(f"Dropping unreadable cache entry for {url}: {str(e)}")
+                self._db.execute("DELETE FROM pages WHERE url = ?", (key,))
+                self._db.commit()
+                self.misses += 1
+                return None
+
+            self._db.execute("UPDATE pages SET accessed_at = ? WHERE url = ?", (now, key))
+            self._db.commit()
+            self.hits += 1
+            return body
+
+    def put(self, url: str, body: bytes):
+        """Store the body of a page"""
+        key = canonicalize_url(url)
+        content_hash = hashlib.sha256(body).hexdigest()
+        now = time.time()
+
+        with self._lock:
+            try:
+                path = self._blob_path(content_hash)
+                if not path.exists():
+                    data = zlib.compress(body, 6)
+                    path.parent.mkdir(parents=True, exist_ok=True)
+                    tmp_path = path.with_suffix(".tmp")
+                    tmp_path.write_bytes(data)
+                    tmp_path.replace(path)
+                    self._db.execute(
+                        "INSERT OR REPLACE INTO blobs (content_hash, size) VALUES (?, ?)",
+                        (content_hash, len(data))
+                    )
+                    self._total_bytes += len(data)
+
+                self._db.execute(
+                    "INSERT OR REPLACE INTO pages (url, content_hash, fetched_at, accessed_at) "
+                    "VALUES (?, ?, ?, ?)",
+                    (key, content_hash, now, now)
+                )
+                self._db.commit()
+
+                # Sweep when over the size limit, and for expiry every few minutes
+                if self._total_bytes > self.max_bytes or now - self._last_sweep > SWEEP_INTERVAL:
+                    self._evict(now)
+
+            except (OSError, sqlite3.Error) as e:
+                logger.error(f"Error caching {url}: {str(e)}")
+
+    def _evict(self, now: float):
+        """Drop expired entries, then least recently used ones over the size limit"""
+        self._last_sweep = now
+        if not self.offline:
+            self._db.execute("DELETE FROM pages WHERE fetched_at < ?", (now - self.ttl,))
+
+        total = self._db.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM blobs "
+            "WHERE content_hash IN (SELECT content_hash FROM pages)"
+        ).fetchone()[0]
+
+        if total > self.max_bytes:
+            rows = self._db.execute(
+                "SELECT p.url, b.size FROM pages p JOIN blobs b USING (content_hash) "
+                "ORDER BY p.accessed_at"
+            ).fetchall()
+            for url, size in rows:
+                if total <= self.max_bytes:
+                    break
+                self._db.execute("DELETE FROM pages WHERE url = ?", (url,))
+                total -= size
+
+        # Remove bodies no longer referenced by any URL
+        orphans = self._db.execute(
+            "SELECT content_hash FROM blobs "
+            "WHERE content_hash NOT IN (SELECT content_hash FROM pages)"
+        ).fetchall()
+        for (content_hash,) in orphans:
+            self._blob_path(content_hash).unlink(missing_ok=True)
+            self._db.execute("DELETE FROM blobs WHERE content_hash = ?", (content_hash,))
+
+        self._db.commit()
+        self._total_bytes = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM blobs").fetchone()[0]
+
+
+_default_cache: Optional[PageCache] = None
+_default_cache_lock = threading.Lock()
+
+
+def get_page_cache() -> Optional[PageCache]:
+    """
+    Shared page cache configured from the environment
+
+    Returns None when disabled with SCRAPER_CACHE_ENABLED=False.
+    """
+    global _default_cache
+
+    if os.getenv("SCRAPER_CACHE_ENABLED", "True") != "True":
+        return None
+
+    with _default_cache_lock:
+        if _default_cache is None:
+            try:
+                _default_cache = PageCache()
+            except (OSError, sqlite3.Error) as e:
+                logger.error(f"Page cache disabled: {str(e)}")
+                return None
+        return _default_cache
@@ -0,0 +1,113 @@
+"""
+Persisted feed state for conditional GET requests
+"""
+from typing import Dict, List, Optional
+from datetime import datetime
+import logging
+
+from ..database import SessionLocal
+from ..models import FeedState
+
+logger = logging.getLogger(__name__)
+
+# Number of entry IDs remembered per feed
+MAX_SEEN_ENTRY_IDS = 500
+
+
+class FeedStateStore:
+    """Load and save ETag / Last-Modified / seen entry IDs per feed URL"""
+
+    def load(self, feed_url: str) -> Optional[Dict]:
+        """
+        Load the stored state of a feed
+
+        Returns:
+            Dictionary with etag, last_modified and seen_entry_ids,
+            or None if the feed has never been fetched
+        """
+        db = SessionLocal()
+        try:
+            state = db.query(FeedState).filter(FeedState.feed_url == feed_url).first()
+            if not state:
+                return None
+
+            return {
+                'etag': state.etag,
+                'last_modified': state.last_modified,
+                'seen_entry_ids': state.seen_entry_ids or []
+            }
+
+        except Exception as e:
+            logger.error(f"Error loading feed state for {feed_url}: {str(e)}")
+            return None
+        finally:
+            db.close()
+
+    def save(
+        self,
+        feed_url: str,
+        etag: Optional[str],
+        last_modified: Optional[str],
+        entry_ids: List[str]
+    ):
+        """
+        Save the state of a feed after its entries have been handled
+
+        Args:
+            feed_url: Feed URL
+            etag: ETag header of the last 200 response
+            last_modified: Last-Modified header of the last 200 response
+            entry_ids: IDs of the entries in that response
+        """
+        db = SessionLocal()
+        try:
+            state = db.query(FeedState).filter(FeedState.feed_url == feed_url).first()
+            if not state:
+                state = FeedState(feed_url=feed_url, seen_entry_ids=[])
+                db.add(state)
+
+            # Keep the newest IDs first and drop the oldest beyond the limit
+            seen = list(dict.fromkeys(list(entry_ids) + list(state.seen_entry_ids or [])))
+            state.seen_entry_ids = seen[:MAX_SEEN_ENTRY_IDS]
+            state.etag = etag
+            state.last_modified = last_modified
+            state.last_fetched_at = datetime.now()
+
+            db.commit()
+
+        except Exception as e:
+            logger.error(f"Error saving feed state for {feed_url}: {str(e)}")
+            db.rollback()
+        finally:
+            db.close()
+
+    def load_checkpoint(self, feed_url: str) -> Dict:
+        """Load the harvest checkpoint of a feed (empty if none)"""
+        db = SessionLocal()
+        try:
+            state = db.query(FeedState).filter(FeedState.feed_url == feed_url).first()
+            return dict(state.checkpoint or {}) if state else {}
+
+        except Exception as e:
+            logger.error(f"Error loading checkpoint for {feed_url}: {str(e)}")
+            return {}
+        finally:
+            db.close()
+
+    def save_checkpoint(self, feed_url: str, checkpoint: Dict):
+        """Save the harvest checkpoint of a feed"""
+        db = SessionLocal()
+        try:
+            state = db.query(FeedState).filter(FeedState.feed_url == feed_url).first()
+            if not state:
+                state = FeedState(feed_url=feed_url, seen_entry_ids=[])
+                db.add(state)
+
+            state.checkpoint = checkpoint
+            db.commit()
+
+        except Exception as e:
+            logger.error(f"Error saving checkpoint for {feed_url}: {str(e)}")
+            db.rollback()
+        finally:
+            db.close()
@@ -0,0 +1,525 @@
+"""
+Asynchronous HTTP fetch engine shared by all scrapers
+"""
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from urllib.parse import urlsplit
+import asyncio
+import concurrent.futures
+import contextvars
+import os
+import queue
+import threading
+import time
+import logging
+
+import httpx
+
+from .cache import PageCache, get_page_cache
+from .recording import get_transport
+from .politeness import (
+    CircuitOpenError,
+    DomainPolicy,
+    RETRY_STATUSES,
+    backoff_delay,
+    parse_retry_after,
+)
+
+logger = logging.getLogger(__name__)
+# httpx logs every request at INFO; fetch errors are logged here instead
+logging.getLogger("httpx").setLevel(logging.WARNING)
+
+# Longest Retry-After honoured within a run; longer waits count as failures
+MAX_RETRY_AFTER = 120
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+}
+
+
+def run_sync(coro):
+    """
+    Run a coroutine to completion from synchronous code
+
+    Uses ``asyncio.run`` when no event loop is running in the current thread,
+    otherwise runs the coroutine on a fresh loop in a worker thread so sync
+    callers inside async code (e.g. FastAPI handlers) do not deadlock.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+
+    # Context variables (e.g. the current LLM run) carry over to the worker thread
+    with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(contextvars.copy_context().run, asyncio.run, coro).result()
+
+
+def iterate_sync(make_iterator: Callable[[], AsyncIterator], maxsize: int = 8) -> Iterator:
+    """
+    Consume an async iterator from synchronous code
+
+    The iterator runs on its own event loop in a worker thread and hands
+    items over through a queue of ``maxsize``, so the producer runs at most
+    that far ahead of the consumer. Closing the returned generator early
+    stops the producer after its current item.
+
+    Args:
+        make_iterator: Callable creating the async iterator (called in the
+            worker thread, inside its event loop)
+        maxsize: Items buffered between the two sides
+    """
+    items: queue.Queue = queue.Queue(maxsize)
+    stopped = threading.Event()
+    done = object()
+
+    def hand_over(item) -> bool:
+        while not stopped.is_set():
+            try:
+                items.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    async def produce():
+        iterator = make_iterator()
+        try:
+            async for item in iterator:
+                if not await asyncio.to_thread(hand_over, (item, None)):
+                    break
+        finally:
+            if hasattr(iterator, 'aclose'):
+                await iterator.aclose()
+
+    def run():
+        try:
+            asyncio.run(produce())
+            hand_over((done, None))
+        except BaseException as e:
+            hand_over((done, e))
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    try:
+        while True:
+            item, error = items.get()
+            if item is done:
+                if error is not None:
+                    raise error
+                return
+            yield item
+    finally:
+        stopped.set()
+        thread.join()
+
+
+class AsyncFetcher:
+    """
+    Concurrent page fetcher with global and per-host concurrency limits
+
+    Each host is also paced by a DomainPolicy: an adaptive token bucket,
+    retries with jittered exponential backoff, and a circuit breaker that
+    skips the host for the rest of the fetcher's lifetime (one run).
+
+    Must be used as an async context manager so the underlying httpx client
+    and semaphores are bound to the running event loop:
+
+        async with AsyncFetcher() as fetcher:
+            pages = await fetcher.fetch_many(urls)
+    """
+
+    def __init__(
+        self,
+        max_connections: Optional[int] = None,
+        max_per_host: Optional[int] = None,
+        timeout: float = 30,
+        headers: Optional[Dict[str, str]] = None,
+        cache: Optional[PageCache] = None,
+        use_cache: bool = True,
+        max_retries: Optional[int] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None
+    ):
+        """
+        Initialize the fetcher
+
+        Args:
+            max_connections: Maximum concurrent requests overall
+                (default: SCRAPER_MAX_CONNECTIONS or 20)
+            max_per_host: Maximum concurrent requests per host
+                (default: SCRAPER_MAX_PER_HOST or 4)
+            timeout: Default request timeout in seconds
+            headers: Extra headers sent with every request
+            cache: Page cache consulted by ``fetch`` (default: shared cache
+                configured from the environment)
+            use_cache: Set to False to always go to the network
+            max_retries: Retries per request after a transient failure
+                (default: SCRAPER_MAX_RETRIES or 3)
+            transport: httpx transport (default: live network, or the
+                record/replay transport selected by SCRAPER_HTTP_MODE)
+        """
+        self.max_connections = max_connections or int(os.getenv("SCRAPER_MAX_CONNECTIONS", "20"))
+        self.max_per_host = max_per_host or int(os.getenv("SCRAPER_MAX_PER_HOST", "4"))
+        self.timeout = timeout
+        self.headers = {**DEFAULT_HEADERS, **(headers or {})}
+        self.cache = (cache or get_page_cache()) if use_cache else None
+        self.max_retries = max_retries if max_retries is not None else int(os.getenv("SCRAPER_MAX_RETRIES", "3"))
+        self.transport = transport or get_transport()
+
+        self._client: Optional[httpx.AsyncClient] = None
+        self._global_limit: Optional[asyncio.Semaphore] = None
+        self._host_limits: Dict[str, asyncio.Semaphore] = {}
+        self._policies: Dict[str, DomainPolicy] = {}
+
+    async def __aenter__(self) -> "AsyncFetcher":
+        self._client = httpx.AsyncClient(
+            headers=self.headers,
+            timeout=self.timeout,
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=self.max_connections),
+            transport=self.transport
+        )
+        self._global_limit = asyncio.Semaphore(self.max_connections)
+        self._host_limits = {}
+        self._policies = {}
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.aclose()
+
+    async def aclose(self):
+        """Close the underlying HTTP client"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def _host_limit(self, host: str) -> asyncio.Semaphore:
+        """Get (or create) the semaphore for a host"""
+        if host not in self._host_limits:
+            self._host_limits[host] = asyncio.Semaphore(self.max_per_host)
+        return self._host_limits[host]
+
+    def policy(self, url: str) -> DomainPolicy:
+        """Get (or create) the politeness policy for the URL's host"""
+        host = urlsplit(url).netloc.lower()
+        if host not in self._policies:
+            self._policies[host] = DomainPolicy(host, burst=self.max_per_host)
+        return self._policies[host]
+
+    async def request(
+        self,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: Optional[float] = None
+    ) -> httpx.Response:
+        """
+        Perform a GET request within the concurrency and politeness limits
+
+        Transport errors and 429/5xx responses are retried with jittered
+        exponential backoff. Raises httpx errors (or CircuitOpenError) to
+        the caller; use ``fetch`` for the log-and-return-None behaviour
+        used by the scrapers.
+        """
+        if self._client is None:
+            raise RuntimeError("AsyncFetcher must be used as an async context manager")
+
+        policy = self.policy(url)
+        attempt = 0
+
+        while True:
+            await policy.acquire()
+
+            started = time.monotonic()
+            try:
+                async with self._global_limit:
+                    async with self._host_limit(policy.domain):
+                        response = await self._client.get(
+                            url,
+                            headers=headers,
+                            timeout=timeout or policy.timeout(self.timeout)
+                        )
+            except httpx.TransportError as e:
+                policy.record_failure()
+                if attempt >= self.max_retries or policy.circuit_open:
+                    raise
+                delay = backoff_delay(attempt)
+                logger.warning(f"Retrying {url} in {delay:.1f}s after {type(e).__name__}")
+                await asyncio.sleep(delay)
+                attempt += 1
+                continue
+
+            if response.status_code not in RETRY_STATUSES:
+                policy.record_success(time.monotonic() - started)
+                return response
+
+            policy.record_failure()
+            retry_after = None
+            if response.status_code in (429, 503):
+                retry_after = parse_retry_after(response.headers.get('Retry-After'))
+                policy.record_throttled(retry_after)
+
+            if (
+                attempt >= self.max_retries
+                or policy.circuit_open
+                or (retry_after or 0) > MAX_RETRY_AFTER
+            ):
+                return response
+
+            delay = max(retry_after or 0, backoff_delay(attempt))
+            logger.warning(f"Retrying {url} in {delay:.1f}s after HTTP {response.status_code}")
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def fetch(self, url: str, timeout: Optional[float] = None) -> Optional[bytes]:
+        """
+        Fetch a page body, returning None on any error
+
+        Bodies are served from and stored in the page cache when enabled.
+        """
+        if self.cache is not None:
+            body = await asyncio.to_thread(self.cache.get, url)
+            if body is not None:
+                return body
+            if self.cache.offline:
+                logger.warning(f"Not in page cache (offline mode): {url}")
+                return None
+
+        try:
+            response = await self.request(url, timeout=timeout)
+            response.raise_for_status()
+            body = response.content
+            if self.cache is not None:
+                await asyncio.to_thread(self.cache.put, url, body)
+            return body
+        except CircuitOpenError:
+            logger.info(f"Skipping {url}: source is failing")
+            return None
+        except Exception as e:
+            logger.error(f"Error fetching {url}: {str(e)}")
+            return None
+
+    async def fetch_many(self, urls: Iterable[str]) -> Dict[str, Optional[bytes]]:
+        """Fetch several pages concurrently, keyed by URL"""
+        urls = list(dict.fromkeys(urls))
+        bodies = await asyncio.gather(*(self.fetch(url) for url in urls))
+        return dict(zip(urls, bodies))
+
+
+class SyncFetcher:
+    """
+    Shared AsyncFetcher for synchronous callers
+
+    Runs one AsyncFetcher on a private event loop in a daemon thread, so
+    successive sync calls reuse its connections and politeness state
+    (per-host limits, token buckets, circuit breakers) instead of building
+    a new fetcher each time. Like a run, the fetcher lives for at most
+    ``max_age`` seconds; it is then replaced once idle, so an open circuit
+    does not skip a host forever. Thread-safe.
+    """
+
+    def __init__(self, max_age: Optional[float] = None, **fetcher_options):
+        """
+        Initialize the fetcher
+
+        Args:
+            max_age: Seconds before the fetcher is replaced
+                (default: SCRAPER_SYNC_FETCHER_TTL or 600)
+            **fetcher_options: Passed to AsyncFetcher
+        """
+        self.max_age = max_age or float(os.getenv("SCRAPER_SYNC_FETCHER_TTL", "600"))
+        self.fetcher_options = fetcher_options
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._fetcher: Optional[AsyncFetcher] = None
+        self._started = 0.0
+        self._active = 0
+        self._lock = threading.Lock()
+
+    def _call(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    def _acquire(self) -> AsyncFetcher:
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(target=self._loop.run_forever, name="sync-fetcher", daemon=True).start()
+            if self._fetcher is not None and not self._active and time.monotonic() - self._started > self.max_age:
+                self._call(self._fetcher.aclose())
+                self._fetcher = None
+            if self._fetcher is None:
+                self._fetcher = AsyncFetcher(**self.fetcher_options)
+                self._call(self._fetcher.__aenter__())
+                self._started = time.monotonic()
+            self._active += 1
+            return self._fetcher
+
+    def run(self, make_coro: Callable[[AsyncFetcher], Any]) -> Any:
+        """
+        Run ``make_coro(fetcher)`` on the shared fetcher and return its result
+
+        Must not be called from the fetcher's own event loop.
+        """
+        fetcher = self._acquire()
+        try:
+            return self._call(make_coro(fetcher))
+        finally:
+            with self._lock:
+                self._active -= 1
+
+    def close(self):
+        """Close the fetcher and stop its event loop"""
+        with self._lock:
+            if self._loop is None:
+                return
+            if self._fetcher is not None:
+                self._call(self._fetcher.aclose())
+                self._fetcher = None
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._loop = None
+
+
+@dataclass
+class SourceTiming:
+    """Outcome and duration of one source's scrape"""
+    source: str
+    status: str = "pending"  # ok, timeout or error
+    candidates: int = 0
+    new_entries: int = 0  # Candidates not stored yet
+    articles: int = 0
+    feed_seconds: float = 0.0
+    # Scraping time, not counting time spent waiting for the consumer
+    seconds: float = 0.0
+    error: Optional[str] = None
+    # Feed state to commit once the source's entries are stored (see BaseScraper.afetch_feed)
+    feed_state: Optional[Dict] = None
+
+
+async def stream_sources(
+    scrapers: List,
+    max_articles: int = 10,
+    known_urls: Optional[Callable[[List[str]], Set[str]]] = None,
+    buffer_size: Optional[int] = None,
+    source_timeout: Optional[float] = None,
+    max_sources: Optional[int] = None,
+    timings: Optional[Dict[str, SourceTiming]] = None
+) -> AsyncIterator[Tuple[Any, Dict]]:
+    """
+    Scrape several sources at once, yielding articles as they are extracted
+
+    Each source runs as its own task, at most ``max_sources`` at a time:
+    it reads its feed, drops the candidates ``known_urls`` reports as
+    stored, and requests the remaining article pages concurrently, subject
+    to the fetcher's global and per-host limits. A source that fails or
+    runs past ``source_timeout`` seconds is stopped and logged without
+    affecting the others, so a run takes as long as its slowest source
+    rather than the sum of all. Finished articles of all sources are merged
+    through a queue of ``buffer_size``; when it is full the sources stop
+    fetching until the consumer catches up, and that wait does not count
+    against their timeout.
+
+    Args:
+        scrapers: Scrapers to run
+        max_articles: Maximum number of feed entries per source
+        known_urls: Optional callable returning which of the given
+            canonical URLs are already stored
+        buffer_size: Articles buffered ahead of the consumer
+            (default: SCRAPER_STREAM_BUFFER or 8)
+        source_timeout: Seconds each source may spend scraping
+            (default: SCRAPER_SOURCE_TIMEOUT or 300)
+        max_sources: Sources scraped at once (default:
+            SCRAPER_SOURCE_CONCURRENCY, or all of them when 0 or unset)
+        timings: Dictionary filled with a SourceTiming per source name
+
+    Yields:
+        (scraper, article) tuples in completion order
+    """
+    buffer_size = buffer_size or int(os.getenv("SCRAPER_STREAM_BUFFER", "8"))
+    source_timeout = source_timeout or float(os.getenv("SCRAPER_SOURCE_TIMEOUT", "300"))
+    max_sources = max_sources or int(os.getenv("SCRAPER_SOURCE_CONCURRENCY", "0")) or len(scrapers)
+    if timings is None:
+        timings = {}
+
+    async with AsyncFetcher() as fetcher:
+        results: asyncio.Queue = asyncio.Queue(buffer_size)
+        slots = asyncio.Semaphore(max(max_sources, 1))
+
+        async def scrape(scraper, timing: SourceTiming):
+            deadline = time.monotonic() + source_timeout
+
+            def remaining() -> float:
+                return max(deadline - time.monotonic(), 0.0)
+
+            entries, timing.feed_state = await asyncio.wait_for(scraper.afetch_feed(fetcher, max_articles), remaining())
+            timing.feed_seconds = source_timeout - remaining()
+            timing.candidates = len(entries)
+            if known_urls and entries:
+                known = await asyncio.to_thread(known_urls, [scraper.entry_canonical_url(e) for e in entries])
+                entries = scraper.exclude_known(entries, known)
+            timing.new_entries = len(entries)
+
+            articles = scraper.aiter_entries(fetcher, entries)
+            try:
+                while True:
+                    try:
+                        article = await asyncio.wait_for(articles.__anext__(), remaining())
+                    except StopAsyncIteration:
+                        return
+                    timing.articles += 1
+
+                    waiting = time.monotonic()
+                    await results.put((scraper, article))
+                    deadline += time.monotonic() - waiting
+            finally:
+                await articles.aclose()
+
+        async def produce(scraper):
+            timing = timings[scraper.source_name] = SourceTiming(scraper.source_name)
+            async with slots:
+                start = time.monotonic()
+                try:
+                    await scrape(scraper, timing)
+                    timing.status = "ok"
+                except asyncio.TimeoutError:
+                    timing.status = "timeout"
+                    logger.error(f"Scraping {scraper.source_name} timed out after {source_timeout:.0f}s")
+                except Exception as e:
+                    timing.status = "error"
+                    timing.error = f"{type(e).__name__}: {str(e)}"
+                    logger.error(f"Error scraping {scraper.source_name}: {str(e)}")
+                finally:
+                    timing.seconds = time.monotonic() - start
+            # End-of-source marker (skipped when cancelled)
+            await results.put(None)
+
+        producers = [asyncio.create_task(produce(scraper)) for scraper in scrapers]
+        try:
+            remaining = len(producers)
+            while remaining:
+                item = await results.get()
+                if item is None:
+                    remaining -= 1
+                    continue
+                yield item
+        finally:
+            for producer in producers:
+                producer.cancel()
+            await asyncio.gather(*producers, return_exceptions=True)
+
+
+async def scrape_sources(
+    scrapers: List,
+    max_articles: int = 10,
+    known_urls: Optional[Callable[[List[str]], Set[str]]] = None
+) -> Dict[str, List[Dict]]:
+    """
+    Scrape several sources at once through one shared fetcher
+
+    Collects ``stream_sources`` into lists; see there for the arguments.
+
+    Returns:
+        Mapping of source name to the list of scraped articles
+    """
+    scraped = {scraper.source_name: [] for scraper in scrapers}
+    async for scraper, article in stream_sources(scrapers, max_articles, known_urls):
+        scraped[scraper.source_name].append(article)
+    return scraped
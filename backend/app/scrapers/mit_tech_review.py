@@ -1,10 +1,11 @@
 """
 MIT Technology Review scraper
 """
-from typing import List, Dict, Optional
+from typing import Dict, Optional
 from datetime import datetime
+from bs4 import BeautifulSoup
 from .base import BaseScraper
-import feedparser
+from .parsing import container_strainer
 import logging
 
 logger = logging.getLogger(__name__)
@@ -13,6 +14,9 @@ logger = logging.getLogger(__name__)
 class MITTechReviewScraper(BaseScraper):
     """Scraper for MIT Technology Review AI news"""
 
+    # Only the article containers are parsed
+    content_strainer = container_strainer(tags=('article',), div_classes=('content-body',))
+
     def __init__(self):
         super().__init__(
             source_name="MIT Technology Review",
@@ -20,45 +24,20 @@ class MITTechReviewScraper(BaseScraper):
         )
         self.rss_url = "https://www.technologyreview.com/topic/artificial-intelligence/feed/"
 
-    def scrape_articles(self, max_articles: int = 10) -> List[Dict]:
-        """Scrape articles from MIT Tech Review RSS feed"""
-        articles = []
-
-        try:
-            feed = feedparser.parse(self.rss_url)
-
-            for entry in feed.entries[:max_articles]:
-                try:
-                    article_data = self.extract_article_content(entry.link)
-
-                    if article_data:
-                        article = {
-                            'title': self.clean_text(entry.title),
-                            'url': entry.link,
-                            'content': article_data.get('content', ''),
-                            'published_at': self._parse_date(entry),
-                            'author': entry.get('author', 'MIT Technology Review'),
-                            'image_url': self._extract_image(entry),
-                            'tags': ['AI', 'MIT', 'Research']
-                        }
-                        articles.append(article)
-                        logger.info(f"Scraped: {article['title']}")
-
-                except Exception as e:
-                    logger.error(f"Error processing entry: {str(e)}")
-                    continue
-
-        except Exception as e:
-            logger.error(f"Error scraping MIT Tech Review: {str(e)}")
-
-        return articles
-
-    def extract_article_content(self, url: str) -> Optional[Dict]:
+    def build_article(self, entry, article_data: Optional[Dict]) -> Optional[Dict]:
+        """Build an article from a MIT Tech Review RSS entry"""
+        return {
+            'title': self.clean_text(entry.title),
+            'url': entry.link,
+            'content': article_data.get('content', ''),
+            'published_at': self._parse_date(entry),
+            'author': entry.get('author', 'MIT Technology Review'),
+            'image_url': self._extract_image(entry),
+            'tags': ['AI', 'MIT', 'Research']
+        }
+
+    def parse_article_content(self, soup: BeautifulSoup, url: str) -> Optional[Dict]:
         """Extract full article content"""
-        soup = self.fetch_page(url)
-        if not soup:
-            return None
-
         try:
             # Find article content
             article_body = soup.find('div', class_='content-body')
@@ -0,0 +1,71 @@
+"""
+HTML parser backend selection and container-limited parsing
+"""
+from typing import Iterable, Optional
+from bs4 import BeautifulSoup, SoupStrainer
+import os
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def _default_parser() -> str:
+    """Use lxml when installed, the standard library parser otherwise"""
+    try:
+        import lxml  # noqa: F401
+        return 'lxml'
+    except ImportError:
+        return 'html.parser'
+
+
+# Parser backend for article pages: "lxml" or "html.parser"
+HTML_PARSER = os.getenv("SCRAPER_HTML_PARSER") or _default_parser()
+
+
+def container_strainer(
+    tags: Iterable[str] = ('article',),
+    div_classes: Iterable[str] = ()
+) -> SoupStrainer:
+    """
+    Build a SoupStrainer that keeps only the article containers of a page
+
+    Args:
+        tags: Tag names kept entirely (e.g. article)
+        div_classes: CSS classes of div elements kept entirely
+
+    Returns:
+        SoupStrainer for ``BeautifulSoup(parse_only=...)``
+    """
+    tags = frozenset(tags)
+    div_classes = frozenset(div_classes)
+
+    def match(name, attrs=None) -> bool:
+        if name in tags:
+            return True
+        if name != 'div' or not div_classes or not attrs:
+            return False
+        classes = attrs.get('class') or ''
+        if isinstance(classes, str):
+            classes = classes.split()
+        return not div_classes.isdisjoint(classes)
+
+    return SoupStrainer(match)
+
+
+def parse_html(
+    body: bytes,
+    strainer: Optional[SoupStrainer] = None,
+    parser: Optional[str] = None
+) -> BeautifulSoup:
+    """
+    Parse a page body
+
+    Args:
+        body: Raw page body
+        strainer: Optional SoupStrainer limiting which elements are built
+        parser: Parser backend (default: HTML_PARSER)
+
+    Returns:
+        BeautifulSoup tree
+    """
+    return BeautifulSoup(body, parser or HTML_PARSER, parse_only=strainer)
@@ -0,0 +1,153 @@
+"""
+Per-domain rate limiting, retry backoff and circuit breaking
+"""
+from typing import Optional
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+import asyncio
+import os
+import random
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+# HTTP statuses worth retrying
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class CircuitOpenError(Exception):
+    """Raised when requests to a domain are skipped after repeated failures"""
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header
+
+    Returns:
+        Seconds to wait, or None if missing or invalid
+    """
+    if not value:
+        return None
+
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+def backoff_delay(attempt: int, base: float = 1.0, cap: float = 30.0) -> float:
+    """Exponential backoff with full jitter for the given retry attempt (0-based)"""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+class DomainPolicy:
+    """
+    Politeness state for one domain
+
+    A token bucket paces requests. Its rate grows slowly while responses
+    are fast and shrinks when latency rises or the server answers 429,
+    and Retry-After pauses the domain entirely. After ``failure_threshold``
+    consecutive failed attempts (errors or 429/5xx, retries included) the
+    circuit opens and the domain is skipped for the rest of the run.
+    """
+
+    def __init__(
+        self,
+        domain: str,
+        rate: Optional[float] = None,
+        burst: int = 4,
+        min_rate: float = 0.2,
+        max_rate: Optional[float] = None,
+        failure_threshold: Optional[int] = None
+    ):
+        """
+        Initialize the policy
+
+        Args:
+            domain: Domain name (for logging)
+            rate: Initial requests per second (default: SCRAPER_RATE_PER_HOST or 2)
+            burst: Bucket size
+            min_rate: Lowest rate the bucket adapts down to
+            max_rate: Highest rate the bucket adapts up to
+                (default: SCRAPER_MAX_RATE_PER_HOST or 8)
+            failure_threshold: Consecutive failures that open the circuit
+                (default: SCRAPER_CIRCUIT_THRESHOLD or 5)
+        """
+        self.domain = domain
+        self.rate = rate or float(os.getenv("SCRAPER_RATE_PER_HOST", "2"))
+        self.burst = burst
+        self.min_rate = min_rate
+        self.max_rate = max_rate or float(os.getenv("SCRAPER_MAX_RATE_PER_HOST", "8"))
+        self.failure_threshold = failure_threshold or int(os.getenv("SCRAPER_CIRCUIT_THRESHOLD", "5"))
+
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+
+        self.latency: Optional[float] = None  # Exponentially weighted average
+        self.consecutive_failures = 0
+        self.circuit_open = False
+
+    async def acquire(self):
+        """Wait until a request to the domain is allowed"""
+        while True:
+            if self.circuit_open:
+                raise CircuitOpenError(f"Circuit open for {self.domain}")
+
+            now = time.monotonic()
+            if now < self.paused_until:
+                await asyncio.sleep(self.paused_until - now)
+                continue
+
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+
+            await asyncio.sleep((1 - self.tokens) / self.rate)
+
+    def timeout(self, default: float) -> float:
+        """Request timeout adapted to the domain's observed latency"""
+        if self.latency is None:
+            return default
+        return min(default, max(10.0, 5 * self.latency))
+
+    def record_success(self, latency: float):
+        """Record a completed request and adapt the rate to its latency"""
+        slow = self.latency is not None and latency > 2 * self.latency
+        self.latency = latency if self.latency is None else 0.8 * self.latency + 0.2 * latency
+        self.consecutive_failures = 0
+
+        if slow:
+            self.rate = max(self.min_rate, self.rate * 0.75)
+        else:
+            self.rate = min(self.max_rate, self.rate + 0.1)
+
+    def record_throttled(self, retry_after: Optional[float]):
+        """Slow down after a 429 / 503, honouring Retry-After"""
+        self.rate = max(self.min_rate, self.rate / 2)
+        if retry_after:
+            self.paused_until = max(self.paused_until, time.monotonic() + retry_after)
+        logger.warning(
+            f"Throttled by {self.domain}; rate now {self.rate:.2f} req/s"
+            + (f", pausing {retry_after:.0f}s" if retry_after else "")
+        )
+
+    def record_failure(self):
+        """Record a failed attempt (transport error or retryable status)"""
+        self.consecutive_failures += 1
+        if not self.circuit_open and self.consecutive_failures >= self.failure_threshold:
+            self.circuit_open = True
+            logger.error(
+                f"Circuit opened for {self.domain} after {self.consecutive_failures} "
+                f"consecutive failures; skipping it for the rest of the run"
+            )
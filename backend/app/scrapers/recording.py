@@ -0,0 +1,144 @@
+"""
+Record/replay of HTTP traffic for offline benchmarks and tests
+"""
+from typing import Dict, Optional
+from pathlib import Path
+import hashlib
+import json
+import os
+import logging
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# Headers describing the wire encoding; bodies are archived decoded
+ENCODING_HEADERS = {'content-encoding', 'content-length', 'transfer-encoding'}
+
+
+class HttpArchive:
+    """
+    Directory of recorded HTTP responses
+
+    Each response is stored as ``<key>.json`` (URL, status, headers) plus
+    ``<key>.body``, where the key is a hash of the method and exact URL.
+    Redirects are recorded hop by hop, so replay follows the same chain.
+    """
+
+    def __init__(self, directory: Optional[str] = None):
+        """
+        Initialize the archive
+
+        Args:
+            directory: Archive directory (default: SCRAPER_HTTP_ARCHIVE or ./cache/http)
+        """
+        self.directory = Path(directory or os.getenv("SCRAPER_HTTP_ARCHIVE", "./cache/http"))
+
+    def key(self, method: str, url: str) -> str:
+        """Archive key of a request"""
+        return hashlib.sha256(f"{method.upper()} {url}".encode('utf-8')).hexdigest()
+
+    def load(self, method: str, url: str) -> Optional[Dict]:
+        """
+        Load a recorded response
+
+        Returns:
+            Dictionary with url, status, headers and content, or None if not recorded
+        """
+        key = self.key(method, url)
+        meta_path = self.directory / f"{key}.json"
+        if not meta_path.exists():
+            return None
+
+        meta = json.loads(meta_path.read_text(encoding='utf-8'))
+        meta['content'] = (self.directory / f"{key}.body").read_bytes()
+        return meta
+
+    def save(self, method: str, url: str, status: int, headers: Dict[str, str], content: bytes):
+        """Record a response, replacing any earlier recording of the request"""
+        key = self.key(method, url)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        (self.directory / f"{key}.body").write_bytes(content)
+        meta = {'method': method.upper(), 'url': url, 'status': status, 'headers': headers}
+        (self.directory / f"{key}.json").write_text(json.dumps(meta, indent=2), encoding='utf-8')
+
+    def __len__(self) -> int:
+        return len(list(self.directory.glob("*.json"))) if self.directory.exists() else 0
+
+
+def _archived_headers(headers: httpx.Headers) -> Dict[str, str]:
+    return {name: value for name, value in headers.items() if name.lower() not in ENCODING_HEADERS}
+
+
+class RecordingTransport(httpx.AsyncBaseTransport):
+    """Transport that performs real requests and archives every response"""
+
+    def __init__(self, archive: HttpArchive, transport: Optional[httpx.AsyncBaseTransport] = None):
+        self.archive = archive
+        self.transport = transport or httpx.AsyncHTTPTransport()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        response = await self.transport.handle_async_request(request)
+        try:
+            # Decoded per Content-Encoding, so replay needs no decompression
+            content = await response.aread()
+        finally:
+            await response.aclose()
+
+        headers = _archived_headers(response.headers)
+
+        self.archive.save(request.method, str(request.url), response.status_code, headers, content)
+        return httpx.Response(
+            response.status_code,
+            headers=headers,
+            content=content,
+            request=request
+        )
+
+    async def aclose(self):
+        await self.transport.aclose()
+
+
+class ReplayTransport(httpx.AsyncBaseTransport):
+    """
+    Transport that serves archived responses and never touches the network
+
+    Requests that were not recorded are answered with 404 so scrapers
+    skip them the same way they skip missing pages.
+    """
+
+    def __init__(self, archive: HttpArchive):
+        self.archive = archive
+        self.misses = 0
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        recorded = self.archive.load(request.method, str(request.url))
+        if recorded is None:
+            self.misses += 1
+            logger.warning(f"Not in HTTP archive: {request.url}")
+            return httpx.Response(404, content=b"", request=request)
+
+        return httpx.Response(
+            recorded['status'],
+            headers=recorded['headers'],
+            content=recorded['content'],
+            request=request
+        )
+
+
+def get_transport() -> Optional[httpx.AsyncBaseTransport]:
+    """
+    Transport for SCRAPER_HTTP_MODE
+
+    Returns None for "live" (the default), a RecordingTransport for
+    "record" and a ReplayTransport for "replay", both over the archive
+    at SCRAPER_HTTP_ARCHIVE.
+    """
+    mode = os.getenv("SCRAPER_HTTP_MODE", "live")
+    if mode == "record":
+        return RecordingTransport(HttpArchive())
+    if mode == "replay":
+        return ReplayTransport(HttpArchive())
+    if mode != "live":
+        logger.warning(f"Unknown SCRAPER_HTTP_MODE {mode!r}; using live network")
+    return None
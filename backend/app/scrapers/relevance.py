@@ -0,0 +1,76 @@
+"""
+Keyword relevance scoring of articles to AI topics
+"""
+from typing import Dict, Optional
+import math
+import re
+
+# Weight of each keyword; specific terms count more than generic ones
+AI_KEYWORDS: Dict[str, float] = {
+    'artificial intelligence': 3.0,
+    'machine learning': 3.0,
+    'deep learning': 3.0,
+    'neural network': 3.0,
+    'large language model': 3.0,
+    'llm': 3.0,
+    'llms': 3.0,
+    'gpt': 3.0,
+    'generative ai': 3.0,
+    'transformer': 2.0,
+    'ai': 2.0,
+    'computer vision': 2.0,
+    'nlp': 2.0,
+    'natural language': 2.0,
+    'reinforcement learning': 2.0,
+    'diffusion model': 2.0,
+    'chatbot': 1.5,
+    'generative': 1.0,
+    'robotics': 1.0,
+    'automation': 0.5,
+    'algorithm': 0.5,
+    'model': 0.5,
+    'training': 0.5,
+    'inference': 0.5,
+}
+
+# Matches in the title count this many times
+TITLE_WEIGHT = 3.0
+
+# Raw score at which relevance reaches 1 - 1/e (about 0.63)
+SCALE = 6.0
+
+# Content beyond this many characters is not scanned
+CONTENT_CHARS = 5000
+
+_pattern = re.compile(
+    r"\b(" + "|".join(re.escape(k) for k in sorted(AI_KEYWORDS, key=len, reverse=True)) + r")\b"
+)
+
+
+def _weight(text: str, cap: Optional[int] = None) -> float:
+    """Sum of keyword weights, each keyword counted at most ``cap`` times"""
+    counts: Dict[str, int] = {}
+    for match in _pattern.finditer(text.lower()):
+        keyword = match.group(1)
+        counts[keyword] = counts.get(keyword, 0) + 1
+    return sum(AI_KEYWORDS[k] * min(n, cap or n) for k, n in counts.items())
+
+
+def relevance_score(title: str, content: str) -> float:
+    """
+    Relevance of an article to AI, from 0 to 1
+
+    Keywords match whole words only (so "ai" no longer matches "said"),
+    title matches count TITLE_WEIGHT times, and repeated keywords in the
+    content count at most three times each. The weighted sum saturates
+    towards 1.
+
+    Args:
+        title: Article title
+        content: Article content
+
+    Returns:
+        Relevance score
+    """
+    raw = TITLE_WEIGHT * _weight(title or '', cap=1) + _weight((content or '')[:CONTENT_CHARS], cap=3)
+    return round(1 - math.exp(-raw / SCALE), 3)
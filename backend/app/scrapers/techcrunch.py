@@ -3,8 +3,9 @@ TechCrunch scraper
 """
 from typing import List, Dict, Optional
 from datetime import datetime
+from bs4 import BeautifulSoup
 from .base import BaseScraper
-import feedparser
+from .parsing import container_strainer
 import logging
 
 logger = logging.getLogger(__name__)
@@ -13,6 +14,9 @@ logger = logging.getLogger(__name__)
 class TechCrunchScraper(BaseScraper):
     """Scraper for TechCrunch AI news"""
 
+    # Only the article containers are parsed
+    content_strainer = container_strainer(tags=('article',), div_classes=('article-content',))
+
     def __init__(self):
         super().__init__(
             source_name="TechCrunch",
@@ -20,48 +24,23 @@ class TechCrunchScraper(BaseScraper):
         )
         self.rss_url = "https://techcrunch.com/category/artificial-intelligence/feed/"
 
-    def scrape_articles(self, max_articles: int = 10) -> List[Dict]:
-        """Scrape articles from TechCrunch RSS feed"""
-        articles = []
-
-        try:
-            feed = feedparser.parse(self.rss_url)
-
-            for entry in feed.entries[:max_articles]:
-                try:
-                    article_data = self.extract_article_content(entry.link)
-
-                    if article_data and self.filter_ai_related(
-                        entry.title,
-                        article_data.get('content', '')
-                    ):
-                        article = {
-                            'title': self.clean_text(entry.title),
-                            'url': entry.link,
-                            'content': article_data.get('content', ''),
-                            'published_at': datetime(*entry.published_parsed[:6]),
-                            'author': entry.get('author', 'TechCrunch'),
-                            'image_url': self._extract_image(entry),
-                            'tags': self._extract_tags(entry)
-                        }
-                        articles.append(article)
-                        logger.info(f"Scraped: {article['title']}")
-
-                except Exception as e:
-                    logger.error(f"Error processing entry: {str(e)}")
-                    continue
-
-        except Exception as e:
-            logger.error(f"Error scraping TechCrunch: {str(e)}")
-
-        return articles
-
-    def extract_article_content(self, url: str) -> Optional[Dict]:
-        """Extract full article content"""
-        soup = self.fetch_page(url)
-        if not soup:
+    def build_article(self, entry, article_data: Optional[Dict]) -> Optional[Dict]:
+        """Build an article from a TechCrunch RSS entry"""
+        if not self.filter_ai_related(entry.title, article_data.get('content', '')):
             return None
 
+        return {
+            'title': self.clean_text(entry.title),
+            'url': entry.link,
+            'content': article_data.get('content', ''),
+            'published_at': datetime(*entry.published_parsed[:6]),
+            'author': entry.get('author', 'TechCrunch'),
+            'image_url': self._extract_image(entry),
+            'tags': self._extract_tags(entry)
+        }
+
+    def parse_article_content(self, soup: BeautifulSoup, url: str) -> Optional[Dict]:
+        """Extract full article content"""
         try:
             # Find article content
             article_body = soup.find('div', class_='article-content')
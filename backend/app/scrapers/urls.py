@@ -0,0 +1,74 @@
+"""
+URL canonicalization for deduplicating articles
+"""
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+import re
+
+# Query parameters that never change the article being served
+TRACKING_PARAMS = {
+    'fbclid', 'gclid', 'dclid', 'msclkid', 'mc_cid', 'mc_eid', 'igshid',
+    'ref', 'ref_src', 'referrer', 'cmpid', 'ncid',
+    'guccounter', 'guce_referrer', 'guce_referrer_sig', 'sr_share',
+    'amp', 'outputtype', '_ga', '_gl'
+}
+TRACKING_PREFIXES = ('utm_', 'pk_', 'mtm_', 'hsa_', 'itm_')
+
+HOST_PREFIXES = ('www.', 'amp.', 'm.')
+ARXIV_VERSION = re.compile(r'^(/(?:abs|pdf)/[^/]+?)(?:v\d+)?(?:\.pdf)?$')
+
+
+def canonicalize_url(url: str) -> str:
+    """
+    Normalize an article URL so variants of the same page compare equal
+
+    - scheme forced to https, host lowercased without www./amp./m. prefix
+    - default ports, fragments and tracking parameters removed
+    - remaining query parameters sorted
+    - AMP paths (/amp, /amp/...) and trailing slashes removed
+    - arXiv version suffixes (2401.01234v2) removed
+
+    Args:
+        url: Raw article URL
+
+    Returns:
+        Canonical URL (the input unchanged if it cannot be parsed)
+    """
+    if not url:
+        return url
+
+    try:
+        parts = urlsplit(url.strip())
+    except ValueError:
+        return url
+
+    if not parts.netloc:
+        return url
+
+    host = (parts.hostname or '').lower()
+    for prefix in HOST_PREFIXES:
+        if host.startswith(prefix):
+            host = host[len(prefix):]
+            break
+    if parts.port and parts.port not in (80, 443):
+        host = f"{host}:{parts.port}"
+
+    path = re.sub(r'/{2,}', '/', parts.path or '/')
+    if path.endswith('/amp') or path.endswith('/amp/'):
+        path = path[:path.rindex('/amp')]
+    if path.startswith('/amp/'):
+        path = path[len('/amp'):]
+    if host == 'arxiv.org' or host == 'export.arxiv.org':
+        host = 'arxiv.org'
+        match = ARXIV_VERSION.match(path)
+        if match:
+            path = match.group(1).replace('/pdf/', '/abs/', 1)
+    path = path.rstrip('/') or '/'
+
+    query = [
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith(TRACKING_PREFIXES)
+    ]
+    query.sort()
+
+    return urlunsplit(('https', host, path, urlencode(query), ''))
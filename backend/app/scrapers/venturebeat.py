@@ -1,10 +1,11 @@
 """
 VentureBeat scraper
 """
-from typing import List, Dict, Optional
+from typing import Dict, Optional
 from datetime import datetime
+from bs4 import BeautifulSoup
 from .base import BaseScraper
-import feedparser
+from .parsing import container_strainer
 import logging
 
 logger = logging.getLogger(__name__)
@@ -13,6 +14,9 @@ logger = logging.getLogger(__name__)
 class VentureBeatScraper(BaseScraper):
     """Scraper for VentureBeat AI news"""
 
+    # Only the article containers are parsed
+    content_strainer = container_strainer(tags=('article',), div_classes=('article-content', 'entry-content'))
+
     def __init__(self):
         super().__init__(
             source_name="VentureBeat",
@@ -20,45 +24,20 @@ class VentureBeatScraper(BaseScraper):
         )
         self.rss_url = "https://venturebeat.com/category/ai/feed/"
 
-    def scrape_articles(self, max_articles: int = 10) -> List[Dict]:
-        """Scrape articles from VentureBeat RSS feed"""
-        articles = []
-
-        try:
-            feed = feedparser.parse(self.rss_url)
-
-            for entry in feed.entries[:max_articles]:
-                try:
-                    article_data = self.extract_article_content(entry.link)
-
-                    if article_data:
-                        article = {
-                            'title': self.clean_text(entry.title),
-                            'url': entry.link,
-                            'content': article_data.get('content', ''),
-                            'published_at': datetime(*entry.published_parsed[:6]),
-                            'author': entry.get('author', 'VentureBeat'),
-                            'image_url': self._extract_image(entry),
-                            'tags': ['AI', 'VentureBeat']
-                        }
-                        articles.append(article)
-                        logger.info(f"Scraped: {article['title']}")
-
-                except Exception as e:
-                    logger.error(f"Error processing entry: {str(e)}")
-                    continue
-
-        except Exception as e:
-            logger.error(f"Error scraping VentureBeat: {str(e)}")
-
-        return articles
-
-    def extract_article_content(self, url: str) -> Optional[Dict]:
+    def build_article(self, entry, article_data: Optional[Dict]) -> Optional[Dict]:
+        """Build an article from a VentureBeat RSS entry"""
+        return {
+            'title': self.clean_text(entry.title),
+            'url': entry.link,
+            'content': article_data.get('content', ''),
+            'published_at': datetime(*entry.published_parsed[:6]),
+            'author': entry.get('author', 'VentureBeat'),
+            'image_url': self._extract_image(entry),
+            'tags': ['AI', 'VentureBeat']
+        }
+
+    def parse_article_content(self, soup: BeautifulSoup, url: str) -> Optional[Dict]:
         """Extract full article content"""
-        soup = self.fetch_page(url)
-        if not soup:
-            return None
-
         try:
             # Find article content
             article_body = soup.find('div', class_='article-content')
@@ -0,0 +1,88 @@
+"""
+Micro-benchmark of HTML parsing over saved article pages
+
+Compares the full-tree html.parser baseline with each parser backend,
+with and without the scrapers' container strainers, and checks that
+the extracted content is identical.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_parsing [--fixtures DIR] [--repeat N]
+
+Fixture files are matched to scrapers by filename prefix
+(techcrunch*.html, venturebeat*.html, mit_tech_review*.html).
+"""
+from pathlib import Path
+import argparse
+import time
+
+from app.scrapers import TechCrunchScraper, VentureBeatScraper, MITTechReviewScraper
+from app.scrapers.parsing import parse_html
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+
+SCRAPERS = {
+    "techcrunch": TechCrunchScraper,
+    "venturebeat": VentureBeatScraper,
+    "mit_tech_review": MITTechReviewScraper,
+}
+
+
+def available_parsers():
+    """Parser backends installed in this environment"""
+    parsers = ["html.parser"]
+    try:
+        import lxml  # noqa: F401
+        parsers.append("lxml")
+    except ImportError:
+        pass
+    return parsers
+
+
+def time_extraction(scraper, body: bytes, parser: str, strained: bool, repeat: int):
+    """Return (best seconds per page, extracted content) for one configuration"""
+    strainer = scraper.content_strainer if strained else None
+    content = None
+    best = float("inf")
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        soup = parse_html(body, strainer=strainer, parser=parser)
+        content = scraper.parse_article_content(soup, "fixture")
+        best = min(best, time.perf_counter() - start)
+
+    return best, content
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--fixtures", type=Path, default=FIXTURES_DIR)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'fixture':<28} {'backend':<24} {'ms/page':>9} {'speedup':>8}")
+
+    for path in sorted(args.fixtures.glob("*.html")):
+        scraper_class = next(
+            (cls for prefix, cls in SCRAPERS.items() if path.name.startswith(prefix)),
+            None
+        )
+        if scraper_class is None:
+            continue
+
+        scraper = scraper_class()
+        body = path.read_bytes()
+        baseline, expected = time_extraction(scraper, body, "html.parser", False, args.repeat)
+
+        for backend in available_parsers():
+            for strained in (False, True):
+                elapsed, content = time_extraction(scraper, body, backend, strained, args.repeat)
+                label = f"{backend}{' + strainer' if strained else ''}"
+                same = "" if content == expected else "  (content differs!)"
+                print(
+                    f"{path.name:<28} {label:<24} {elapsed * 1000:>9.2f} "
+                    f"{baseline / elapsed:>7.1f}x{same}"
+                )
+
+
+if __name__ == "__main__":
+    main()
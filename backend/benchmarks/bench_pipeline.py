@@ -0,0 +1,132 @@
+"""
+Benchmark of the scrape, AI processing and storage pipeline with a fake LLM
+
+Runs the scheduler's pipeline against the deterministic fake backend and
+a throwaway SQLite database, and reports articles per second, LLM calls,
+article write throughput and latency percentiles per LLM task. Articles are
+either generated (the default) or scraped from a recorded HTTP corpus
+(see bench_scrape --record). The LLM cache is disabled so every run
+makes the same calls.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_pipeline [--articles N] [--workers N] [--latency S]
+    python -m benchmarks.bench_pipeline --archive benchmarks/corpus
+"""
+from datetime import datetime, timedelta
+from pathlib import Path
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+parser.add_argument("--archive", type=Path, help="scrape from this recorded corpus")
+parser.add_argument("--articles", type=int, default=50, help="generated articles (without --archive)")
+parser.add_argument("--words", type=int, default=800, help="words per generated article")
+parser.add_argument("--workers", type=int, default=int(os.getenv("PIPELINE_WORKERS", "4")))
+parser.add_argument("--latency", type=float, default=0.5, help="seconds per LLM call")
+parser.add_argument("--jitter", type=float, default=0.2, help="most extra seconds per LLM call")
+parser.add_argument("--completion-tokens", type=int, default=200)
+parser.add_argument("--mode", choices=["combined", "multi"], default="combined")
+args = parser.parse_args()
+
+# Must be set before the database, scrapers and AI components are created
+database = Path(tempfile.mkdtemp()) / "bench.db"
+os.environ["DATABASE_URL"] = f"sqlite:///{database}"
+os.environ["LLM_BACKEND"] = "fake"
+os.environ["LLM_CACHE_ENABLED"] = "False"
+os.environ["AI_PROCESSING_MODE"] = args.mode
+os.environ["PIPELINE_WORKERS"] = str(args.workers)
+os.environ["FAKE_LLM_LATENCY"] = str(args.latency)
+os.environ["FAKE_LLM_JITTER"] = str(args.jitter)
+os.environ["FAKE_LLM_COMPLETION_TOKENS"] = str(args.completion_tokens)
+os.environ.setdefault("OPENAI_RPM_LIMIT", "100000")
+os.environ.setdefault("OPENAI_TPM_LIMIT", "100000000")
+if args.archive:
+    os.environ["SCRAPER_HTTP_MODE"] = "replay"
+    os.environ["SCRAPER_HTTP_ARCHIVE"] = str(args.archive)
+    os.environ["SCRAPER_CACHE_ENABLED"] = "False"
+    os.environ["FEED_CACHE_ENABLED"] = "False"
+    os.environ.setdefault("SCRAPER_RATE_PER_HOST", "10000")
+    os.environ.setdefault("SCRAPER_MAX_RATE_PER_HOST", "10000")
+
+from app.ai.metrics import llm_run, new_run_id  # noqa: E402
+from app.database import Base, engine  # noqa: E402
+from app.scheduler.tasks import NewsScraperScheduler  # noqa: E402
+from app.scrapers.fetcher import run_sync  # noqa: E402
+
+WORDS = ("model", "training", "data", "inference", "research", "language", "results", "compute")
+
+
+def generated_articles(count: int, words: int):
+    """Article data as the scrapers produce it"""
+    now = datetime.now()
+    for number in range(count):
+        url = f"https://example.com/bench/{number}"
+        yield {
+            'title': f"Benchmark article {number}",
+            'url': url,
+            'canonical_url': url,
+            'content': "\n".join(
+                " ".join(WORDS[(number + line + word) % len(WORDS)] for word in range(40))
+                for line in range(words // 40)
+            ),
+            'published_at': now - timedelta(minutes=number),
+            'author': None,
+            'image_url': None,
+            'tags': [],
+        }
+
+
+async def process_generated(scheduler: NewsScraperScheduler, count: int, words: int) -> int:
+    """Process generated articles with the scheduler's worker count"""
+    limit = asyncio.Semaphore(scheduler.pipeline_workers)
+
+    async def process(article_data: dict) -> bool:
+        async with limit:
+            return await scheduler.aprocess_and_store("Benchmark", article_data)
+
+    stored = await asyncio.gather(*(process(a) for a in generated_articles(count, words)))
+    return sum(stored)
+
+
+def main():
+    Base.metadata.create_all(bind=engine)
+    scheduler = NewsScraperScheduler()
+    backend = scheduler.processor.backend
+
+    start = time.perf_counter()
+    with llm_run(new_run_id("bench")):
+        if args.archive:
+            _, stored = run_sync(scheduler._ascrape_and_process())
+        else:
+            stored = run_sync(process_generated(scheduler, args.articles, args.words))
+            scheduler.writer.flush()
+    wall = time.perf_counter() - start
+    writes = scheduler.writer.stats()
+    scheduler.processor.metrics.flush()
+
+    print(f"mode={args.mode} workers={args.workers} latency={args.latency}s "
+          f"jitter={args.jitter}s completion={args.completion_tokens} tokens")
+    print(f"{'stored':>8} {'wall s':>8} {'art/s':>8} {'calls':>8} {'calls/s':>8} "
+          f"{'writes':>8} {'rows/s':>9}")
+    print(
+        f"{stored:>8} {wall:>8.2f} {stored / wall if wall else 0:>8.2f} "
+        f"{backend.calls:>8} {backend.calls / wall if wall else 0:>8.2f} "
+        f"{writes['writes']:>8} {writes['rows_per_second']:>9.0f}"
+    )
+
+    histograms = scheduler.processor.metrics.histograms()
+    print(f"\n{'task:model':<36} {'calls':>6} {'p50 ms':>7} {'p95 ms':>7} {'max ms':>7} "
+          f"{'tokens':>9} {'cost $':>8}")
+    for name, task in scheduler.processor.stats.snapshot().items():
+        latency = histograms[name]['latency_ms']
+        print(
+            f"{name:<36} {task['calls']:>6} {latency['p50']:>7.0f} {latency['p95']:>7.0f} {latency['max']:>7.0f} "
+            f"{task['prompt_tokens'] + task['completion_tokens']:>9} {task['cost']:>8.4f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
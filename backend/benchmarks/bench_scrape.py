@@ -0,0 +1,132 @@
+"""
+Benchmark of the full scrape stage against a recorded HTTP corpus
+
+Runs every scraper (feed, article pages, extraction) with responses
+served from an HttpArchive, and reports requests, pages per second and
+parse time per source. The page cache, feed state and politeness limits
+are disabled so only fetching and parsing are measured.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_scrape --record [--archive DIR]   # live, once
+    python -m benchmarks.bench_scrape [--archive DIR] [--repeat N]
+"""
+from dataclasses import dataclass
+from pathlib import Path
+import argparse
+import asyncio
+import os
+import time
+
+# Must be set before the scrapers and fetchers are created
+os.environ["SCRAPER_CACHE_ENABLED"] = "False"
+os.environ["FEED_CACHE_ENABLED"] = "False"
+
+from app.scrapers import (  # noqa: E402
+    AsyncFetcher,
+    TechCrunchScraper,
+    VentureBeatScraper,
+    MITTechReviewScraper,
+    ArxivScraper,
+)
+from app.scrapers import base  # noqa: E402
+from app.scrapers.recording import HttpArchive, RecordingTransport, ReplayTransport  # noqa: E402
+
+ARCHIVE_DIR = Path(__file__).parent / "corpus"
+
+SCRAPERS = [TechCrunchScraper, VentureBeatScraper, MITTechReviewScraper, ArxivScraper]
+
+
+@dataclass
+class SourceStats:
+    """Measurements of one scrape of one source"""
+    requests: int = 0
+    articles: int = 0
+    wall: float = 0.0
+    parse: float = 0.0
+
+
+def timed(function, stats: SourceStats):
+    """Wrap a parsing function so its time is added to stats.parse"""
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            stats.parse += time.perf_counter() - start
+    return wrapper
+
+
+async def scrape_once(scraper_class, transport, max_articles: int) -> SourceStats:
+    """Scrape one source through the given transport and measure it"""
+    stats = SourceStats()
+    scraper = scraper_class()
+    scraper.parse_html = timed(scraper.parse_html, stats)
+    scraper.parse_article_content = timed(scraper.parse_article_content, stats)
+
+    feed_parse = base.feedparser.parse
+    base.feedparser.parse = timed(feed_parse, stats)
+    try:
+        async with AsyncFetcher(use_cache=False, transport=transport) as fetcher:
+            request = fetcher.request
+
+            async def counted_request(*args, **kwargs):
+                stats.requests += 1
+                return await request(*args, **kwargs)
+
+            fetcher.request = counted_request
+            start = time.perf_counter()
+            articles = await scraper.ascrape_articles(fetcher, max_articles)
+            stats.wall = time.perf_counter() - start
+            stats.articles = len(articles)
+    finally:
+        base.feedparser.parse = feed_parse
+
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--archive", type=Path, default=ARCHIVE_DIR)
+    parser.add_argument("--record", action="store_true",
+                        help="scrape the live sites and record the responses")
+    parser.add_argument("--max-articles", type=int,
+                        default=int(os.getenv("MAX_ARTICLES_PER_SOURCE", "5")))
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    archive = HttpArchive(str(args.archive))
+    if not args.record:
+        if not len(archive):
+            parser.error(f"no recorded responses in {args.archive}; run with --record first")
+        # Replay needs no pacing; keep the token buckets out of the timings
+        os.environ.setdefault("SCRAPER_RATE_PER_HOST", "10000")
+        os.environ.setdefault("SCRAPER_MAX_RATE_PER_HOST", "10000")
+
+    print(f"{'source':<18} {'requests':>8} {'articles':>8} {'wall s':>8} "
+          f"{'pages/s':>8} {'parse ms':>9} {'ms/page':>8}")
+
+    for scraper_class in SCRAPERS:
+        best = None
+        for _ in range(1 if args.record else args.repeat):
+            if args.record:
+                transport = RecordingTransport(archive)
+            else:
+                transport = ReplayTransport(archive)
+            stats = asyncio.run(scrape_once(scraper_class, transport, args.max_articles))
+            if best is None or stats.wall < best.wall:
+                best = stats
+
+        name = scraper_class.__name__.replace("Scraper", "")
+        print(
+            f"{name:<18} {best.requests:>8} {best.articles:>8} {best.wall:>8.3f} "
+            f"{best.requests / best.wall if best.wall else 0:>8.1f} "
+            f"{best.parse * 1000:>9.2f} "
+            f"{best.parse * 1000 / max(best.requests, 1):>8.2f}"
+        )
+
+    if args.record:
+        print(f"Recorded {len(archive)} responses to {args.archive}")
+
+
+if __name__ == "__main__":
+    main()
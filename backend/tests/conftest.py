@@ -0,0 +1,32 @@
+"""
+Shared fixtures: every test runs against a fresh SQLite database
+"""
+import os
+import tempfile
+
+# The engine is created when app.database is imported, so point it at a
+# scratch database first
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'test.db')}"
+
+import pytest
+
+import app.models  # noqa: F401  (registers the tables)
+from app.database import Base, SessionLocal, engine
+
+
+@pytest.fixture(autouse=True)
+def database():
+    """Empty tables for each test"""
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    yield
+
+
+@pytest.fixture
+def db():
+    """Session for checking what the code under test stored"""
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
@@ -0,0 +1,106 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from app.models import PipelineJob
+from app.scheduler.jobs import JobQueue
+
+
+def expire_leases(db):
+    db.query(PipelineJob).update({PipelineJob.lease_expires_at: datetime.now() - timedelta(seconds=1)})
+    db.commit()
+
+
+def test_enqueue_is_idempotent():
+    queue = JobQueue()
+
+    assert queue.enqueue("fetch", "source", {})
+    assert not queue.enqueue("fetch", "source", {})
+
+
+def test_leased_job_is_not_handed_out_twice():
+    queue = JobQueue()
+    queue.enqueue("fetch", "source", {})
+
+    [job] = queue.lease("worker-a")
+    assert job.status == "leased"
+    assert job.attempts == 1
+    assert queue.lease("worker-b") == []
+
+
+def test_lease_prefers_higher_priority():
+    queue = JobQueue()
+    queue.enqueue("process", "low", {}, priority=0.1)
+    queue.enqueue("process", "high", {}, priority=0.9)
+
+    assert [job.job_key for job in queue.lease("worker", limit=2)] == ["process:high", "process:low"]
+
+
+def test_expired_lease_is_handed_out_again(db):
+    queue = JobQueue(max_attempts=3)
+    queue.enqueue("fetch", "source", {})
+    [stale] = queue.lease("worker-a")
+
+    expire_leases(db)
+    [job] = queue.lease("worker-b")
+    assert job.lease_owner == "worker-b"
+    assert job.attempts == 2
+
+    # The first worker's result no longer counts
+    assert not queue.complete(stale, "worker-a")
+    assert queue.complete(job, "worker-b")
+    assert db.query(PipelineJob).one().status == "done"
+
+
+def test_expired_last_attempt_fails_for_good(db):
+    queue = JobQueue(max_attempts=1)
+    queue.enqueue("fetch", "source", {})
+    queue.lease("worker-a")
+
+    expire_leases(db)
+    assert queue.lease("worker-b") == []
+    job = db.query(PipelineJob).one()
+    assert job.status == "failed"
+    assert job.last_error == "Lease expired on the last attempt"
+
+
+def test_failed_job_is_retried_after_backoff(db):
+    queue = JobQueue(max_attempts=2, retry_backoff=60)
+    queue.enqueue("fetch", "source", {})
+    [job] = queue.lease("worker")
+
+    assert queue.fail(job, "worker", RuntimeError("boom"))
+    stored = db.query(PipelineJob).one()
+    assert stored.status == "queued"
+    assert stored.last_error == "RuntimeError: boom"
+    assert queue.lease("worker") == []
+
+
+def test_result_of_an_earlier_lease_is_discarded(db):
+    # The same worker holds the job again, but its first attempt must not finish it
+    queue = JobQueue(max_attempts=3)
+    queue.enqueue("fetch", "source", {})
+    [stale] = queue.lease("worker")
+
+    expire_leases(db)
+    [job] = queue.lease("worker")
+    assert not queue.fail(stale, "worker", RuntimeError("late"))
+    assert queue.complete(job, "worker")
+
+
+def test_concurrent_workers_claim_each_job_once():
+    queue = JobQueue()
+    for i in range(20):
+        queue.enqueue("process", str(i), {})
+
+    def drain(owner):
+        claimed = []
+        # A lease can come back empty when other workers won its candidates
+        while queue.counts()["process"].get("queued"):
+            claimed.extend(job.job_key for job in queue.lease(owner, limit=2))
+        return claimed
+
+    with ThreadPoolExecutor(4) as pool:
+        results = list(pool.map(drain, [f"worker-{i}" for i in range(4)]))
+
+    claimed = [key for result in results for key in result]
+    assert sorted(claimed) == sorted(f"process:{i}" for i in range(20))
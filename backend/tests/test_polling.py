@@ -0,0 +1,61 @@
+from datetime import datetime, timedelta
+
+from app.models import SourcePoll
+from app.scheduler.polling import PollSchedule
+
+NOW = datetime(2024, 1, 1, 12, 0)
+
+
+def next_poll_in(db, source: str, now: datetime) -> float:
+    db.expire_all()
+    poll = db.query(SourcePoll).filter(SourcePoll.source == source).one()
+    return (poll.next_poll_at - now).total_seconds() / 60
+
+
+def test_unknown_source_is_due():
+    assert PollSchedule(60).due(["new"], now=NOW) == ["new"]
+
+
+def test_first_poll_uses_default_interval(db):
+    schedule = PollSchedule(60, min_minutes=30, max_minutes=1440)
+    schedule.record("feed", 3, now=NOW)
+
+    assert next_poll_in(db, "feed", NOW) == 60
+    assert schedule.due(["feed"], now=NOW + timedelta(minutes=59)) == []
+    assert schedule.due(["feed"], now=NOW + timedelta(minutes=60)) == ["feed"]
+
+
+def test_failed_polls_back_off_up_to_the_maximum(db):
+    schedule = PollSchedule(60, min_minutes=30, max_minutes=120)
+    schedule.record("feed", 3, now=NOW)
+
+    backoffs = []
+    for attempt in range(5):
+        now = NOW + timedelta(hours=attempt)
+        schedule.record_failure("feed", now=now)
+        backoffs.append(next_poll_in(db, "feed", now))
+
+    assert backoffs == [30, 60, 120, 120, 120]
+
+
+def test_failure_of_unknown_source_schedules_a_retry(db):
+    schedule = PollSchedule(60, min_minutes=30, max_minutes=120)
+    schedule.record_failure("down", now=NOW)
+
+    assert next_poll_in(db, "down", NOW) == 30
+    assert schedule.due(["down"], now=NOW + timedelta(minutes=10)) == []
+
+
+def test_successful_poll_resets_the_backoff(db):
+    schedule = PollSchedule(60, min_minutes=30, max_minutes=1440)
+    schedule.record("feed", 3, now=NOW)
+    schedule.record_failure("feed", now=NOW + timedelta(hours=1))
+    schedule.record_failure("feed", now=NOW + timedelta(hours=2))
+
+    schedule.record("feed", 3, now=NOW + timedelta(hours=3))
+    db.expire_all()
+    assert db.query(SourcePoll).one().failures == 0
+
+    later = NOW + timedelta(hours=4)
+    schedule.record_failure("feed", now=later)
+    assert next_poll_in(db, "feed", later) == 30
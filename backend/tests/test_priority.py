@@ -0,0 +1,73 @@
+import heapq
+
+from app.scheduler.priority import QueuedArticle, RunBudget
+
+
+class RunUsage:
+    """Metrics recorder reporting a fixed spend for every run"""
+
+    def __init__(self, tokens: int = 0, cost: float = 0.0):
+        self.usage = (tokens, cost)
+
+    def run_usage(self, run_id):
+        return self.usage
+
+
+def test_unlimited_budget_accepts_everything():
+    budget = RunBudget("run", RunUsage(), max_tokens=0, max_cost=0)
+
+    assert not budget.limited
+    assert budget.reserve(10 ** 9, 10 ** 6)
+
+
+def test_reservations_count_against_the_budget_until_released():
+    budget = RunBudget("run", RunUsage(), max_tokens=1000)
+
+    assert budget.reserve(600, 0.0)
+    assert not budget.reserve(600, 0.0)
+
+    budget.release(600, 0.0)
+    assert budget.reserve(600, 0.0)
+    assert budget.reserved_tokens == 600
+
+
+def test_spent_usage_counts_against_the_budget():
+    budget = RunBudget("run", RunUsage(tokens=900, cost=0.5), max_tokens=1000, max_cost=1.0)
+
+    assert budget.spent() == (900, 0.5)
+    assert budget.reserve(100, 0.5)
+    assert not budget.reserve(1, 0.0)
+
+
+def test_cost_limit_applies_on_its_own():
+    budget = RunBudget("run", RunUsage(cost=0.75), max_tokens=0, max_cost=1.0)
+
+    assert not budget.reserve(1, 0.5)
+    assert budget.reserve(10 ** 6, 0.25)
+
+
+def test_budget_without_run_has_spent_nothing():
+    budget = RunBudget(None, RunUsage(tokens=10 ** 6), max_tokens=1000)
+
+    assert budget.spent() == (0, 0.0)
+    assert budget.reserve(1000, 0.0)
+
+
+def test_queued_articles_sort_by_score_then_arrival():
+    queue = []
+    heapq.heappush(queue, QueuedArticle.create(0, "a", {'url': 'low'}, 0.1))
+    heapq.heappush(queue, QueuedArticle.create(1, "a", {'url': 'high'}, 0.9))
+    heapq.heappush(queue, QueuedArticle.create(2, "a", {'url': 'first'}, 0.5))
+    heapq.heappush(queue, QueuedArticle.create(3, "a", {'url': 'second'}, 0.5))
+
+    order = [heapq.heappop(queue).article_data['url'] for _ in range(4)]
+    assert order == ['high', 'first', 'second', 'low']
+
+
+def test_stop_marker_sorts_after_every_article():
+    queue = []
+    heapq.heappush(queue, QueuedArticle.stop(0))
+    heapq.heappush(queue, QueuedArticle.create(1, "a", {'url': 'article'}, -5.0))
+
+    assert heapq.heappop(queue).article_data == {'url': 'article'}
+    assert heapq.heappop(queue).article_data is None
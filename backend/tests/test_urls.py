@@ -0,0 +1,45 @@
+import pytest
+
+from app.scrapers.urls import canonicalize_url
+
+
+@pytest.mark.parametrize("url, canonical", [
+    ("http://www.example.com/story/", "https://example.com/story"),
+    ("https://EXAMPLE.com:443/story#comments", "https://example.com/story"),
+    ("https://example.com:8080/story", "https://example.com:8080/story"),
+    ("https://m.example.com/story", "https://example.com/story"),
+    ("https://example.com//a//b", "https://example.com/a/b"),
+    ("https://example.com/", "https://example.com/"),
+])
+def test_host_and_path_are_normalized(url, canonical):
+    assert canonicalize_url(url) == canonical
+
+
+def test_tracking_parameters_are_removed_and_the_rest_sorted():
+    url = "https://example.com/story?utm_source=x&b=2&fbclid=y&a=1&UTM_Medium=z"
+
+    assert canonicalize_url(url) == "https://example.com/story?a=1&b=2"
+
+
+@pytest.mark.parametrize("url", [
+    "https://example.com/story/amp",
+    "https://example.com/story/amp/",
+    "https://example.com/amp/story",
+    "https://amp.example.com/story",
+])
+def test_amp_variants_match_the_article(url):
+    assert canonicalize_url(url) == "https://example.com/story"
+
+
+@pytest.mark.parametrize("url", [
+    "http://arxiv.org/abs/2401.01234v2",
+    "https://export.arxiv.org/abs/2401.01234",
+    "https://arxiv.org/pdf/2401.01234v1.pdf",
+])
+def test_arxiv_versions_match_the_abstract(url):
+    assert canonicalize_url(url) == "https://arxiv.org/abs/2401.01234"
+
+
+@pytest.mark.parametrize("url", ["", "not a url", "/relative/path"])
+def test_unparseable_urls_are_returned_unchanged(url):
+    assert canonicalize_url(url) == url
@@ -0,0 +1,96 @@
+from datetime import datetime
+
+from app.models import Article
+from app.scheduler.writer import ArticleWriter
+
+
+def article_row(url: str, processed: bool) -> dict:
+    return {
+        'source': "Test",
+        'source_url': url,
+        'canonical_url': url,
+        'title_en': "Title",
+        'content_en': "Content",
+        'published_at': datetime(2024, 1, 1),
+        'author': None,
+        'image_url': None,
+        'tags': [],
+        'category': 'AI',
+        'priority_score': None,
+        'summary_en': "Summary" if processed else None,
+        'title_ja': "タイトル" if processed else '',
+        'summary_ja': "要約" if processed else '',
+        'key_points_ja': ["要点"] if processed else None,
+        'is_processed': processed,
+        'is_published': processed,
+        'translated_at': datetime(2024, 1, 2) if processed else None,
+        'deferred_at': None,
+    }
+
+
+def stored(db):
+    return {article.source_url: article for article in db.query(Article)}
+
+
+def test_pending_row_is_completed_by_a_processed_one(db):
+    writer = ArticleWriter()
+    writer.write([article_row("https://a", False)])
+
+    assert writer.write([article_row("https://a", True)])
+    article = stored(db)["https://a"]
+    assert article.is_processed
+    assert article.title_ja == "タイトル"
+
+
+def test_processed_row_is_never_downgraded(db):
+    writer = ArticleWriter()
+    writer.write([article_row("https://a", True)])
+
+    assert writer.write([article_row("https://a", False)]) == []
+    article = stored(db)["https://a"]
+    assert article.is_processed
+    assert article.summary_en == "Summary"
+
+
+def test_only_changed_rows_are_reported():
+    reported = []
+    writer = ArticleWriter(on_write=lambda rows: reported.append([row['source_url'] for row in rows]))
+    writer.write([article_row("https://a", False), article_row("https://b", True)])
+
+    written = writer.write([
+        article_row("https://a", True),   # completes the pending row
+        article_row("https://b", False),  # no-op
+        article_row("https://c", False),  # new
+    ])
+    assert [row['source_url'] for row in written] == ["https://a", "https://c"]
+    assert reported == [["https://a", "https://b"], ["https://a", "https://c"]]
+    assert writer.stats()['rows'] == 4
+
+    # Writing the same rows again changes nothing and reports nothing
+    assert writer.write([article_row("https://a", True)]) == []
+    assert len(reported) == 2
+
+
+def test_processed_duplicate_in_one_batch_wins(db):
+    writer = ArticleWriter()
+    writer.write([article_row("https://a", False), article_row("https://a", True)])
+
+    assert stored(db)["https://a"].is_processed
+
+
+def test_buffered_rows_are_written_on_flush(db):
+    writer = ArticleWriter(batch_size=10, flush_seconds=60)
+    writer.add(article_row("https://a", True))
+    writer.add(article_row("https://b", True))
+    assert stored(db) == {}
+
+    assert writer.flush() == 2
+    assert set(stored(db)) == {"https://a", "https://b"}
+
+
+def test_large_batches_are_split_for_sqlite(db):
+    writer = ArticleWriter()
+    rows = [article_row(f"https://example.com/{i}", False) for i in range(200)]
+
+    assert len(writer.write(rows)) == 200
+    assert db.query(Article).count() == 200